@@ -0,0 +1,323 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import contextlib
+import concurrent.futures
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+# Times downloading workshop thumbnails from a local stand-in for Steam:
+#   - the way Bookworm used to, one thumbnail at a time with a new connection for every request
+#   - with ThumbnailFetcher, several at a time over a pooled session and under its rate limit,
+#     finding each thumbnail on its workshop page
+#   - the same, finding thumbnails by looking up 100 items at a time with GetPublishedFileDetails
+#   - checking those thumbnails for changes again, with conditional requests
+# The server waits --latency seconds before answering every request, like a far away server would.
+# Every --missing'th item isn't found by the lookup, so it has to fall back to its page.
+# Every --changed'th image changes before the thumbnails are checked.
+#
+#   python benchmarks/bench_fetch.py --count 200 --latency 0.1 --workers 4 --rate 8
+
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+ROOT_PATH = os.path.dirname(BENCHMARKS_PATH)
+
+sys.path.insert(0, ROOT_PATH)
+
+ITEM_PATH = "/sharedfiles/filedetails/?id="
+DETAILS_PATH = "/ISteamRemoteStorage/GetPublishedFileDetails/v1/"
+FIRST_WORKSHOP_ID = 2000000000
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>Steam Workshop::Mod {workshopId}</title></head>
+<body>
+<div class="workshopItemPreviewImageMain">
+<img id="previewImageMain" class="workshopItemPreviewImageMain" src="{imageUrl}">
+</div>
+{filler}
+</body></html>
+"""
+
+
+def makePreviewImage(seed):
+    from PIL import Image
+
+    rng = random.Random(seed)
+    image = Image.frombytes("RGB", (512, 512), bytes(rng.randrange(256) for _ in range(512 * 512 * 3)))
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=80)
+    return output.getvalue()
+
+
+# Answers workshop pages and the images they point to. Counts requests and connections.
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency, image, missing=0):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.latency = latency
+        self.image = image
+        self.missing = missing
+        self.changedIds = set()  # Images with a new version since they were first served.
+        self.filler = "<p>" + "Workshop page filler. " * 2000 + "</p>"
+
+        self.lock = threading.Lock()
+        self.requestCount = 0
+        self.connectionCount = 0
+        self.pageCount = 0
+        self.detailsCount = 0
+        self.notModifiedCount = 0
+        self.bytesSent = 0
+
+    def getUrl(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def getImageUrl(self, workshopId):
+        return f"{self.getUrl()}/images/{workshopId}.jpg"
+
+    # Whether the lookup pretends not to know about the item.
+    def isMissing(self, workshopId):
+        return self.missing > 0 and int(workshopId) % self.missing == 0
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Lets clients keep the connection open.
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connectionCount += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requestCount += 1
+
+        time.sleep(self.server.latency)
+
+        url = urlparse(self.path)
+        if url.path.startswith("/images/"):
+            workshopId = url.path.removeprefix("/images/").removesuffix(".jpg")
+            version = 2 if workshopId in self.server.changedIds else 1
+            etag = f'"{workshopId}-{version}"'
+
+            if self.headers.get("If-None-Match") == etag:
+                with self.server.lock:
+                    self.server.notModifiedCount += 1
+
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            self.send(self.server.image, "image/jpeg", {"ETag": etag})
+        elif url.path == urlparse(ITEM_PATH).path:
+            with self.server.lock:
+                self.server.pageCount += 1
+
+            workshopId = parse_qs(url.query).get("id", [""])[0]
+            imageUrl = self.server.getImageUrl(workshopId)
+            page = PAGE_TEMPLATE.format(workshopId=workshopId, imageUrl=imageUrl, filler=self.server.filler)
+            self.send(page.encode(), "text/html; charset=utf-8")
+        else:
+            self.send_error(404)
+
+    # Answers like GetPublishedFileDetails, with only the fields Bookworm reads.
+    def do_POST(self):
+        with self.server.lock:
+            self.server.requestCount += 1
+            self.server.detailsCount += 1
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        time.sleep(self.server.latency)
+
+        if urlparse(self.path).path != DETAILS_PATH:
+            self.send_error(404)
+            return
+
+        form = parse_qs(body)
+        itemCount = int(form.get("itemcount", ["0"])[0])
+
+        entries = []
+        for i in range(itemCount):
+            workshopId = form.get(f"publishedfileids[{i}]", [""])[0]
+            if self.server.isMissing(workshopId):
+                entries.append({"publishedfileid": workshopId, "result": 9})
+                continue
+
+            entries.append({
+                "publishedfileid": workshopId,
+                "result": 1,
+                "title": f"Mod {workshopId}",
+                "preview_url": self.server.getImageUrl(workshopId),
+                "time_updated": 1700000000,
+            })
+
+        response = {"response": {"result": 1, "resultcount": len(entries), "publishedfiledetails": entries}}
+        self.send(json.dumps(response).encode(), "application/json")
+
+    def send(self, body, contentType, headers={}):
+        with self.server.lock:
+            self.server.bytesSent += len(body)
+
+        self.send_response(200)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def resetCounts(server):
+    with server.lock:
+        server.requestCount = 0
+        server.connectionCount = 0
+        server.pageCount = 0
+        server.detailsCount = 0
+        server.notModifiedCount = 0
+        server.bytesSent = 0
+
+
+def getResults(server, workshopIds, fetched, total):
+    return {
+        "Fetched": fetched,
+        "TotalSeconds": total,
+        "ThumbnailsPerSecond": len(workshopIds) / total,
+        "Requests": server.requestCount,
+        "PageRequests": server.pageCount,
+        "DetailsRequests": server.detailsCount,
+        "NotModified": server.notModifiedCount,
+        "MBSent": server.bytesSent / (1024 * 1024),
+        "Connections": server.connectionCount,
+    }
+
+
+# What IconQueueWorker used to do for every thumbnail, minus the one second between them.
+def timeSequential(server, itemUrl, workshopIds, parsePage):
+    resetCounts(server)
+
+    fetched = 0
+    start = time.perf_counter()
+    for workshopId in workshopIds:
+        imageUrl = parsePage(requests.get(itemUrl + workshopId).content)
+        if imageUrl is not None and len(requests.get(imageUrl).content) > 0:
+            fetched += 1
+
+    return getResults(server, workshopIds, fetched, time.perf_counter() - start)
+
+
+# Like IconQueueWorker, items are looked up a batch at a time and downloaded once they have been.
+# Without `detailsUrl` every thumbnail is found on its page.
+# `cached` holds ThumbnailIndex style entries by workshop id. They're sent along to only get thumbnails
+# that changed, and updated with what was downloaded.
+def timeFetcher(server, itemUrl, workshopIds, parsePage, workerCount, requestsPerSecond, detailsUrl=None, cached=None):
+    from src.ThumbnailFetcher import ThumbnailFetcher
+    from src.WorkshopDetails import PUBLISHED_FILE_DETAILS_BATCH_SIZE
+
+    resetCounts(server)
+
+    fetcher = ThumbnailFetcher(itemUrl, parsePage, workerCount, requestsPerSecond, detailsUrl=detailsUrl)
+    start = time.perf_counter()
+    futures = {}
+    for i in range(0, len(workshopIds), PUBLISHED_FILE_DETAILS_BATCH_SIZE):
+        batch = workshopIds[i:i + PUBLISHED_FILE_DETAILS_BATCH_SIZE]
+        fetcher.lookUp(batch)
+        for workshopId in batch:
+            entry = cached.get(workshopId) if cached is not None else None
+            futures[fetcher.submit(fetcher.fetch, workshopId, entry)] = workshopId
+
+    fetched = 0
+    changed = 0
+    for future in concurrent.futures.as_completed(futures):
+        thumbnail = future.result()
+        if thumbnail is None:
+            continue
+
+        fetched += 1
+        if thumbnail.content is not None:
+            changed += 1
+            if cached is not None:
+                cached[futures[future]] = {"Url": thumbnail.url, "ETag": thumbnail.etag, "LastModified": thumbnail.lastModified}
+
+    total = time.perf_counter() - start
+    fetcher.shutdown()
+
+    results = getResults(server, workshopIds, fetched, total)
+    results["Downloaded"] = changed
+    results["Workers"] = fetcher.workerCount
+    results["RequestsPerSecond"] = requestsPerSecond
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark downloading Bookworm's workshop thumbnails.")
+    parser.add_argument("--count", type=int, default=200, help="number of thumbnails")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds the server waits before answering")
+    parser.add_argument("--workers", type=int, default=4, help="ThumbnailFetcher workers, 0 for the default")
+    parser.add_argument("--rate", type=int, default=8, help="requests per second, 0 for no limit")
+    parser.add_argument("--missing", type=int, default=10, help="every nth item isn't found by the lookup, 0 for none")
+    parser.add_argument("--changed", type=int, default=20, help="every nth image changes before checking, 0 for none")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Bookworm's page parser, so the benchmark follows it if it changes.
+    with contextlib.redirect_stdout(sys.stderr):
+        from main import parseWorkshopPage
+
+    server = StandInServer(args.latency, makePreviewImage(args.seed), args.missing)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        itemUrl = server.getUrl() + ITEM_PATH
+        workshopIds = [str(FIRST_WORKSHOP_ID + i) for i in range(args.count)]
+
+        results = {
+            "Python": sys.version.split()[0],
+            "Platform": sys.platform,
+            "Thumbnails": args.count,
+            "LatencySeconds": args.latency,
+        }
+
+        print(f"Downloading {args.count} thumbnails one at a time", file=sys.stderr)
+        results["Sequential"] = timeSequential(server, itemUrl, workshopIds, parseWorkshopPage)
+
+        print(f"Downloading {args.count} thumbnails with ThumbnailFetcher from their pages", file=sys.stderr)
+        results["FetcherPages"] = timeFetcher(server, itemUrl, workshopIds, parseWorkshopPage, args.workers, args.rate)
+
+        print(f"Downloading {args.count} thumbnails with ThumbnailFetcher and lookups", file=sys.stderr)
+        detailsUrl = server.getUrl() + DETAILS_PATH
+        cached = {}
+        results["FetcherLookups"] = timeFetcher(
+            server, itemUrl, workshopIds, parseWorkshopPage, args.workers, args.rate, detailsUrl, cached
+        )
+
+        if args.changed > 0:
+            server.changedIds = set(workshopIds[::args.changed])
+
+        print(f"Checking {args.count} thumbnails for changes", file=sys.stderr)
+        results["FetcherRevalidation"] = timeFetcher(
+            server, itemUrl, workshopIds, parseWorkshopPage, args.workers, args.rate, detailsUrl, cached
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(json.dumps(results, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+# Times finding the thumbnail on workshop pages:
+#   - the way Bookworm used to, building a BeautifulSoup tree of the whole page and searching it
+#   - with parseWorkshopPage, which parses the page as it's read and stops at the thumbnail
+# Both have to find the same URL on every page. Pages saved from Steam can be passed with --pages,
+# otherwise sample pages laid out like Steam's are made up: items with several previews,
+# with a single letterboxed one and with none.
+#
+#   python benchmarks/bench_parse.py --repeat 5
+#   python benchmarks/bench_parse.py --pages saved_pages/
+
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+ROOT_PATH = os.path.dirname(BENCHMARKS_PATH)
+
+sys.path.insert(0, ROOT_PATH)
+
+from src.WorkshopPage import parseWorkshopPage, WORKSHOP_PAGE_CHUNK_SIZE
+
+PREVIEW_URL = "https://images.steamusercontent.com/ugc/{}/?imw=637&imh=358&ima=fit&impolicy=Letterbox&imcolor=%23000000&letterbox=true"
+
+
+# What parseWorkshopPage used to be.
+def parseWorkshopPageSoup(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    tag = soup.find("img", recursive=True, attrs={"id": "previewImageMain"})
+    if tag is not None:
+        return tag.attrs["src"]
+
+    tag = soup.find("img", recursive=True, attrs={"class": "workshopItemPreviewImageEnlargeable"})
+    if tag is not None:
+        src = tag.attrs["src"]
+        if src.endswith("true"):
+            src = src.removesuffix("true")
+            src = src + "false"
+
+        return src
+
+    return None
+
+
+def makeScript(rng, size):
+    lines = []
+    length = 0
+    while length < size:
+        line = f"\tvar g_{rng.randrange(1 << 30):x} = {{ \"rgItems\": [{rng.randrange(1 << 30)}, \"<img src='x'>\"] }};\n"
+        lines.append(line)
+        length += len(line)
+
+    return "<script type=\"text/javascript\">\n" + "".join(lines) + "</script>\n"
+
+
+def makeComments(rng, count):
+    comments = []
+    for i in range(count):
+        comments.append(
+            f'<div class="commentthread_comment responsive_body_text" id="comment_{rng.randrange(1 << 40)}">'
+            f'<div class="commentthread_comment_avatar playerAvatar offline"><a href="https://steamcommunity.com/id/user{i}">'
+            f'<img src="https://avatars.steamstatic.com/{rng.randrange(1 << 60):x}.jpg" srcset="x 1x, y 2x"></a></div>'
+            f'<div class="commentthread_comment_content"><div class="commentthread_comment_text">'
+            f'{"Great mod, works with Repentance+! " * rng.randrange(1, 8)}</div></div></div>\n'
+        )
+
+    return "".join(comments)
+
+
+# A page laid out like a workshop item's: scripts and the site header first, then the previews,
+# the description and a long list of comments.
+def makeSamplePage(rng, kind):
+    previewId = rng.randrange(1 << 60)
+    if kind == "Previews":
+        preview = (
+            '<div class="highlight_player_item highlight_screenshot"><div class="screenshot_holder">'
+            '<a class="highlight_screenshot_link" href="#">'
+            f'<img id="previewImageMain" class="workshopItemPreviewImageMain" src="{PREVIEW_URL.format(previewId)}">'
+            "</a></div></div>\n"
+        )
+        preview += "".join(
+            f'<div class="highlight_strip_item"><img src="{PREVIEW_URL.format(rng.randrange(1 << 60))}"></div>\n'
+            for _ in range(6)
+        )
+    elif kind == "SinglePreview":
+        preview = (
+            '<div class="workshopItemPreviewImageMain"><a onclick="ShowEnlargedImagePreviewModal(0);">'
+            f'<img id="previewImage" class="workshopItemPreviewImageEnlargeable" src="{PREVIEW_URL.format(previewId)}">'
+            "</a></div>\n"
+        )
+    else:
+        preview = '<div class="workshopItemPreviewArea"></div>\n'
+
+    return (
+        "<!DOCTYPE html>\n<html class=\"responsive\" lang=\"en\">\n<head>\n"
+        "<meta http-equiv=\"Content-Type\" content=\"text/html; charset=UTF-8\">\n"
+        "<title>Steam Workshop::Sample Mod</title>\n"
+        + "".join(makeScript(rng, 12000) for _ in range(8))
+        + "<style>" + ".responsive_page_frame { display: flex; }\n" * 800 + "</style>\n"
+        "</head>\n<body class=\"v6 workshop_item_page responsive_page\">\n"
+        + '<div class="responsive_header"><a class="menuitem" href="https://store.steampowered.com/">Store</a></div>\n' * 200
+        + '<div class="workshopItemPreviewHolder">\n' + preview + "</div>\n"
+        + '<div class="workshopItemDescription" id="highlightContent">'
+        + "Adds new items, enemies and a whole new floor. <br>" * 300 + "</div>\n"
+        + makeComments(rng, 250)
+        + makeScript(rng, 30000)
+        + "</body>\n</html>\n"
+    ).encode()
+
+
+def loadPages(pagesPath):
+    pages = {}
+    for fileName in sorted(os.listdir(pagesPath)):
+        if fileName.lower().endswith((".html", ".htm")):
+            with open(os.path.join(pagesPath, fileName), "rb") as f:
+                pages[fileName] = f.read()
+
+    return pages
+
+
+# Bytes parseWorkshopPage reads before it stops, when given the page a chunk at a time like a response.
+def getBytesRead(html):
+    read = 0
+
+    def chunks():
+        nonlocal read
+        for i in range(0, len(html), WORKSHOP_PAGE_CHUNK_SIZE):
+            chunk = html[i:i + WORKSHOP_PAGE_CHUNK_SIZE]
+            read += len(chunk)
+            yield chunk
+
+    parseWorkshopPage(chunks())
+    return read
+
+
+def timeParser(parse, html, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(html)
+        times.append(time.perf_counter() - start)
+
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark finding thumbnails on workshop pages.")
+    parser.add_argument("--pages", help="folder of saved workshop pages (.html) instead of sample ones")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per page, the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.pages is not None:
+        pages = loadPages(args.pages)
+    else:
+        rng = random.Random(args.seed)
+        pages = {kind: makeSamplePage(rng, kind) for kind in ("Previews", "SinglePreview", "NoPreview")}
+
+    results = {"Python": sys.version.split()[0], "Platform": sys.platform, "Pages": []}
+    for name, html in pages.items():
+        soupSeconds, soupResult = timeParser(parseWorkshopPageSoup, html, args.repeat)
+        streamSeconds, streamResult = timeParser(parseWorkshopPage, html, args.repeat)
+
+        results["Pages"].append({
+            "Page": name,
+            "KB": len(html) / 1024,
+            "KBRead": getBytesRead(html) / 1024,
+            "SoupMilliseconds": soupSeconds * 1000,
+            "StreamMilliseconds": streamSeconds * 1000,
+            "Speedup": soupSeconds / streamSeconds,
+            "SameResult": soupResult == streamResult,
+            "Result": streamResult,
+        })
+
+    print(json.dumps(results, indent=2))
+
+    return 0 if all(page["SameResult"] for page in results["Pages"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import contextlib
+
+# Times Bookworm's mod scanning on synthetic mods folders:
+#   - loadModData (reading metadata.xml) on every folder
+#   - a full ModList.loadMods population, with and without a warm metadata index
+#   - time until the first row shows up, and peak memory
+# Every size runs in its own process under QT_QPA_PLATFORM=offscreen, results are printed as JSON.
+#
+#   python benchmarks/bench_scan.py --sizes 100,1000,5000 --output bench_output.json
+
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+ROOT_PATH = os.path.dirname(BENCHMARKS_PATH)
+
+sys.path.insert(0, ROOT_PATH)
+sys.path.insert(0, BENCHMARKS_PATH)
+
+from generate import generateModsFolder
+
+POPULATE_TIMEOUT = 600
+
+
+def getPeakMemory():
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows.
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Kilobytes on Linux, bytes on macOS.
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+
+    return peak / 1024
+
+
+# Bookworm loads its images and writes its cache relative to the working directory,
+# so each run gets a fresh one with the resources next to it.
+def makeWorkFolder():
+    workPath = tempfile.mkdtemp(prefix="bookworm-bench-")
+    try:
+        os.symlink(os.path.join(ROOT_PATH, "resources"), os.path.join(workPath, "resources"))
+    except (OSError, NotImplementedError):
+        shutil.copytree(os.path.join(ROOT_PATH, "resources"), os.path.join(workPath, "resources"))
+
+    return workPath
+
+
+def timeLoadModData(folderPaths):
+    from src.ModScanner import loadModData
+
+    start = time.perf_counter()
+    for folderPath in folderPaths:
+        loadModData(folderPath)
+
+    total = time.perf_counter() - start
+    return {"TotalSeconds": total, "PerModMicroseconds": total / max(1, len(folderPaths)) * 1e6}
+
+
+# Tears a ModList down completely, the way the app does when it quits. Left to be garbage collected,
+# it would be destroyed in the middle of the next population with its watcher and threads still running.
+def shutDown(app, modList):
+    from PySide6.QtCore import QEvent
+
+    modList.modThread.requestInterruption()
+    modList.modLoaderWorker.destroy.emit()
+    modList.modThread.wait()
+
+    watched = modList.watcher.files() + modList.watcher.directories()
+    if len(watched) > 0:
+        modList.watcher.removePaths(watched)
+
+    modList.modLoaderWorker.deleteLater()
+    modList.modThread.deleteLater()
+    modList.deleteLater()
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    app.processEvents()
+
+
+def timePopulation(main, app, expectedRows):
+    from PySide6.QtCore import QEventLoop
+
+    start = time.perf_counter()
+    modList = main.ModList()
+    modList.modThread.started.connect(modList.modLoaderWorker.start)
+    modList.modThread.start()
+
+    firstRow = None
+    rows = 0
+    while rows < expectedRows and time.perf_counter() - start < POPULATE_TIMEOUT:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 50)
+
+        rows = modList.model().rowCount()
+        if firstRow is None and rows > 0:
+            firstRow = time.perf_counter() - start
+
+    full = time.perf_counter() - start
+
+    shutDown(app, modList)
+
+    return {
+        "Rows": rows,
+        "TimeToFirstRowSeconds": firstRow,
+        "TimeToFullListSeconds": full,
+        "TimedOut": rows < expectedRows,
+    }
+
+
+# Runs inside the child process for one mods folder.
+def runBenchmark(modsPath):
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+    workPath = makeWorkFolder()
+    os.chdir(workPath)
+
+    results = {}
+    try:
+        # Bookworm prints about every broken mod, keep stdout for the results.
+        with contextlib.redirect_stdout(sys.stderr):
+            from PySide6.QtCore import QSettings
+            from PySide6.QtWidgets import QApplication
+
+            import main
+            from src.ModDiscovery import listModFolders
+
+            app = QApplication([])
+            main.settings = QSettings("settings.ini", QSettings.Format.IniFormat)
+            main.settings.setValue("ModsFolder", modsPath)
+            main.settings.setValue("AutomaticThumbnailDownload", "0")
+            main.applyDefaultSettings(main.settings)
+
+            folderPaths = listModFolders(modsPath)
+            results["Mods"] = len(folderPaths)
+            results["LoadModData"] = timeLoadModData(folderPaths)
+
+            # The first population builds the metadata index, the second one reads it.
+            results["PopulateColdIndex"] = timePopulation(main, app, len(folderPaths))
+            results["PopulateWarmIndex"] = timePopulation(main, app, len(folderPaths))
+
+            results["PeakMemoryMB"] = getPeakMemory()
+    finally:
+        os.chdir(ROOT_PATH)
+        shutil.rmtree(workPath, ignore_errors=True)
+
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Bookworm's mod scanning.")
+    parser.add_argument("--sizes", default="100,1000,5000", help="comma separated mod counts (100 to 20000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results here instead of stdout")
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        runBenchmark(args.run)
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip() != ""]
+    results = {"Python": sys.version.split()[0], "Platform": sys.platform, "Runs": []}
+
+    for size in sizes:
+        modsPath = tempfile.mkdtemp(prefix=f"bookworm-mods-{size}-")
+        try:
+            print(f"Generating {size} mods", file=sys.stderr)
+            generateModsFolder(modsPath, size, args.seed)
+
+            print(f"Benchmarking {size} mods", file=sys.stderr)
+            env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+            process = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run", modsPath],
+                stdout=subprocess.PIPE,
+                env=env,
+            )
+
+            if process.returncode != 0:
+                results["Runs"].append({"Size": size, "Error": f"exited with code {process.returncode}"})
+                continue
+
+            run = json.loads(process.stdout.decode().strip().splitlines()[-1])
+            run["Size"] = size
+            results["Runs"].append(run)
+        finally:
+            shutil.rmtree(modsPath, ignore_errors=True)
+
+    output = json.dumps(results, indent=2)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+# Times loading mod thumbnails the two ways Bookworm has stored them:
+#   - one cache/thumb-<workshop id>.png per mod, checked for and decoded one by one
+#   - the thumbnail atlas, opened and mapped once with every thumbnail a slice of it
+# Both are turned into the QPixmaps the mod list paints. Runs under QT_QPA_PLATFORM=offscreen.
+# The files were just written, so both read from the OS's file cache.
+#
+#   python benchmarks/bench_thumbnails.py --count 2000
+
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+ROOT_PATH = os.path.dirname(BENCHMARKS_PATH)
+
+sys.path.insert(0, ROOT_PATH)
+
+FIRST_WORKSHOP_ID = 2000000000
+
+
+def generateThumbnails(cachePath, count, seed):
+    from PySide6.QtGui import QImage, QColor
+    from src.ThumbnailAtlas import THUMBNAIL_SIZE
+
+    rng = random.Random(seed)
+    for i in range(count):
+        image = QImage(THUMBNAIL_SIZE, THUMBNAIL_SIZE, QImage.Format.Format_RGBA8888)
+        image.fill(QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+
+        # Some detail so they don't compress to nothing.
+        for _ in range(64):
+            image.setPixelColor(rng.randrange(THUMBNAIL_SIZE), rng.randrange(THUMBNAIL_SIZE), QColor(rng.randrange(256 ** 3)))
+
+        image.save(os.path.join(cachePath, f"thumb-{FIRST_WORKSHOP_ID + i}.png"))
+
+
+def timePngs(cachePath, workshopIds):
+    from PySide6.QtGui import QImage, QPixmap
+
+    start = time.perf_counter()
+    for workshopId in workshopIds:
+        filePath = os.path.join(cachePath, f"thumb-{workshopId}.png")
+        if os.path.exists(filePath):
+            QPixmap.fromImage(QImage(filePath))
+
+    total = time.perf_counter() - start
+    return {"TotalSeconds": total, "PerThumbnailMicroseconds": total / max(1, len(workshopIds)) * 1e6}
+
+
+def timeAtlas(atlasPath, workshopIds):
+    from PySide6.QtGui import QPixmap
+    from src.ThumbnailAtlas import ThumbnailAtlas
+
+    start = time.perf_counter()
+    atlas = ThumbnailAtlas(atlasPath)
+    opened = time.perf_counter() - start
+
+    for workshopId in workshopIds:
+        if atlas.contains(workshopId):
+            QPixmap.fromImage(atlas.getImage(workshopId))
+
+    total = time.perf_counter() - start
+    return {
+        "OpenSeconds": opened,
+        "TotalSeconds": total,
+        "PerThumbnailMicroseconds": total / max(1, len(workshopIds)) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading Bookworm's mod thumbnails.")
+    parser.add_argument("--count", type=int, default=2000, help="number of thumbnails")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtWidgets import QApplication
+    from src.ThumbnailAtlas import ThumbnailAtlas
+
+    app = QApplication([])
+
+    workPath = tempfile.mkdtemp(prefix="bookworm-thumbnails-")
+    try:
+        cachePath = os.path.join(workPath, "cache")
+        os.makedirs(cachePath)
+
+        print(f"Generating {args.count} thumbnails", file=sys.stderr)
+        generateThumbnails(cachePath, args.count, args.seed)
+        workshopIds = [str(FIRST_WORKSHOP_ID + i) for i in range(args.count)]
+
+        results = {"Python": sys.version.split()[0], "Platform": sys.platform, "Thumbnails": args.count}
+        results["Pngs"] = timePngs(cachePath, workshopIds)
+
+        atlasPath = os.path.join(cachePath, "thumbnails.atlas")
+        start = time.perf_counter()
+        migrated = ThumbnailAtlas(atlasPath).migrate(cachePath)
+        results["Migration"] = {"Migrated": migrated, "TotalSeconds": time.perf_counter() - start}
+
+        results["Atlas"] = timeAtlas(atlasPath, workshopIds)
+        results["AtlasMB"] = os.path.getsize(atlasPath) / (1024 * 1024)
+    finally:
+        shutil.rmtree(workPath, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import os
+import sys
+import random
+import argparse
+
+# Generates a fake mods folder that looks like a real one to Bookworm:
+# mostly valid mods, some with broken or missing metadata.xml, some disabled,
+# and workshop-style BBCode descriptions of very different lengths.
+
+BBCODE_PARAGRAPHS = (
+    "[h1]Features[/h1]\n[list]\n[*] New items\n[*] New enemies\n[*] A whole new floor\n[/list]\n",
+    "[b]Compatible with Repentance+![/b] Report bugs in the comments.\n",
+    "[img]https://example.com/preview.png[/img]\n",
+    "[spoiler]The secret unlock is on the Womb floor.[/spoiler]\n",
+    "[url=https://example.com]Join the Discord[/url] for updates and support.\n",
+    "[olist]\n[*] Subscribe\n[*] Enable the mod\n[*] Start a new run\n[/olist]\n",
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore. ",
+)
+
+NAME_WORDS = (
+    "Better", "Item", "Pools", "Fiend", "Folio", "External", "Descriptions", "Enhanced", "Boss", "Bars",
+    "Retribution", "Epiphany", "Revelations", "Tainted", "Treasures", "Fall", "From", "Grace", "Samael",
+    "Music", "Mod", "Callback", "Library", "Sprites", "Reworked", "Co-op", "Ghosts", "Challenge", "Rooms",
+)
+
+
+def makeDescription(rng, maxLength):
+    # Most descriptions are short, a few are huge.
+    length = int(min(maxLength, rng.paretovariate(1.2) * 200))
+
+    parts = []
+    size = 0
+    while size < length:
+        part = rng.choice(BBCODE_PARAGRAPHS)
+        parts.append(part)
+        size += len(part)
+
+    return "".join(parts)
+
+
+def makeMetadata(rng, index, workshop, maxDescription):
+    name = " ".join(rng.choice(NAME_WORDS) for _ in range(rng.randint(1, 4)))
+    workshopTag = f"\t<id>{2000000000 + index}</id>\n" if workshop else ""
+    description = makeDescription(rng, maxDescription)
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        "<metadata>\n"
+        f"\t<name>{name} {index}</name>\n"
+        f"\t<directory>{name.lower().replace(' ', '_')}_{index}</directory>\n"
+        f"{workshopTag}"
+        f"\t<description>{description}</description>\n"
+        f"\t<version>1.{index % 10}</version>\n"
+        "\t<visibility>Public</visibility>\n"
+        "</metadata>\n"
+    )
+
+
+def generateModsFolder(path, count, seed=0, malformed=0.02, missing=0.02, disabled=0.2, workshop=0.8, maxDescription=40000):
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+
+    for index in range(count):
+        folderPath = os.path.join(path, f"mod_{index:05d}")
+        os.makedirs(folderPath, exist_ok=True)
+
+        # Some files every mod has, so folder listings aren't unrealistically small.
+        with open(os.path.join(folderPath, "main.lua"), "w") as f:
+            f.write("local mod = RegisterMod('bench', 1)\n")
+
+        roll = rng.random()
+        if roll < missing:
+            continue
+
+        with open(os.path.join(folderPath, "metadata.xml"), "w", encoding="utf-8") as f:
+            if roll < missing + malformed:
+                f.write("<metadata>\n\t<name>Broken mod")
+            else:
+                f.write(makeMetadata(rng, index, rng.random() < workshop, maxDescription))
+
+        if rng.random() < disabled:
+            open(os.path.join(folderPath, "disable.it"), "w").close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic mods folder.")
+    parser.add_argument("path")
+    parser.add_argument("count", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--malformed", type=float, default=0.02, help="share of mods with a broken metadata.xml")
+    parser.add_argument("--missing", type=float, default=0.02, help="share of mods without a metadata.xml")
+    parser.add_argument("--disabled", type=float, default=0.2, help="share of mods with a disable.it")
+    args = parser.parse_args()
+
+    generateModsFolder(args.path, args.count, args.seed, args.malformed, args.missing, args.disabled)
+    print(f"Generated {args.count} mods in {args.path}", file=sys.stderr)
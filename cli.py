@@ -0,0 +1,165 @@
+import sys
+import os
+import json
+import argparse
+import contextlib
+
+from src.BookwormCore import readSetting, scanMods, applyModPack
+from src.ModPack import ModPack, PackLoadError, loadPackFolder
+
+# Command line version of Bookworm, for scripting without starting Qt.
+#   cli.py scan [--json]
+#   cli.py packs [--json]
+#   cli.py apply <pack name or .xml path> [--dry-run] [--json]
+
+# Fields printed for each mod with --json.
+MOD_JSON_FIELDS = ("Name", "Directory", "WorkshopId", "Version", "Enabled", "Loaded", "FolderPath")
+
+
+def getModsFolder(args):
+    modsPath = args.mods
+    if modsPath is None:
+        modsPath = readSetting("ModsFolder", os.path.join(args.root, "settings.ini"))
+
+    if not modsPath or not os.path.isdir(modsPath):
+        print("Could not find the mods folder, pass it with --mods or locate it in Bookworm first.", file=sys.stderr)
+        return None
+
+    return modsPath
+
+
+def loadMods(args):
+    modsPath = getModsFolder(args)
+    if modsPath is None:
+        return None
+
+    # Problems with single mods are printed while scanning, keep them out of the output.
+    with contextlib.redirect_stdout(sys.stderr):
+        return scanMods(modsPath, os.path.join(args.root, "cache", "modindex.json"))
+
+
+def loadPacks(args):
+    with contextlib.redirect_stdout(sys.stderr):
+        return loadPackFolder(os.path.join(args.root, "packs"))
+
+
+def printMods(loadedMods, asJson):
+    if asJson:
+        mods = [{field: loadedData[field] for field in MOD_JSON_FIELDS} for loadedData in loadedMods]
+        print(json.dumps(mods, indent=2))
+        return
+
+    for loadedData in loadedMods:
+        if not loadedData["Loaded"]:
+            print(f"[!] Failed to read mod data ({loadedData['FolderPath']})")
+        else:
+            state = "x" if loadedData["Enabled"] else " "
+            print(f"[{state}] {loadedData['Name']} ({loadedData['Directory']})")
+
+
+def scanCommand(args):
+    loadedMods = loadMods(args)
+    if loadedMods is None:
+        return 1
+
+    printMods(loadedMods, args.json)
+    return 0
+
+
+def packsCommand(args):
+    packs = loadPacks(args)
+
+    if args.json:
+        print(json.dumps(
+            [
+                {
+                    "Name": pack.name,
+                    "UUID": pack.uuid,
+                    "Created": pack.dateCreated,
+                    "Modified": pack.dateModified,
+                    "Mods": list(pack.mods),
+                    "FilePath": pack.filePath,
+                }
+                for pack in packs
+            ],
+            indent=2,
+        ))
+        return 0
+
+    for pack in packs:
+        print(f"{pack.name} ({len(pack.mods)} mods)")
+
+    return 0
+
+
+def applyCommand(args):
+    # Either a path to a pack file or the name of a saved pack.
+    if os.path.isfile(args.pack):
+        pack = ModPack()
+        try:
+            pack.deserialize(args.pack)
+        except PackLoadError as e:
+            print(e, file=sys.stderr)
+            return 1
+    else:
+        matches = [pack for pack in loadPacks(args) if pack.name == args.pack]
+        if len(matches) == 0:
+            print(f'No pack file or saved pack named "{args.pack}"', file=sys.stderr)
+            return 1
+
+        pack = matches[0]
+
+    loadedMods = loadMods(args)
+    if loadedMods is None:
+        return 1
+
+    toggled = applyModPack(pack, loadedMods, args.dry_run)
+
+    # A dry run leaves the mods as they were, report the state they would be in like a real run does.
+    if args.dry_run:
+        toggled = [dict(loadedData, Enabled=not loadedData["Enabled"]) for loadedData in toggled]
+
+    if args.json:
+        printMods(toggled, True)
+    else:
+        verb = "Would toggle" if args.dry_run else "Toggled"
+        for loadedData in toggled:
+            state = "on" if loadedData["Enabled"] else "off"
+            print(f"{verb} {loadedData['Name']} ({loadedData['Directory']}) {state}")
+
+        print(f'Applied pack "{pack.name}", {len(toggled)} mods changed')
+
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="bookworm", description="Manage Repentance mods and modpacks.")
+    parser.add_argument(
+        "--root",
+        default=os.path.dirname(os.path.abspath(__file__)),
+        help="folder with Bookworm's settings.ini, packs and cache (defaults to where Bookworm is)",
+    )
+    parser.add_argument("--mods", help="mods folder to use instead of the one in settings.ini")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="list every mod and whether it's enabled")
+    scan.add_argument("--json", action="store_true")
+    scan.set_defaults(run=scanCommand)
+
+    packs = commands.add_parser("packs", help="list saved packs")
+    packs.add_argument("--json", action="store_true")
+    packs.set_defaults(run=packsCommand)
+
+    apply = commands.add_parser("apply", help="enable the mods in a pack and disable the rest")
+    apply.add_argument("pack", help="name of a saved pack or path to a pack .xml file")
+    apply.add_argument("--dry-run", action="store_true", help="only print what would change")
+    apply.add_argument("--json", action="store_true")
+    apply.set_defaults(run=applyCommand)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,31 @@
 import sys
 import os
 import re
-import uuid
-import requests
+import time
+import multiprocessing
+import operator
+import threading
+import concurrent.futures
 
+from collections import deque
 from enum import Enum
-from datetime import datetime as date
-from PIL import Image
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
 from src.WidgetStyles import *
-import defusedxml.ElementTree as ET
-import xml.etree.ElementTree as OtherET
+from src.ResourceCache import getPixmap, getIcon, ThumbnailCache
+from src.ThumbnailAtlas import ThumbnailAtlas, decodeImagePixels
+from src.ThumbnailFetcher import ThumbnailFetcher, THUMBNAIL_REQUESTS_PER_SECOND
+from src.ThumbnailIndex import ThumbnailIndex
+from src.WorkshopDetails import PUBLISHED_FILE_DETAILS_BATCH_SIZE
+from src.WorkshopPage import parseWorkshopPage
+from src.ModScanner import ModScanner, DescriptionCache
+from src.ModDiscovery import listModFolders
+from src.ModPack import ModPack, PackIndex, PackLoadError, getDateNow
+from src.ModRecord import ModRecord
+from src.ModSearch import ModSearchIndex
 import bbcode
-from bs4 import BeautifulSoup
 
 STEAM_PATH = None
 WORKSHOP_QUERY_WAIT = 0.8
@@ -27,12 +37,17 @@ class ModSortingMode(Enum):
     NameDescending = 2
     Enabled = 3  # Enabled with NameAscending
     Disabled = 4  # Disabled with NameAscending
+    WorkshopId = 5  # Lowest ID first, mods without one after
+    LastModified = 6  # Most recently modified folder first
+    PackCount = 7  # In the most packs first
 
 
 selectedMod = None
 iconQueueOpen = True
 iconQueue = []
-modQueue = []
+
+# Downloaded thumbnails due to be checked for changes, see ThumbnailIndex.
+revalidateQueue = []
 
 class DirectoryLocationDialog(QFileDialog):
     def __init__(self, mainWindow=None):
@@ -134,451 +149,722 @@ def applyDefaultSettings(settings):
     if settings.value("AutomaticThumbnailDownload") is None:
         settings.setValue("AutomaticThumbnailDownload", "1")
 
+    # 0 picks a worker count based on the CPU.
+    if settings.value("ScanWorkers") is None:
+        settings.setValue("ScanWorkers", "0")
+
+    # Parse metadata.xml files in separate processes instead of threads.
+    if settings.value("ScanWithProcesses") is None:
+        settings.setValue("ScanWithProcesses", "0")
+
+    # Thumbnails downloaded at once, 0 picks the default.
+    if settings.value("ThumbnailDownloadWorkers") is None:
+        settings.setValue("ThumbnailDownloadWorkers", "0")
+
+    # Most requests sent to Steam per second while downloading thumbnails, 0 for no limit.
+    if settings.value("ThumbnailRequestsPerSecond") is None:
+        settings.setValue("ThumbnailRequestsPerSecond", str(THUMBNAIL_REQUESTS_PER_SECOND))
 
-def parseWorkshopPage(html):
-    soup = BeautifulSoup(html, "html.parser")
-    tag = soup.find("img", recursive=True, attrs={"id": "previewImageMain"})
-    if tag is not None:
-        return tag.attrs["src"]
+    # Days before a downloaded thumbnail is checked for changes, 0 to never check.
+    if settings.value("ThumbnailRefreshDays") is None:
+        settings.setValue("ThumbnailRefreshDays", str(THUMBNAIL_REFRESH_DAYS))
 
-    # There's no thumbnails, just an icon.
-    tag = soup.find(
-        "img", recursive=True, attrs={"class": "workshopItemPreviewImageEnlargeable"}
-    )
-    if tag is not None:
-        src = tag.attrs["src"]
 
-        # Letterboxed is true, meaning it'll have black squares to the left and right.
-        # Remove the letterbox by removing that from the end of the url.
-        if src.endswith("true"):
-            src = src.removesuffix("true")
-            src = src + "false"
+# How often finished downloads are handed back and new ones started, in milliseconds.
+ICON_QUEUE_INTERVAL = 100
 
-        return src
+# Threads decoding and resizing downloaded thumbnails, apart from the ones downloading them.
+# Pillow lets go of the GIL while it decodes and resizes, so threads are enough.
+THUMBNAIL_PROCESS_WORKERS = 2
 
-    return None
 
+# Downloads the thumbnails in `iconQueue` a few at a time, see ThumbnailFetcher.
 class IconQueueWorker(QObject):
     destroy = Signal()
+    # Workshop id, the image to show instead if it failed and whether it failed.
     iconFetched = Signal(str, str, bool)
 
+    def __init__(self, thumbnailAtlas, thumbnailIndex, workerCount=0, requestsPerSecond=THUMBNAIL_REQUESTS_PER_SECOND):
+        super().__init__()
+
+        self.thumbnailAtlas = thumbnailAtlas
+        self.thumbnailIndex = thumbnailIndex
+        self.workerCount = workerCount
+        self.requestsPerSecond = requestsPerSecond
+
     def start(self):
         self.paused = False
+        self.fetcher = ThumbnailFetcher(
+            WORKSHOP_ITEM_URL, parseWorkshopPage, self.workerCount, self.requestsPerSecond
+        )
+        self.processor = concurrent.futures.ThreadPoolExecutor(
+            THUMBNAIL_PROCESS_WORKERS, thread_name_prefix="ThumbnailProcessor"
+        )
+        self.pending = {}  # Workshop id of every running download, and whether it's checking one for changes.
+        self.decoding = {}  # The same for every downloaded thumbnail being decoded and stored.
+        self.lookup = None  # Running lookup of the items next in the queue.
+
         self.timer = QTimer()
         self.timer.timeout.connect(self.process)
-        self.timer.start(1000)
+        self.timer.start(ICON_QUEUE_INTERVAL)
 
         self.destroy.connect(self.stop)
 
     def stop(self):
         self.timer.stop()
+        self.fetcher.shutdown()
+        self.processor.shutdown(wait=True, cancel_futures=True)
+        self.thumbnailIndex.save()
         QThread.currentThread().exit()
 
     def toggle(self):
         self.paused = not self.paused
 
+    # Runs on the fetcher's threads. `cached` is the ThumbnailIndex entry of a thumbnail being checked for changes.
+    # Only downloads it, decoding is left to the processor so it doesn't hold up the next download.
+    def downloadThumbnail(self, workshopId, cached=None):
+        return self.fetcher.fetch(workshopId, cached)
+
+    # Runs on the processor's threads. Returns True if the thumbnail was stored.
+    def storeThumbnail(self, workshopId, fetched):
+        # The atlas stores it at the size it's shown at.
+        if not self.thumbnailAtlas.put(workshopId, decodeImagePixels(fetched.content)):
+            return False
+
+        self.thumbnailIndex.store(workshopId, fetched.url, fetched.etag, fetched.lastModified)
+        return True
+
+    # The workshop item has no thumbnail that can be downloaded, most likely because it was removed or made private.
+    # It isn't queued again until its backoff runs out, see ThumbnailIndex.
+    def storeFailure(self, workshopId):
+        count, retryAt = self.thumbnailIndex.storeFailure(workshopId)
+        print(
+            f"Could not grab icon for workshop id {workshopId}, failed {count} time(s), "
+            f"not trying again until {time.ctime(retryAt)}"
+        )
+
+    # `updated` is True if a new thumbnail was stored, None if the cached one is still current
+    # and False if it couldn't be downloaded.
+    def finishThumbnail(self, workshopId, revalidating, updated):
+        if revalidating:
+            # The thumbnail that's there is kept if it couldn't be checked.
+            if updated:
+                self.iconFetched.emit(workshopId, "", False)
+        elif updated is not False:
+            # Set mod icon.
+            self.iconFetched.emit(workshopId, "", False)
+        else:
+            self.iconFetched.emit(workshopId, "resources/no_icon.png", True)
+
+    # Starts looking up the next items in `queue` that haven't been yet.
+    # Thumbnails that are already downloaded only need it if they're being checked for changes.
+    def lookUpNext(self, queue, revalidating):
+        workshopIds = []
+        for workshopId in dict.fromkeys(queue):
+            if self.fetcher.isLookedUp(workshopId):
+                continue
+
+            if revalidating or not self.thumbnailAtlas.contains(workshopId):
+                workshopIds.append(workshopId)
+                if len(workshopIds) == PUBLISHED_FILE_DETAILS_BATCH_SIZE:
+                    break
+
+        if len(workshopIds) > 0:
+            self.lookup = self.fetcher.submit(self.fetcher.lookUp, workshopIds)
+
     def process(self):
         if QThread.currentThread().isInterruptionRequested():
             self.stop()
             return
 
-        if len(iconQueue) == 0 or self.paused:
-            return
+        for future in [future for future in self.pending if future.done()]:
+            workshopId, revalidating = self.pending.pop(future)
+            try:
+                fetched = future.result()
+            except Exception as e:
+                # The fetcher already retried it if that could help. It's tried again next time it's queued.
+                print(f"Could not grab icon for workshop id {workshopId} ({e})")
+                self.finishThumbnail(workshopId, revalidating, False)
+                continue
+
+            if fetched is None:
+                self.storeFailure(workshopId)
+                self.finishThumbnail(workshopId, revalidating, False)
+            elif fetched.content is None:
+                self.thumbnailIndex.refresh(workshopId)
+                self.finishThumbnail(workshopId, revalidating, None)
+            else:
+                self.decoding[self.processor.submit(self.storeThumbnail, workshopId, fetched)] = (workshopId, revalidating)
+
+        for future in [future for future in self.decoding if future.done()]:
+            workshopId, revalidating = self.decoding.pop(future)
+            try:
+                updated = future.result()
+            except Exception as e:
+                # Downloading the same broken image again won't help.
+                print(f"Could not decode icon for workshop id {workshopId} ({e})")
+                self.storeFailure(workshopId)
+                updated = False
+
+            self.finishThumbnail(workshopId, revalidating, updated)
+
+        if self.lookup is not None and self.lookup.done():
+            self.lookup = None
 
-        workshopId = iconQueue.pop(0)
-        filePath = f"cache/thumb-{workshopId}.png"
+        if self.paused:
+            return
 
-        if not os.path.exists(filePath):
-            fetched = requests.get(WORKSHOP_ITEM_URL + workshopId)
-            html = fetched.content
-            parsed = parseWorkshopPage(html)
-            if parsed is not None:
-                if not os.path.exists("cache/") or not os.path.isdir("cache/"):
-                    os.makedirs("cache/")
+        # Missing thumbnails come first, checking the ones that are there waits for them.
+        revalidating = len(iconQueue) == 0
+        queue = revalidateQueue if revalidating else iconQueue
 
-                imgData = requests.get(parsed)
+        # Thumbnail URLs for the next items in the queue are looked up together, ahead of downloading them.
+        if self.lookup is None:
+            self.lookUpNext(queue, revalidating)
 
-                with open(filePath, "wb") as f:
-                    f.write(imgData.content)
+        # Only as many are taken off the queue as there are workers,
+        # so the rest can still be cleared or paused.
+        while len(queue) > 0 and len(self.pending) < self.fetcher.workerCount:
+            workshopId = queue[0]
+            downloaded = self.thumbnailAtlas.contains(workshopId)
+            if not self.fetcher.isLookedUp(workshopId) and (revalidating or not downloaded):
+                break
 
-                # Resize to save on space.
-                # It only displays as 64x64 anyway.
-                image = Image.open(filePath)
-                resized = image.resize((64, 64))
-                resized.save(filePath)
+            queue.pop(0)
 
+            if revalidating:
+                # Nothing to check if it was deleted since.
+                if downloaded:
+                    future = self.fetcher.submit(self.downloadThumbnail, workshopId, self.thumbnailIndex.getEntry(workshopId))
+                    self.pending[future] = (workshopId, True)
+            elif downloaded:
                 # Set mod icon.
-                self.iconFetched.emit(workshopId, filePath, False)
+                self.iconFetched.emit(workshopId, "", False)
             else:
-                print(f"Could not grab icon for workshop id {workshopId}")
-                self.iconFetched.emit(workshopId, "resources/no)icon.png", True)
-        else:
-            # Set mod icon.
-            self.iconFetched.emit(workshopId, filePath, False)
+                self.pending[self.fetcher.submit(self.downloadThumbnail, workshopId)] = (workshopId, False)
+
+        if len(self.pending) == 0 and len(self.decoding) == 0 and len(iconQueue) == 0 and len(revalidateQueue) == 0:
+            self.thumbnailIndex.save()
+
+# Most thumbnails waiting to be decoded, older requests are dropped for newer ones.
+# Scrolling quickly past mods shouldn't leave a backlog of thumbnails nobody can see anymore.
+THUMBNAIL_QUEUE_SIZE = 64
+
+
+# Loads mod thumbnails from the atlas off the GUI thread, so reading the file never holds up painting.
+# A QImage can be made on any thread but a QPixmap can't, so the images are turned into pixmaps
+# once they're back on the GUI thread.
+class ThumbnailLoader(QObject):
+    # Workshop id, the generation it was requested at and the image.
+    thumbnailDecoded = Signal(str, int, QImage)
+
+    def __init__(self, thumbnailAtlas):
+        super().__init__()
+
+        self.thumbnailAtlas = thumbnailAtlas
+
+        # Shared with the GUI thread.
+        self.lock = threading.Lock()
+        self.requests = deque(maxlen=THUMBNAIL_QUEUE_SIZE)
+        self.decoding = None
+
+    # Called from the GUI thread with (workshop id, generation) pairs, see ModListModel.getThumbnailGeneration.
+    # Returns True if the loader was idle and has to be told to process.
+    def request(self, thumbnails):
+        with self.lock:
+            wasIdle = len(self.requests) == 0
+            for thumbnail in thumbnails:
+                if thumbnail != self.decoding and thumbnail not in self.requests:
+                    self.requests.append(thumbnail)
+
+            return wasIdle and len(self.requests) > 0
+
+    def process(self):
+        while not QThread.currentThread().isInterruptionRequested():
+            with self.lock:
+                if len(self.requests) == 0:
+                    self.decoding = None
+                    return
+
+                # Newest first, those are the rows on screen now.
+                self.decoding = self.requests.pop()
+                workshopId, generation = self.decoding
+
+            image = self.thumbnailAtlas.getImage(workshopId)
+            self.thumbnailDecoded.emit(workshopId, generation, image if image is not None else QImage())
+
+# Mods are sent to the list in batches so it isn't re-sorted for every single mod.
+MOD_BATCH_SIZE = 200
+MOD_BATCH_INTERVAL = 0.05
+
+# How long the mods folder has to stay quiet before changes are picked up, in milliseconds.
+MOD_WATCH_DELAY = 500
+
+# How long typing in the search box has to pause before the mod list is filtered, in milliseconds.
+MOD_FILTER_DELAY = 150
+
 
 class ModLoader(QObject):
     destroy = Signal()
-    modLoaded = Signal(dict)
+    modsLoaded = Signal(int, list)
+
+    def __init__(self, workerCount=0, useProcesses=False):
+        super().__init__()
+
+        self.workerCount = workerCount
+        self.useProcesses = useProcesses
+
+        # Set by the mod list from the main thread, older scans stop as soon as a newer one is requested.
+        self.latestScan = 0
 
     def start(self):
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.load)
-        self.timer.start(10)
+        self.scanner = ModScanner(self.workerCount, self.useProcesses)
 
         self.destroy.connect(self.stop)
 
     def stop(self):
-        self.timer.stop()
+        self.scanner.shutdown()
         QThread.currentThread().exit()
 
-    def load(self):
-        if QThread.currentThread().isInterruptionRequested():
-            self.stop()
-            return
+    def isCancelled(self, scanId):
+        return QThread.currentThread().isInterruptionRequested() or scanId != self.latestScan
 
-        if len(modQueue) == 0:
+    def load(self, scanId, folderPaths, knownSignatures):
+        if self.isCancelled(scanId):
             return
 
-        folderPath = modQueue.pop(0)
-        loadedData = ModItem.loadFromFile(folderPath)
-        self.modLoaded.emit(loadedData)
+        batch = []
+        lastEmit = time.perf_counter()
 
+        def emitBatch():
+            nonlocal batch, lastEmit
+            if len(batch) > 0:
+                self.modsLoaded.emit(scanId, batch)
+                batch = []
 
+            lastEmit = time.perf_counter()
 
+        def modLoaded(loadedData):
+            batch.append(loadedData)
 
-class ModItem(QListWidgetItem):
-    def __init__(self, data):
+            # Send early every now and then so the list starts filling in straight away.
+            if len(batch) >= MOD_BATCH_SIZE or time.perf_counter() - lastEmit >= MOD_BATCH_INTERVAL:
+                emitBatch()
 
-        super().__init__()
+        finished = self.scanner.scan(
+            folderPaths, modLoaded, lambda: self.isCancelled(scanId), knownSignatures
+        )
+        if finished:
+            emitBatch()
 
-        self.loaded = data["Loaded"]
-        self.folderPath = data["FolderPath"]
-        self.directory = data["Directory"]
-        self.workshopId = data["WorkshopId"]
-        self.name = data["Name"]
-        self.description = data["Description"]
-        self.version = data["Version"]
-        self.enabled = data["Enabled"]
 
-        self.sortingMode = ModSortingMode.NameAscending
-        self.widget = QWidget()
+class ModThumbnailState(Enum):
+    Missing = 1  # Workshop mod without a downloaded thumbnail.
+    Queued = 2  # Waiting in the icon queue.
+    Loaded = 3
+    Failed = 4
 
-        self.thumbnailWidget = QWidget()
-        self.thumbnailWidget.setFixedSize(72, 72)
-        self.thumbnailLayout = QGridLayout()
-        self.thumbnailLayout.setContentsMargins(0, 0, 0, 0)
 
-        self.thumbnailBorder = QLabel()
-        self.thumbnailBorder.setPixmap(QPixmap("./resources/mod_icon_frame.png"))
-        self.thumbnailBorder.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+# Data role the mod list model hands out the ModRecord of a row with.
+MOD_RECORD_ROLE = Qt.ItemDataRole.UserRole + 1
 
-        self.thumbnail = QPushButton()
-        self.thumbnail.setFixedSize(64, 64)
-        self.thumbnail.setContentsMargins(2, 2, 2, 2)
-        self.thumbnail.setEnabled(True)
-        self.thumbnail.setFixedSize(64, 64)
+MOD_ROW_HEIGHT = 90
 
-        if not self.loaded:
-            # Failed to load mod, tell the user and don't put any mod data.
-            self.thumbnail.setIcon(QPixmap("resources/load_fail.png"))
-            self.thumbnail.blockSignals(True) # Just disabling it normally makes it grey for some reason.
-            self.thumbnail.setIconSize(QSize(64, 64))
-
-            self.thumbnail.setStyleSheet("""
-                background-color: rgba(255, 255, 255, 0);
-            """)
-            self.thumbnailLayout.addWidget(self.thumbnail, 0, 0, Qt.AlignmentFlag.AlignCenter)
-
-            folderName = os.path.basename(self.folderPath)
-            self.label = QLabel(
-                f"<font size=5>Failed to read mod data!</font><br><font size=3><i>{folderName}</i></font>"
-            )
-            self.label.setStyleSheet('color: "#2f2322"')
+# Default number of days before a downloaded thumbnail is checked for changes.
+THUMBNAIL_REFRESH_DAYS = 7
 
-            self.setFlags(self.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-        else:
-            modIcon = QPixmap()
-            modIcon.size().setWidth(64)
-            modIcon.size().setHeight(64)
-
-            self.workshopThumbLoaded = False
-            isAutomaticallyQuerying = False
-
-            if self.workshopId is not None:
-                workshopThumb = f"cache/thumb-{self.workshopId}.png"
-
-                if os.path.exists(workshopThumb):
-                    modIcon.load(workshopThumb)
-                    self.workshopThumbLoaded = True
-                elif settings.value("AutomaticThumbnailDownload") == "1":
-                    isAutomaticallyQuerying = True
-                    iconQueue.append(self.workshopId)
-            else:
-                modIcon.load("resources/no_icon.png")
-
-            self.thumbnail.setIcon(modIcon)
-            self.thumbnail.setIconSize(QSize(64, 64))
-            self.thumbnailLayout.addWidget(self.thumbnail, 0, 0, Qt.AlignmentFlag.AlignCenter)
-
-            self.thumbnail.setStyleSheet("""
-                background-color: rgba(255, 255, 255, 0);
-            """)
-
-            self.thumbnail.setEnabled(not isAutomaticallyQuerying)
-
-            if self.workshopId is not None:
-                self.thumbnail.setMouseTracking(True)
-                self.thumbnail.clicked.connect(self.thumbnailClick)
-
-                self.thumbnailLabel = QLabel(self.thumbnail)
-                if self.workshopThumbLoaded:
-                    self.thumbnailLabel.setText("Click to delete thumbnail")
-                else:
-                    self.thumbnailLabel.setText("Click to download thumbnail")
-
-                self.thumbnailLabel.setWordWrap(True)
-                self.thumbnailLabel.setVisible(not isAutomaticallyQuerying)
-                self.thumbnailLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.thumbnailLabel.setObjectName("thumbnailLabel")
-                self.thumbnailLabel.setTextFormat(Qt.TextFormat.RichText)
-                self.thumbnailLabel.setStyleSheet(
-                    """
-                    QLabel#thumbnailLabel {
-                        color: transparent;
-                        background-color: rgba(0, 0, 0, 0);
-                    }
-
-                    QLabel#thumbnailLabel:hover {
-                        color: white;
-                        background-color: rgba(0, 0, 0, 0.5);
-                    }
-                    """
-                )
+# Most mod thumbnails kept decoded at once.
+MOD_THUMBNAIL_CACHE_SIZE = 256
 
-                self.thumbnailLabel.setFixedSize(64, 64)
+# Rows past the edge of the list that get their thumbnails decoded ahead of scrolling to them.
+MOD_THUMBNAIL_PREFETCH_ROWS = 8
 
-            # Truncate text if too long.
-            name = self.name
-            truncate_length = 27
-            if len(name) > truncate_length:
-                name = name[0 : (truncate_length - 3)] + "..."
+MOD_NAME_TRUNCATE_LENGTH = 27
 
-            # Add checkbox
-            self.checkbox = QPushButton()
 
-            if self.enabled:
-                self.checkbox.setObjectName("modItemEnabled")
-            else:
-                self.checkbox.setObjectName("modItemDisabled")
+# Holds every mod in the order they're shown. Rows are painted by ModItemDelegate,
+# so there are no widgets per mod, only the ModRecord.
+class ModListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
 
-            self.refreshCheckboxStylesheet()
-            self.checkbox.clicked.connect(self.toggleMod)
+        self.mods = []
+        self.rows = {}  # Row of every mod by folder path.
+        self.sortingMode = ModSortingMode.NameAscending
 
-            # Set text.
-            self.label = QLabel(
-                f"<font size=5>{name}</font><br><font size=3><i>{self.directory}</i></font>"
-            )
-            self.label.setStyleSheet('color: "#2f2322"')
+        # Thumbnail state and the image to show for it, by workshop id.
+        # Loaded thumbnails are in the atlas instead, and are read from it when a row using them
+        # is about to be painted, see ModList.getThumbnailPixmap.
+        self.thumbnails = {}
+        self.thumbnailAtlas = ThumbnailAtlas()
+        self.thumbnailAtlas.migrate("cache/")
+        self.thumbnailIndex = ThumbnailIndex()
 
-        self.thumbnailLayout.addWidget(self.thumbnailBorder, 0, 0, Qt.AlignmentFlag.AlignCenter)
+        # Seconds before a downloaded thumbnail is checked for changes, None to never check.
+        refreshDays = str(settings.value("ThumbnailRefreshDays"))
+        refreshDays = int(refreshDays) if refreshDays.isdigit() else THUMBNAIL_REFRESH_DAYS
+        self.thumbnailRefreshAge = refreshDays * 24 * 60 * 60 if refreshDays > 0 else None
+        self.thumbnailCache = ThumbnailCache(MOD_THUMBNAIL_CACHE_SIZE)
+        self.thumbnailGenerations = {}  # See getThumbnailGeneration.
 
-        self.layout = QHBoxLayout()
-        self.layout.setContentsMargins(3, 0, 3, 0)
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
 
-        self.thumbnailWidget.setLayout(self.thumbnailLayout)
-        self.layout.addWidget(self.thumbnailWidget, alignment=Qt.AlignmentFlag.AlignLeft)
-        self.layout.addWidget(self.label, alignment=Qt.AlignmentFlag.AlignLeft)
+        return len(self.mods)
 
-        self.layout.addStretch()
-        if hasattr(self, "checkbox"):
-            self.checkbox.setFixedSize(64, 64)
-            self.layout.addWidget(self.checkbox, alignment=Qt.AlignmentFlag.AlignRight)
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
 
-        # Set item size.
-        self.widget.setLayout(self.layout)
-        self.setSizeHint(QSize(200, 90))
+        mod = self.mods[index.row()]
+        if role == MOD_RECORD_ROLE:
+            return mod
+        elif role == Qt.ItemDataRole.DisplayRole:
+            return mod.name if mod.loaded else os.path.basename(mod.folderPath)
+        elif role == Qt.ItemDataRole.SizeHintRole:
+            return QSize(200, MOD_ROW_HEIGHT)
 
-    # Define sorting behavior for `self.sortItems()`.
-    def __lt__(self, other):
-        if not self.loaded:
-            return False
+        return None
 
-        if not other.loaded:
-            return True
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
 
-        if self.sortingMode == ModSortingMode.NameAscending:
-            return self.name < other.name
-        elif self.sortingMode == ModSortingMode.NameDescending:
-            return self.name > other.name
-        elif self.sortingMode == ModSortingMode.Enabled:
-            if self.enabled != other.enabled:
-                return self.enabled and not other.enabled
+        # Mods that failed to load can't be selected.
+        if not self.mods[index.row()].loaded:
+            return Qt.ItemFlag.ItemIsEnabled
 
-            return self.name < other.name
-        elif self.sortingMode == ModSortingMode.Disabled:
-            if self.enabled != other.enabled:
-                return not self.enabled and other.enabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def getMod(self, folderPath):
+        row = self.rows.get(folderPath)
+        if row is None:
+            return None
 
-            return self.name < other.name
+        return self.mods[row]
 
-    def thumbnailClick(self):
-        if self.workshopId is None or self.workshopId == "0":
+    def getIndex(self, mod):
+        row = self.rows.get(mod.folderPath)
+        if row is None:
+            return QModelIndex()
+
+        return self.index(row)
+
+    def updateRows(self):
+        self.rows = {mod.folderPath: row for row, mod in enumerate(self.mods)}
+
+    def addMods(self, mods):
+        if len(mods) == 0:
             return
 
-        if self.workshopThumbLoaded:
-            workshopThumb = f"cache/thumb-{self.workshopId}.png"
-            if os.path.exists(workshopThumb):
-                os.remove(workshopThumb)
+        first = len(self.mods)
+        self.beginInsertRows(QModelIndex(), first, first + len(mods) - 1)
+        self.mods.extend(mods)
+        for row, mod in enumerate(mods, first):
+            self.rows[mod.folderPath] = row
+        self.endInsertRows()
 
-            modIcon = QPixmap()
-            modIcon.size().setWidth(64)
-            modIcon.size().setHeight(64)
-            modIcon.load("resources/no_icon.png")
-            self.thumbnail.setIcon(modIcon)
+        for mod in mods:
+            self.setupThumbnail(mod)
 
-            self.thumbnailLabel.setText("Click to download thumbnail")
-            self.workshopThumbLoaded = False
-        else:
-            iconQueue.append(self.workshopId)
-
-    # Required after changing object name.
-    def refreshCheckboxStylesheet(self):
-        self.checkbox.setStyleSheet(
-            """
-            QPushButton#modItemEnabled{
-                background-color: rgba(255, 255, 255, 0);
-                border-image: url(resources/box_tick_on.png);
-            }
+    def removeMods(self, folderPaths):
+        rows = sorted((self.rows[folderPath] for folderPath in folderPaths if folderPath in self.rows), reverse=True)
+        if len(rows) == 0:
+            return
 
-            QPushButton#modItemEnabled:hover{
-                background-color: rgba(255, 255, 255, 0);
-                border-image: url(resources/box_tick_on_hover.png);
-            }
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.mods[row]
+            self.endRemoveRows()
 
-            QPushButton#modItemDisabled{
-                background-color: rgba(255, 255, 255, 0);
-                border-image: url(resources/box_tick_off.png);
-            }
+        self.updateRows()
 
-            QPushButton#modItemDisabled:hover{
-                background-color: rgba(255, 255, 255, 0);
-                border-image: url(resources/box_tick_off_hover.png);
-            }
-            """
-        )
+    # Repaints the mod's row after its data changed.
+    def modChanged(self, mod):
+        index = self.getIndex(mod)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
 
-    def disableMod(self):
-        path = os.path.join(self.folderPath, "disable.it")
+    def allChanged(self):
+        if len(self.mods) > 0:
+            self.dataChanged.emit(self.index(0), self.index(len(self.mods) - 1))
 
-        # Create disable.it at path.
-        with open(path, "w") as fp:
-            pass
+    def sort(self, column=0, order=Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
 
-        self.checkbox.setObjectName("modItemDisabled")
-        self.enabled = False
+        # Keeps the selection and hidden rows on the same mods.
+        oldIndexes = self.persistentIndexList()
+        oldMods = [self.mods[index.row()] for index in oldIndexes]
 
-    def enableMod(self):
-        path = os.path.join(self.folderPath, "disable.it")
+        loaded = [mod for mod in self.mods if mod.loaded]
+        failed = [mod for mod in self.mods if not mod.loaded]
 
-        # Remove disable.it (if it exists)
-        if os.path.exists(path):
-            os.remove(path)
+        # Mods that failed to load always go last.
+        loaded.sort(key=self.getSortKey(), reverse=self.sortingMode == ModSortingMode.NameDescending)
 
-        self.checkbox.setObjectName("modItemEnabled")
-        self.enabled = True
+        self.mods = loaded + failed
+        self.updateRows()
 
+        self.changePersistentIndexList(oldIndexes, [self.getIndex(mod) for mod in oldMods])
+        self.layoutChanged.emit()
 
-    # Toggle the mod on or off.
-    def toggleMod(self):
-        if not self.loaded:
+    # Key for one sort of the whole list, ties go by name.
+    # Names are case-folded once by ModRecord, the keys only pick out what's already there.
+    def getSortKey(self):
+        if self.sortingMode == ModSortingMode.Enabled:
+            return lambda mod: (not mod.enabled, mod.sortName)
+        elif self.sortingMode == ModSortingMode.Disabled:
+            return lambda mod: (mod.enabled, mod.sortName)
+        elif self.sortingMode == ModSortingMode.WorkshopId:
+            return lambda mod: (mod.sortWorkshopId is None, mod.sortWorkshopId or 0, mod.sortName)
+        elif self.sortingMode == ModSortingMode.LastModified:
+            return lambda mod: (-mod.getModifiedTime(), mod.sortName)
+        elif self.sortingMode == ModSortingMode.PackCount:
+            packIndex = mainWindow.packList.packIndex
+            return lambda mod: (-packIndex.getPackCount(mod.directory), mod.sortName)
+
+        return operator.attrgetter("sortName")
+
+    def setupThumbnail(self, mod):
+        if not mod.loaded or mod.workshopId is None or mod.workshopId in self.thumbnails:
             return
 
-        if self.enabled:
-            self.disableMod()
-        elif not self.enabled:
-            self.enableMod()
-
-        self.refreshCheckboxStylesheet()
-
-    def loadFromFile(folderPath):
-        loadedData = {
-            "FolderPath": None,
-            "Directory": None,
-            "WorkshopId": None,
-            "Name": None,
-            "Description": None,
-            "Version": None,
-            "Enabled": None,
-            "Loaded": False
+        if self.thumbnailAtlas.contains(mod.workshopId):
+            self.thumbnails[mod.workshopId] = (ModThumbnailState.Loaded, None)
+
+            # Checked for changes in the background once it's old enough.
+            if (
+                settings.value("AutomaticThumbnailDownload") == "1"
+                and self.thumbnailRefreshAge is not None
+                and not self.thumbnailIndex.isFailing(mod.workshopId)
+                and self.thumbnailIndex.isStale(mod.workshopId, self.thumbnailRefreshAge)
+            ):
+                revalidateQueue.append(mod.workshopId)
+        elif self.thumbnailIndex.isFailing(mod.workshopId):
+            # Didn't have a thumbnail the last time, clicking it still tries again.
+            self.thumbnails[mod.workshopId] = (ModThumbnailState.Failed, "resources/no_icon.png")
+        elif settings.value("AutomaticThumbnailDownload") == "1":
+            self.thumbnails[mod.workshopId] = (ModThumbnailState.Queued, None)
+            iconQueue.append(mod.workshopId)
+        else:
+            self.thumbnails[mod.workshopId] = (ModThumbnailState.Missing, None)
+
+    # Returns the thumbnail state of the mod and the image to show for it.
+    def getThumbnail(self, mod):
+        if not mod.loaded:
+            return (None, "resources/load_fail.png")
+
+        if mod.workshopId is None:
+            return (None, "resources/no_icon.png")
+
+        return self.thumbnails.get(mod.workshopId, (ModThumbnailState.Missing, None))
+
+    # Goes up every time the thumbnail of `workshopId` changes, so thumbnails loaded before then can be told apart.
+    def getThumbnailGeneration(self, workshopId):
+        return self.thumbnailGenerations.get(workshopId, 0)
+
+    def setThumbnail(self, workshopId, state, iconPath):
+        self.thumbnails[workshopId] = (state, iconPath)
+
+        # The thumbnail may have been replaced since it was last loaded.
+        self.thumbnailCache.invalidate(workshopId)
+        self.thumbnailGenerations[workshopId] = self.getThumbnailGeneration(workshopId) + 1
+
+        for row, mod in enumerate(self.mods):
+            if mod.workshopId == workshopId:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+
+# Paints the rows of the mod list: thumbnail and frame, name and folder, and the checkbox.
+# Only rows on screen are ever painted, so the size of the mods folder doesn't matter.
+class ModItemDelegate(PaperItemDelegate):
+    def __init__(self, modList):
+        super().__init__(modList.backgroundColor, modList)
+
+        self.modList = modList
+
+        self.frame = getPixmap("./resources/mod_icon_frame.png")
+        self.checkboxes = {
+            (True, False): getPixmap("resources/box_tick_on.png"),
+            (True, True): getPixmap("resources/box_tick_on_hover.png"),
+            (False, False): getPixmap("resources/box_tick_off.png"),
+            (False, True): getPixmap("resources/box_tick_off_hover.png"),
         }
 
-        metadataPath = os.path.join(folderPath, "metadata.xml")
-        if not metadataPath:
-            # Not a mod.
-            print(f"No metadata.xml found for folder of path {folderPath}")
-            return loadedData
+        self.textColor = QColor("#2f2322")
 
-        loadedData["FolderPath"] = folderPath
+        # Row and part of it ("thumbnail" or "checkbox") under the mouse.
+        self.hoveredRow = None
+        self.hoveredPart = None
 
-        # Open metadata.xml.
-        try:
-            tree = ET.parse(metadataPath)
-        except:
-            print(f"Could not parse mod at path {folderPath}")
-            return loadedData
-
-        root = tree.getroot()
-
-        # Get folder name (directory tag).
-        # This is what keeps track of what mod this is.
-        directory = root.find("directory")
-        if directory == None:
-            # Not a valid mod.
-            print(f"No directory found for mod of path {folderPath}")
-            return loadedData
-
-        loadedData["Directory"] = directory.text
-
-        # Check if mod is a workshop mod (id tag).
-        workshopId = root.find("id")
-        if workshopId != None:
-            loadedData["WorkshopId"] = workshopId.text
-
-        # Get mod name.
-        name = root.find("name")
-        if name == None:
-            # Not a valid mod.
-            print(f"No name found for mod of path {folderPath}")
-            return loadedData
-
-        loadedData["Name"] = name.text
-
-        # Get mod version.
-        version = root.find("version")
-        if version == None:
-            # Not a valid mod.
-            print(f"No version found for mod of path {folderPath}")
-            return loadedData
-
-        loadedData["Version"] = version.text
-
-        # Get mod description.
-        description = root.find("description")
-        if description == None or description.text == None or description.text == "":
-            loadedData["Description"] = "[No description]"
+        # Part the mouse was pressed on, a click only counts if it's released on the same one.
+        self.pressedRow = None
+        self.pressedPart = None
+
+    def sizeHint(self, option, index):
+        return QSize(200, MOD_ROW_HEIGHT)
+
+    def getThumbnailRect(self, rect):
+        return QRect(rect.x() + 3, rect.y() + (rect.height() - 72) // 2, 72, 72)
+
+    def getCheckboxRect(self, rect):
+        return QRect(rect.right() - 3 - 63, rect.y() + (rect.height() - 64) // 2, 64, 64)
+
+    def getPart(self, rect, mod, pos):
+        if not mod.loaded:
+            return None
+
+        if self.getCheckboxRect(rect).contains(pos):
+            return "checkbox"
+
+        if mod.workshopId is not None and self.getThumbnailRect(rect).adjusted(4, 4, -4, -4).contains(pos):
+            return "thumbnail"
+
+        return None
+
+    def paint(self, painter, option, index):
+        mod = index.data(MOD_RECORD_ROLE)
+        model = index.model()
+
+        self.paintBackground(painter, option)
+
+        painter.save()
+
+        rect = option.rect
+        row = index.row()
+
+        thumbnailRect = self.getThumbnailRect(rect)
+        iconRect = thumbnailRect.adjusted(4, 4, -4, -4)
+
+        state, iconPath = model.getThumbnail(mod)
+        if state == ModThumbnailState.Loaded:
+            # Nothing to draw until it's decoded, the row is painted again once it is.
+            pixmap = self.modList.getThumbnailPixmap(mod.workshopId)
+        elif iconPath is not None:
+            pixmap = getPixmap(iconPath)
         else:
-            loadedData["Description"] = description.text
+            pixmap = None
 
-        # Check if enabled by looking for disable.it
-        disableItPath = os.path.join(folderPath, "disable.it")
-        loadedData["Enabled"] = not os.path.exists(disableItPath)
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(iconRect, pixmap)
 
-        loadedData["Loaded"] = True
+        # Hovering a workshop thumbnail tells what clicking it does.
+        if self.hoveredRow == row and self.hoveredPart == "thumbnail" and state is not None and state != ModThumbnailState.Queued:
+            if state == ModThumbnailState.Loaded:
+                text = "Click to delete thumbnail"
+            elif state == ModThumbnailState.Failed:
+                text = "Couldn't download, click to retry"
+            else:
+                text = "Click to download thumbnail"
+
+            painter.fillRect(iconRect, QColor(0, 0, 0, 128))
+            painter.setPen(Qt.GlobalColor.white)
+            painter.setFont(option.font)
+            painter.drawText(iconRect, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, text)
 
-        return loadedData
+        painter.drawPixmap(
+            thumbnailRect.x() + (thumbnailRect.width() - self.frame.width()) // 2,
+            thumbnailRect.y() + (thumbnailRect.height() - self.frame.height()) // 2,
+            self.frame,
+        )
 
+        if mod.loaded:
+            name = mod.name or ""
+            if len(name) > MOD_NAME_TRUNCATE_LENGTH:
+                name = name[0 : (MOD_NAME_TRUNCATE_LENGTH - 3)] + "..."
+
+            detail = mod.directory or ""
+        else:
+            name = "Failed to read mod data!"
+            detail = os.path.basename(mod.folderPath)
+
+        # Same sizes as <font size=5> and <font size=3><i> in a label.
+        nameFont = QFont(option.font)
+        nameFont.setPointSizeF(option.font.pointSizeF() * 1.5)
+        detailFont = QFont(option.font)
+        detailFont.setItalic(True)
+
+        nameMetrics = QFontMetrics(nameFont)
+        detailMetrics = QFontMetrics(detailFont)
+
+        textLeft = thumbnailRect.right() + 1 + 6
+        textTop = rect.y() + (rect.height() - nameMetrics.height() - detailMetrics.height()) // 2
+
+        painter.setPen(self.textColor)
+        painter.setFont(nameFont)
+        painter.drawText(textLeft, textTop + nameMetrics.ascent(), name)
+        painter.setFont(detailFont)
+        painter.drawText(textLeft, textTop + nameMetrics.height() + detailMetrics.ascent(), detail)
+
+        if mod.loaded:
+            hovered = self.hoveredRow == row and self.hoveredPart == "checkbox"
+            painter.drawPixmap(self.getCheckboxRect(rect), self.checkboxes[(bool(mod.enabled), hovered)])
+
+        painter.restore()
+
+    # Called by the list as the mouse moves over it.
+    def setHovered(self, index, pos):
+        row = None
+        part = None
+        if index.isValid():
+            row = index.row()
+            part = self.getPart(self.modList.visualRect(index), index.data(MOD_RECORD_ROLE), pos)
+
+        if row == self.hoveredRow and part == self.hoveredPart:
+            return
+
+        # Only the rows that changed need painting again.
+        previousRow = self.hoveredRow
+        self.hoveredRow = row
+        self.hoveredPart = part
+
+        for changedRow in (previousRow, row):
+            if changedRow is not None:
+                self.modList.viewport().update(self.modList.visualRect(self.modList.model().index(changedRow, 0)))
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease, QEvent.Type.MouseButtonDblClick):
+            return False
+
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+
+        mod = index.data(MOD_RECORD_ROLE)
+        part = self.getPart(option.rect, mod, event.position().toPoint())
+
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self.pressedRow = index.row() if part is not None else None
+            self.pressedPart = part
+            return part is not None
+
+        if event.type() == QEvent.Type.MouseButtonDblClick:
+            return part is not None
+
+        pressedRow = self.pressedRow
+        pressedPart = self.pressedPart
+        self.pressedRow = None
+        self.pressedPart = None
+
+        if part is None or part != pressedPart or index.row() != pressedRow:
+            return part is not None
+
+        if part == "checkbox":
+            self.modList.toggleMod(mod)
+        elif part == "thumbnail":
+            self.modList.thumbnailClick(mod)
+
+        return True
+
+
+class ModList(PaperListView):
+    scanRequested = Signal(int, list, dict)
+    thumbnailsRequested = Signal()
+    modSelected = Signal(object)
+    # A batch of scanned mods was added or updated, so they have to go through the filter too.
+    modsAdded = Signal()
 
-class ModList(PaperListWidget):
     def __init__(self):
         super().__init__("#e1d0ba")
 
@@ -592,59 +878,429 @@ class ModList(PaperListWidget):
         self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Expanding)
         self.setMinimumWidth(400)
 
+        # Every row is the same height, so the view never has to ask each row for its size.
+        self.setUniformItemSizes(True)
+
         self.scrollbar = PaperScrollbar(PaperScrollbarType.DockedList, self)
         self.setVerticalScrollBar(self.scrollbar)
 
         self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
 
+        self.modModel = ModListModel(self)
+        self.setModel(self.modModel)
+        self.modDelegate = ModItemDelegate(self)
+        self.setItemDelegate(self.modDelegate)
+
+        self.selectionModel().currentChanged.connect(self.currentModChanged)
+
         self.iconThread = QThread()
         self.modThread = QThread()
+        self.thumbnailThread = QThread()
 
-        self.modIconWorker = IconQueueWorker()
+        downloadWorkers = str(settings.value("ThumbnailDownloadWorkers"))
+        downloadWorkers = int(downloadWorkers) if downloadWorkers.isdigit() else 0
+        requestsPerSecond = str(settings.value("ThumbnailRequestsPerSecond"))
+        requestsPerSecond = int(requestsPerSecond) if requestsPerSecond.isdigit() else THUMBNAIL_REQUESTS_PER_SECOND
+
+        self.modIconWorker = IconQueueWorker(
+            self.modModel.thumbnailAtlas, self.modModel.thumbnailIndex, downloadWorkers, requestsPerSecond
+        )
         self.modIconWorker.moveToThread(self.iconThread)
         self.modIconWorker.iconFetched.connect(self.modIconFetched)
 
+        self.thumbnailLoader = ThumbnailLoader(self.modModel.thumbnailAtlas)
+        self.thumbnailLoader.moveToThread(self.thumbnailThread)
+        self.thumbnailLoader.thumbnailDecoded.connect(self.thumbnailDecoded)
+        self.thumbnailsRequested.connect(self.thumbnailLoader.process)
+
         # Run this in a separate thread to make loading the app quicker.
-        self.modLoaderWorker = ModLoader()
+        workerCount = str(settings.value("ScanWorkers"))
+        workerCount = int(workerCount) if workerCount.isdigit() else 0
+        useProcesses = settings.value("ScanWithProcesses") == "1"
+
+        # Picks up changes to the mods folder as they happen.
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.watchedPathChanged)
+        self.watcher.fileChanged.connect(self.watchedPathChanged)
+        self.watchedModsPath = None
+        self.modsFolderChanged = False
+        self.changedFolders = set()
+
+        # Steam tends to touch a lot of files at once, so wait for it to settle before scanning.
+        self.watchTimer = QTimer(self)
+        self.watchTimer.setSingleShot(True)
+        self.watchTimer.setInterval(MOD_WATCH_DELAY)
+        self.watchTimer.timeout.connect(self.applyWatchedChanges)
+
+        # New mods are added to it as they're scanned, it's only built again
+        # from scratch after mods changed or were removed.
+        self.searchIndex = ModSearchIndex()
+        self.searchIndexStale = False
+
+        # Folder paths of the mods the filter hides.
+        self.hiddenMods = set()
+
+        self.scanId = 0
+        self.modLoaderWorker = ModLoader(workerCount, useProcesses)
         self.modLoaderWorker.moveToThread(self.modThread)
-        self.modLoaderWorker.modLoaded.connect(self.modLoaded)
+        self.modLoaderWorker.modsLoaded.connect(self.modsLoaded)
+        self.scanRequested.connect(self.modLoaderWorker.load)
 
         self.loadMods()
 
+    # Compares the mods folder against what's already in the list.
+    # Only new and changed folders get scanned, and only removed folders get taken out of the list.
     def loadMods(self):
-        self.clear()
         modsPath = getModsFolderPath()
         if modsPath is None or not os.path.isdir(modsPath):
             # Something went very wrong.
+            self.removeMods(list(self.modModel.rows.keys()))
+            self.watchModsFolder(None)
             return
 
-        modsList = os.listdir(modsPath)
-        for modFolder in modsList:
-            folderPath = os.path.join(modsPath, modFolder)
+        self.watchModsFolder(modsPath)
+
+        folderPaths = listModFolders(modsPath)
+        currentPaths = set(folderPaths)
+        self.removeMods([folderPath for folderPath in self.modModel.rows if folderPath not in currentPaths])
+
+        # Folders whose signature still matches are skipped by the scanner.
+        knownSignatures = {}
+        for mod in self.modModel.mods:
+            if mod.signature is not None:
+                knownSignatures[mod.folderPath] = mod.signature
+
+        # Any scan that's still running is now outdated.
+        self.scanId += 1
+        self.modLoaderWorker.latestScan = self.scanId
+        self.scanRequested.emit(self.scanId, folderPaths, knownSignatures)
+
+    # Rescans only the given folders, removing the ones that no longer exist.
+    def updateMods(self, folderPaths):
+        removedPaths = []
+        scanPaths = []
+        for folderPath in folderPaths:
             if os.path.isdir(folderPath):
-                modQueue.append(folderPath)
+                scanPaths.append(folderPath)
+            elif folderPath in self.modModel.rows:
+                removedPaths.append(folderPath)
+
+        self.removeMods(removedPaths)
 
-    def modLoaded(self, loadedData):
-        modItem = ModItem(loadedData)
-        self.addItem(modItem)
-        self.setItemWidget(modItem, modItem.widget)
+        if len(scanPaths) == 0:
+            return
 
-        self.sortItems()
+        knownSignatures = {}
+        for folderPath in scanPaths:
+            mod = self.modModel.getMod(folderPath)
+            if mod is not None and mod.signature is not None:
+                knownSignatures[folderPath] = mod.signature
 
-    def modIconFetched(self, workshopId, filePath, failedToLoad):
-        for x in range(self.count()):
-            item = self.item(x)
-            if item.workshopId is not None and item.workshopId == workshopId:
-                modIcon = QPixmap(filePath)
-                item.thumbnail.setIcon(modIcon)
-                item.thumbnail.setEnabled(True)
-                item.thumbnailLabel.setVisible(True)
+        # Not a new scan, so it doesn't cancel one that's still running.
+        self.scanRequested.emit(self.scanId, scanPaths, knownSignatures)
 
-                if failedToLoad:
-                    item.thumbnailLabel.setText("Couldn't download, click to retry")
+    def removeMods(self, folderPaths):
+        if len(folderPaths) == 0:
+            return
+
+        self.modModel.removeMods(folderPaths)
+        self.searchIndexStale = True
+        self.hiddenMods.difference_update(folderPaths)
+
+        watchedPaths = []
+        for folderPath in folderPaths:
+            watchedPaths.append(folderPath)
+            watchedPaths.append(os.path.join(folderPath, "metadata.xml"))
+
+        self.unwatchPaths(watchedPaths)
+
+    def watchModsFolder(self, modsPath):
+        if modsPath == self.watchedModsPath:
+            return
+
+        if self.watchedModsPath is not None:
+            self.unwatchPaths([self.watchedModsPath])
+
+        self.watchedModsPath = modsPath
+        if modsPath is not None:
+            self.watcher.addPath(modsPath)
+
+    # Watches each folder for disable.it coming and going, and its metadata.xml for edits.
+    def watchFolders(self, loadedBatch):
+        paths = []
+        for loadedData in loadedBatch:
+            folderPath = loadedData["FolderPath"]
+            paths.append(folderPath)
+
+            # Signature is only None when there's no metadata.xml.
+            # Editors often replace the file instead of writing to it, so it gets watched again every time.
+            if loadedData.get("Signature") is not None:
+                metadataPath = os.path.join(folderPath, "metadata.xml")
+                self.watcher.removePath(metadataPath)
+                paths.append(metadataPath)
+
+        if len(paths) > 0:
+            self.watcher.addPaths(paths)
+
+    def unwatchPaths(self, paths):
+        watched = set(self.watcher.files())
+        watched.update(self.watcher.directories())
+
+        paths = [path for path in paths if path in watched]
+        if len(paths) > 0:
+            self.watcher.removePaths(paths)
+
+    def watchedPathChanged(self, path):
+        if path == self.watchedModsPath:
+            # A mod folder was added or removed.
+            self.modsFolderChanged = True
+        elif os.path.basename(path) == "metadata.xml":
+            self.changedFolders.add(os.path.dirname(path))
+        else:
+            self.changedFolders.add(path)
+
+        self.watchTimer.start()
+
+    def applyWatchedChanges(self):
+        folderPaths = self.changedFolders
+        self.changedFolders = set()
+
+        if self.modsFolderChanged:
+            self.modsFolderChanged = False
+
+            if self.watchedModsPath is None or not os.path.isdir(self.watchedModsPath):
+                # The whole mods folder went away.
+                self.loadMods()
+                return
+
+            # Only look at folders that came or went, everything else is already watched.
+            currentPaths = set(listModFolders(self.watchedModsPath))
+            knownPaths = set(self.modModel.rows.keys())
+            folderPaths.update(currentPaths - knownPaths)
+            folderPaths.update(knownPaths - currentPaths)
+
+        self.updateMods(folderPaths)
+
+    # Every mod in the list, in the order they're shown.
+    def getMods(self):
+        return list(self.modModel.mods)
+
+    def getCurrentMod(self):
+        return self.currentIndex().data(MOD_RECORD_ROLE)
+
+    def currentModChanged(self, current, previous):
+        self.modSelected.emit(current.data(MOD_RECORD_ROLE))
+
+    def setSortingMode(self, sortingMode):
+        self.modModel.sortingMode = sortingMode
+        self.modModel.sort()
+
+    # Shows only the mods with the given folder paths, or every mod if None.
+    # Only rows that go from shown to hidden or back are touched.
+    def showOnlyMods(self, folderPaths):
+        rows = self.modModel.rows
+        hiddenMods = set() if folderPaths is None else rows.keys() - folderPaths
+
+        for folderPath in hiddenMods ^ self.hiddenMods:
+            row = rows.get(folderPath)
+            if row is not None:
+                self.setRowHidden(row, folderPath in hiddenMods)
+
+        self.hiddenMods = hiddenMods
+
+    # Folder paths of the loaded mods with `query` in their name or folder name.
+    def searchMods(self, query):
+        if self.searchIndexStale:
+            self.searchIndex = ModSearchIndex.build(
+                (mod.folderPath, (mod.name, mod.directory)) for mod in self.modModel.mods if mod.loaded
+            )
+            self.searchIndexStale = False
+
+        return self.searchIndex.search(query)
+
+    # Enables or disables a mod and updates its row.
+    def setModEnabled(self, mod, enabled):
+        if not mod.loaded or mod.enabled == enabled:
+            return
+
+        mod.setEnabled(enabled)
+        self.modModel.modChanged(mod)
+
+    # Toggle the mod on or off.
+    def toggleMod(self, mod):
+        self.setModEnabled(mod, not mod.enabled)
+
+    def thumbnailClick(self, mod):
+        if mod.workshopId is None or mod.workshopId == "0":
+            return
+
+        state, iconPath = self.modModel.getThumbnail(mod)
+        if state == ModThumbnailState.Queued:
+            return
 
+        if state == ModThumbnailState.Loaded:
+            self.modModel.thumbnailAtlas.remove(mod.workshopId)
+
+            self.modModel.setThumbnail(mod.workshopId, ModThumbnailState.Missing, "resources/no_icon.png")
+        else:
+            iconQueue.append(mod.workshopId)
+            self.modModel.setThumbnail(mod.workshopId, ModThumbnailState.Queued, iconPath)
+
+    def mouseMoveEvent(self, event):
+        pos = event.position().toPoint()
+        self.modDelegate.setHovered(self.indexAt(pos), pos)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.modDelegate.setHovered(QModelIndex(), None)
+        super().leaveEvent(event)
+
+    def modsLoaded(self, scanId, batch):
+        if scanId != self.scanId:
+            return
+
+        selectedChanged = False
+        newMods = []
+        for loadedData in batch:
+            folderPath = loadedData["FolderPath"]
+            if selectedMod is not None and selectedMod.folderPath == folderPath:
+                selectedChanged = True
+
+            mod = self.modModel.getMod(folderPath)
+            if mod is None:
+                newMods.append(ModRecord(loadedData))
+            else:
+                # The mod itself is kept, so anything holding on to it stays up to date.
+                mod.update(loadedData)
+                self.modModel.setupThumbnail(mod)
+                self.modModel.modChanged(mod)
+                self.searchIndexStale = True
+
+        # Add the whole batch, then sort once.
+        self.modModel.addMods(newMods)
+        self.modModel.sort()
+
+        for mod in newMods:
+            if mod.loaded:
+                self.searchIndex.add(mod.folderPath, (mod.name, mod.directory))
+
+        self.modsAdded.emit()
+
+        self.watchFolders(batch)
+
+        # The selected mod's details may have changed.
+        if selectedChanged:
+            mainWindow.modViewer.refresh()
+
+    # Queues thumbnails for mods that don't have one yet, except ones that failed and are still backing off.
+    def queueMissingThumbnails(self):
+        for mod in self.modModel.mods:
+            if not mod.loaded or mod.workshopId is None:
+                continue
+
+            state, iconPath = self.modModel.getThumbnail(mod)
+            if state == ModThumbnailState.Failed and self.modModel.thumbnailIndex.isFailing(mod.workshopId):
+                continue
+
+            if state != ModThumbnailState.Loaded and mod.workshopId not in iconQueue:
+                iconQueue.append(mod.workshopId)
+                self.modModel.thumbnails[mod.workshopId] = (ModThumbnailState.Queued, iconPath)
+
+        self.modModel.allChanged()
+
+    # Returns the thumbnail of `workshopId`, or None after asking for it to be loaded.
+    def getThumbnailPixmap(self, workshopId):
+        pixmap = self.modModel.thumbnailCache.get(workshopId)
+        if pixmap is None:
+            self.requestThumbnails([workshopId])
+
+        return pixmap
+
+    def requestThumbnails(self, workshopIds):
+        thumbnails = [(workshopId, self.modModel.getThumbnailGeneration(workshopId)) for workshopId in workshopIds]
+        if self.thumbnailLoader.request(thumbnails):
+            self.thumbnailsRequested.emit()
+
+    def thumbnailDecoded(self, workshopId, generation, image):
+        # The thumbnail changed while it was loading, the row asks for the new one when it's painted.
+        if generation != self.modModel.getThumbnailGeneration(workshopId):
+            return
+
+        if image.isNull():
+            print(f"Could not load thumbnail for workshop id {workshopId}")
+
+        # Kept even if it failed to load, so it isn't tried again on every paint.
+        self.modModel.thumbnailCache.put(workshopId, QPixmap.fromImage(image))
+        self.updateThumbnailRows(workshopId)
+
+    # Repaints the rows on screen that show the thumbnail of `workshopId`.
+    def updateThumbnailRows(self, workshopId):
+        viewport = self.viewport()
+
+        # The top edge of the viewport can fall in the spacing between two rows.
+        first = 0
+        for y in (0, self.spacing() + 1, self.spacing() * 2 + 1):
+            index = self.indexAt(QPoint(viewport.width() // 2, y))
+            if index.isValid():
+                first = index.row()
+                break
+
+        for row in range(first, self.modModel.rowCount()):
+            if self.isRowHidden(row):
+                continue
+
+            rect = self.visualRect(self.modModel.index(row))
+            if rect.top() >= viewport.height():
                 break
 
+            if self.modModel.mods[row].workshopId == workshopId:
+                viewport.update(rect)
+
+    # Loads the thumbnails of the rows just past the edge the list is scrolling towards.
+    def prefetchThumbnails(self, scrollingDown):
+        rowCount = self.modModel.rowCount()
+        if rowCount == 0:
+            return
+
+        if scrollingDown:
+            edge = self.indexAt(QPoint(0, self.viewport().height() - 1))
+            row = edge.row() if edge.isValid() else rowCount - 1
+            step = 1
+        else:
+            edge = self.indexAt(QPoint(0, 0))
+            row = edge.row() if edge.isValid() else 0
+            step = -1
+
+        workshopIds = []
+        prefetched = 0
+        row += step
+        while 0 <= row < rowCount and prefetched < MOD_THUMBNAIL_PREFETCH_ROWS:
+            if not self.isRowHidden(row):
+                prefetched += 1
+                mod = self.modModel.mods[row]
+                state, iconPath = self.modModel.getThumbnail(mod)
+                if state == ModThumbnailState.Loaded and self.modModel.thumbnailCache.get(mod.workshopId) is None:
+                    workshopIds.append(mod.workshopId)
+
+            row += step
+
+        # Requests are loaded newest first, so the closest row goes last.
+        if len(workshopIds) > 0:
+            workshopIds.reverse()
+            self.requestThumbnails(workshopIds)
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+
+        if dy != 0:
+            self.prefetchThumbnails(dy < 0)
+
+    def modIconFetched(self, workshopId, filePath, failedToLoad):
+        if failedToLoad:
+            self.modModel.setThumbnail(workshopId, ModThumbnailState.Failed, filePath)
+        else:
+            self.modModel.setThumbnail(workshopId, ModThumbnailState.Loaded, None)
+
 
 class ModListToolbar(QWidget):
     def __init__(self):
@@ -652,6 +1308,12 @@ class ModListToolbar(QWidget):
 
         self.packFilter = ""
 
+        # Filters once typing pauses instead of on every key.
+        self.filterTimer = QTimer(self)
+        self.filterTimer.setSingleShot(True)
+        self.filterTimer.setInterval(MOD_FILTER_DELAY)
+        self.filterTimer.timeout.connect(self.filter)
+
         # Create a layout to house everything
         self.masterLayout = QVBoxLayout()
         self.masterLayout.setContentsMargins(0, 0, 0, 0)
@@ -661,8 +1323,8 @@ class ModListToolbar(QWidget):
         self.filterToolsLayout = QBoxLayout(QBoxLayout.Direction.LeftToRight)
         self.filterToolsLayout.setContentsMargins(0, 0, 0, 0)
 
-        self.filterButtonIconOff = QPixmap("resources/filter_off.png")
-        self.filterButtonIconOn = QPixmap("resources/filter_on.png")
+        self.filterButtonIconOff = getIcon("resources/filter_off.png")
+        self.filterButtonIconOn = getIcon("resources/filter_on.png")
         self.filterButton = PaperToolButton(PaperButtonType.Primary)
         self.filterButton.setIcon(self.filterButtonIconOff)
         self.filterButton.setIconSize(QSize(32, 32))
@@ -680,7 +1342,7 @@ class ModListToolbar(QWidget):
         self.filterBox = PaperLineEdit()
         self.filterToolsLayout.addWidget(self.filterBox, stretch=2)
         self.filterBox.setPlaceholderText("Search...")
-        self.filterBox.textChanged.connect(self.filter)
+        self.filterBox.textChanged.connect(self.filterTimer.start)
 
         self.masterLayout.addItem(self.filterToolsLayout)
         self.setLayout(self.masterLayout)
@@ -691,10 +1353,27 @@ class ModListToolbar(QWidget):
         self.categoryBox.setContentsMargins(0, 0, 0, 0)
 
         self.nameCategory = PaperPushButton(PaperButtonType.Primary)
-        self.nameCategory.setFixedSize(295, 35)
+        self.nameCategory.setFixedSize(200, 35)
         self.categoryBox.addWidget(self.nameCategory)
         self.nameCategory.clicked.connect(self.sortingModeName)
 
+        # Sorting modes that don't have their own button.
+        self.moreCategoryMenu = PaperMenu()
+        self.moreCategoryMenu.triggered.connect(self.sortingModeMore)
+        for text, sortingMode in (
+            ("Workshop ID", ModSortingMode.WorkshopId),
+            ("Last modified", ModSortingMode.LastModified),
+            ("Pack count", ModSortingMode.PackCount),
+        ):
+            action = PaperWidgetAction(self.moreCategoryMenu, text)
+            action.setData(sortingMode)
+            self.moreCategoryMenu.addAction(action)
+
+        self.moreCategory = PaperPushButton(PaperButtonType.Primary)
+        self.moreCategory.setFixedSize(90, 35)
+        self.moreCategory.setMenu(self.moreCategoryMenu)
+        self.categoryBox.addWidget(self.moreCategory)
+
         self.enabledCategory = PaperPushButton(PaperButtonType.Primary)
         self.enabledCategory.setFixedSize(85, 35)
         self.categoryBox.addWidget(self.enabledCategory)
@@ -709,24 +1388,26 @@ class ModListToolbar(QWidget):
     def setSortingMode(self, sortingMode):
         self.sortingMode = sortingMode
 
+        self.nameCategory.setText("Name")
+        self.moreCategory.setText("More")
+        self.enabledCategory.setText("Active")
+
         if self.sortingMode == ModSortingMode.NameAscending:
             self.nameCategory.setText("Name ▾")
-            self.enabledCategory.setText("Active")
         elif self.sortingMode == ModSortingMode.NameDescending:
             self.nameCategory.setText("Name ▴")
-            self.enabledCategory.setText("Active")
         elif self.sortingMode == ModSortingMode.Enabled:
-            self.nameCategory.setText("Name")
             self.enabledCategory.setText("Active ▾")
         elif self.sortingMode == ModSortingMode.Disabled:
-            self.nameCategory.setText("Name")
             self.enabledCategory.setText("Active ▴")
+        elif self.sortingMode == ModSortingMode.WorkshopId:
+            self.moreCategory.setText("ID ▾")
+        elif self.sortingMode == ModSortingMode.LastModified:
+            self.moreCategory.setText("Newest ▾")
+        elif self.sortingMode == ModSortingMode.PackCount:
+            self.moreCategory.setText("Packs ▾")
 
-        for x in range(mainWindow.modList.count()):
-            item = mainWindow.modList.item(x)
-            item.sortingMode = self.sortingMode
-
-        mainWindow.modList.sortItems()
+        mainWindow.modList.setSortingMode(self.sortingMode)
 
     def sortingModeName(self):
         if self.sortingMode != ModSortingMode.NameAscending:
@@ -734,6 +1415,9 @@ class ModListToolbar(QWidget):
         elif self.sortingMode == ModSortingMode.NameAscending:
             self.setSortingMode(ModSortingMode.NameDescending)
 
+    def sortingModeMore(self, action):
+        self.setSortingMode(action.data())
+
     def sortingModeState(self):
         if self.sortingMode != ModSortingMode.Enabled:
             self.setSortingMode(ModSortingMode.Enabled)
@@ -743,10 +1427,9 @@ class ModListToolbar(QWidget):
     def refreshPackChoices(self):
         self.filterMenu.clear()
 
-        count = mainWindow.packList.count()
-        if count > 0:
-            for x in range(count):
-                pack = mainWindow.packList.item(x)
+        packs = mainWindow.packList.getPacks()
+        if len(packs) > 0:
+            for pack in packs:
                 name = pack.name
                 if self.packFilter == pack.name:
                     name = "[✓] " + name
@@ -777,49 +1460,52 @@ class ModListToolbar(QWidget):
         else:
             self.filterButton.setIcon(self.filterButtonIconOff)
 
+    # Filters again soon, if there's anything to filter by.
+    def scheduleFilter(self):
+        if self.filterBox.displayText() != "" or self.packFilter != "":
+            self.filterTimer.start()
+
     def filter(self):
-        query = self.filterBox.displayText().lower()
-        for i in range(mainWindow.modList.count()):
-            item = mainWindow.modList.item(i)
-
-            # Hide mods that failed to load.
-            if (self.packFilter != "" or query != "") and not item.loaded:
-                item.setHidden(True)
-            elif query != "" or self.packFilter != "":
-                showsInSearchQuery = (
-                    query not in item.name.lower()
-                    and query not in item.directory.lower()
-                )
-                showsInPackFilter = False
+        self.filterTimer.stop()
 
-                if self.packFilter == "":
-                    showsInPackFilter = True
-                else:
-                    for x in range(mainWindow.packList.count()):
-                        pack = mainWindow.packList.item(x)
-                        if pack.name == self.packFilter and item.directory in pack.mods:
-                            showsInPackFilter = True
+        query = self.filterBox.displayText()
+        modList = mainWindow.modList
 
-                item.setHidden(showsInSearchQuery)
+        if query == "" and self.packFilter == "":
+            modList.showOnlyMods(None)
+            return
+
+        # Mods that failed to load aren't in the search index, so they're hidden too.
+        folderPaths = modList.searchMods(query)
 
-                if not showsInPackFilter:
-                    item.setHidden(True)
-            elif self.packFilter == "" and query == "":
-                item.setHidden(False)
+        if self.packFilter != "":
+            packDirectories = set()
+            for pack in mainWindow.packList.getPacks():
+                if pack.name == self.packFilter:
+                    packDirectories.update(pack.mods)
+
+            folderPaths = {
+                folderPath for folderPath in folderPaths
+                if modList.modModel.getMod(folderPath).directory in packDirectories
+            }
 
+        modList.showOnlyMods(folderPaths)
 
-class PackItem(QListWidgetItem):
+
+PACK_ROW_HEIGHT = 100
+PACK_EXPANDED_ROW_HEIGHT = 200
+
+# Data role the pack list model hands out the PackItem of a row with.
+PACK_ITEM_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+# A pack in the pack list. Rows are painted by PackItemDelegate, and the buttons
+# for the selected pack are a single PackControls shared by every pack.
+class PackItem(ModPack):
     def __init__(self, filePath=None):
-        super().__init__()
+        ModPack.__init__(self)
 
-        dateNow = date.now().strftime("%d/%m/%Y, %H:%M:%S")
-        self.name = "New Pack (" + dateNow + ")"
-        self.uuid = str(uuid.uuid4())
-        self.dateCreated = dateNow
-        self.dateModified = dateNow
-        self.mods = []
         self.loaded = False
-        self.filePath = None
         self.unsavedChanges = False
 
         if filePath is not None:
@@ -831,119 +1517,44 @@ class PackItem(QListWidgetItem):
         if not self.loaded:
             print(f"Could not load modpack of file path {filePath}")
 
-        self.widget = QWidget()
-        self.layout = QVBoxLayout()
-        self.layout.setSpacing(2)
-
-        # Create name and count labels.
-        self.title = PaperLineEdit()
-        self.title.setMinimumSize(QSize(self.title.minimumSize().width(), 40))
-        f = self.title.font()
-        f.setBold(True)
-        f.setPointSize(12)
-        self.title.setFont(f)
-        self.title.editingFinished.connect(self.rename)
-
-        self.modCount = QLabel()
-
-        self.setLabel()
-
-        self.layout.addWidget(self.title)
-        self.layout.addWidget(self.modCount)
-
-        # Changed to 3 row grid layout.
-        self.buttonGrid = QGridLayout()
-        self.buttonGrid.setContentsMargins(0, 0, 0, 0)
-    
-        # First row
-        self.apply = PaperPushButton(PaperButtonType.Confirm, "Apply")
-        self.buttonGrid.addWidget(self.apply, 0, 0, 1, 2)
-        self.apply.clicked.connect(self.applyPack)
-
-        self.export = PaperPushButton(PaperButtonType.Primary, "Export")
-        self.buttonGrid.addWidget(self.export, 0, 2, 1, 1)
-        self.export.clicked.connect(self.exportPack)
-
-        self.duplicate = PaperPushButton(PaperButtonType.Primary, "Copy")
-        self.buttonGrid.addWidget(self.duplicate, 0, 3, 1, 1)
-        self.duplicate.clicked.connect(self.duplicatePack)
-
-        # Second row
-        self.addActive = PaperPushButton(PaperButtonType.Confirm, "Add Active Mods")
-        self.buttonGrid.addWidget(self.addActive, 1, 0, 1, 2)
-        self.addActive.clicked.connect(self.addActiveMods)
-
-        self.removeActive = PaperPushButton(PaperButtonType.Danger, "Remove Active Mods")
-        self.buttonGrid.addWidget(self.removeActive, 1, 2, 1, 2)
-        self.removeActive.clicked.connect(self.removeActiveMods)
-
-        # Third row
-        self.save = PaperPushButton(PaperButtonType.Confirm, "Save")
-        self.buttonGrid.addWidget(self.save, 2, 0, 1, 2)
-        self.save.clicked.connect(self.savePack)
-
-        self.delete = PaperPushButton(PaperButtonType.Danger, "Delete")
-        self.buttonGrid.addWidget(self.delete, 2, 2, 1, 2)
-        self.delete.clicked.connect(self.remove)
-
-        self.layout.addLayout(self.buttonGrid)
-
-        # Set item sizes.
-        self.widget.setLayout(self.layout)
-        self.shrink()
-
     # Checks if not a duplicate pack, and renames pack if duplicate name.
-    def validate(self):
+    # `packs` are the packs to check against, the ones in the pack list if not given.
+    def validate(self, packs=None):
+        if packs is None:
+            packs = mainWindow.packList.getPacks()
+
         # Check if duplicate UUID.
-        for x in range(mainWindow.packList.count()):
-            item = mainWindow.packList.item(x)
+        for item in packs:
             if item.uuid == self.uuid:
                 print(f"Pack of path {self.filePath} is already loaded!")
                 QMessageBox.warning(
-                    self, "Error", f'Pack "{self.name}" is already loaded!'
+                    None, "Error", f'Pack "{self.name}" is already loaded!'
                 )
                 return False
 
         # Rename if duplicate
-        for x in range(mainWindow.packList.count()):
-            item = mainWindow.packList.item(x)
+        for item in packs:
             if item.name == self.name:
                 self.name = self.name + " (1)"
                 self.setLabel()
 
         return True
 
-    def expand(self):
-        self.setSizeHint(QSize(200, 200))
-        self.apply.setVisible(True)
-        self.export.setVisible(True)
-        self.duplicate.setVisible(True)
-        self.delete.setVisible(True)
-        self.save.setVisible(True)
-        self.addActive.setVisible(True)
-        self.removeActive.setVisible(True)
-        
-
-    def shrink(self):
-        self.setSizeHint(QSize(200, 100))
-        self.apply.setVisible(False)
-        self.export.setVisible(False)
-        self.duplicate.setVisible(False)
-        self.delete.setVisible(False)
-        self.save.setVisible(False)
-        self.addActive.setVisible(False)
-        self.removeActive.setVisible(False)
-
     def addMod(self, directory):
         if directory in self.mods:
             return
 
-        self.mods.append(directory)
+        ModPack.addMod(self, directory)
+        mainWindow.packList.packIndex.addMod(self, directory)
         self.unsavedChanges = True
         self.setLabel()
 
     def removeMod(self, directory):
-        self.mods.remove(directory)
+        if directory not in self.mods:
+            return
+
+        ModPack.removeMod(self, directory)
+        mainWindow.packList.packIndex.removeMod(self, directory)
         self.unsavedChanges = True
         self.setLabel()
 
@@ -951,11 +1562,7 @@ class PackItem(QListWidgetItem):
 
         # Just remove the entry from the list without prompting a dialog.
         if cleanEntry:
-            for x in range(mainWindow.packList.count() - 1, -1, -1):
-                item = mainWindow.packList.item(x)
-                if item.uuid == self.uuid:
-                    mainWindow.packList.takeItem(x)
-
+            mainWindow.packList.removePacks(self.uuid)
             return
 
         confirmation = QMessageBox()
@@ -968,162 +1575,64 @@ class PackItem(QListWidgetItem):
 
         ret = confirmation.exec()
         if ret == QMessageBox.StandardButton.Yes:
-            for x in range(mainWindow.packList.count() - 1, -1, -1):
-                item = mainWindow.packList.item(x)
-                if item.uuid == self.uuid:
-                    mainWindow.packList.takeItem(x)
+            mainWindow.packList.removePacks(self.uuid)
 
             if self.filePath is not None and os.path.exists(self.filePath):
                 os.remove(self.filePath)
 
             mainWindow.packList.updateModViewerPackList()
 
-    def rename(self):
+    # Returns False if the name was rejected.
+    def rename(self, name):
+        # The title shows a * for unsaved changes, that's not part of the name.
+        if self.unsavedChanges:
+            name = name.removesuffix(" *")
+
         # No change was made, don't bother the user.
-        if self.title.displayText() == self.name:
-            return
+        if name == self.name:
+            return True
 
-        for x in range(mainWindow.packList.count()):
-            pack = mainWindow.packList.item(x)
-            if pack.name == self.title.displayText():
+        for pack in mainWindow.packList.getPacks():
+            if pack.name == name:
                 # Name already exists, reject and tell user.
-                self.title.setText(self.name)
                 QMessageBox.warning(
-                    self.modCount, "Error", "This title already exists in another pack!"
+                    mainWindow.packList, "Error", "This title already exists in another pack!"
                 )
+                return False
 
-        self.name = self.title.displayText()
+        self.name = name
         self.unsavedChanges = True
+        self.setLabel()
         mainWindow.packList.updateModViewerPackList()
 
+        return True
+
+    # Shows the pack's name and mod count again after they changed.
     def setLabel(self):
-        # Added an indicator (*) for unsaved changes
+        mainWindow.packList.packChanged(self)
+
+    # Name as shown in the list, with an indicator (*) for unsaved changes.
+    def getTitle(self):
         if self.unsavedChanges:
-            self.title.setText(f"{self.name} *")
-        else:
-            self.title.setText(self.name)
-        self.modCount.setText(f"<font size=3><i>Mods: {len(self.mods)}</i></font>")
+            return f"{self.name} *"
 
-    def deserialize(self, filePath):
-        self.filePath = filePath
+        return self.name
 
+    def deserialize(self, filePath):
         try:
-            tree = ET.parse(filePath)
-        except:
-            print(f"Could not parse pack data at path {filePath}")
-            return False
-
-        root = tree.getroot()
-
-        # Get name of pack.
-        name = root.find("name")
-        if name == None:
-            print(f"No name found for pack of path {filePath}")
-            QMessageBox.warning(
-                self,
-                "Error",
-                f'Pack "{filePath}" could not be loaded (no name found)!',
-            )
-            return False
-
-        self.name = name.text
+            ModPack.deserialize(self, filePath)
+        except PackLoadError as e:
+            print(e)
+            if e.userMessage is not None:
+                QMessageBox.warning(None, "Error", e.userMessage)
 
-        uuid = root.find("uuid")
-        if uuid == None:
-            print(f"No UUID found for pack of path {filePath}")
-            QMessageBox.warning(
-                self,
-                "Error",
-                f'Pack "{filePath}" could not be loaded (no uuid found)!',
-            )
             return False
 
-        self.uuid = uuid.text
-
-        # Get date information.
-        dateNow = date.now().strftime("%d/%m/%Y, %H:%M:%S")
-        dateTag = root.find("date")
-        if dateTag == None:
-            self.dateCreated = dateNow
-            self.dateModified = dateNow
-        else:
-            self.dateCreated = dateTag.get("created")
-            self.dateModified = dateTag.get("modified")
-
-        # Get mods in pack.
-        self.mods = []
-        modTag = root.find("mods")
-        if modTag == None:
-            print(f"No mods found for pack of path {filePath}")
-            QMessageBox.warning(
-                self,
-                "Error",
-                f'Pack "{filePath}" could not be loaded (no empty or filled mod list found)!',
-            )
-            return False
-
-        mods = modTag.findall("mod")
-        for mod in mods:
-            self.mods.append(mod.text)
-
         return True
 
     def serialize(self, forcePath=None):
-        # Serialize as XML.
-        root = OtherET.Element("modpack")
-
-        # Name tag.
-        name = OtherET.SubElement(root, "name")
-        name.text = self.name
-
-        # UUID tag.
-        uuidTag = OtherET.SubElement(root, "uuid")
-        if forcePath:
-            # Exporting, generate a new tag so that it can be imported again in the same list and be fine.
-            uuidTag.text = str(uuid.uuid4())
-        else:
-            uuidTag.text = self.uuid
-
-        # Date tag.
-        dateNow = date.now().strftime("%d/%m/%Y, %H:%M:%S")
-        self.dateModified = dateNow
-        dateTag = OtherET.SubElement(
-            root,
-            "date",
-            attrib={
-                "created": self.dateCreated,
-                "modified": self.dateModified,
-            },
-        )
-
-        # Mod tags.
-        modTag = OtherET.SubElement(root, "mods")
-        for mod in self.mods:
-            tag = OtherET.SubElement(modTag, "mod")
-            tag.text = mod
-
-        # Write.
-        tree = OtherET.ElementTree(root)
-        OtherET.indent(tree, space="\t", level=0)
-
-        # Only set the filepath if it's being exported.
-        if forcePath:
-            tree.write(forcePath, encoding="utf-8")
-        else:
-            # Find file path.
-            if self.filePath is None:
-                # https://stackoverflow.com/a/7406369
-                keepCharacters = (" ", ".", "_")
-                filename = "".join(
-                    c for c in self.name if c.isalnum() or c in keepCharacters
-                ).rstrip()
-
-                self.filePath = "packs/" + filename + ".xml"
-
-            tree.write(self.filePath, encoding="utf-8")
-
-        self.unsavedChanges = False 
-        print(f"Successfully saved pack {self.name}")
+        ModPack.serialize(self, forcePath)
+        self.unsavedChanges = False
 
     def exportPack(self):
         dialog = QFileDialog()
@@ -1136,55 +1645,52 @@ class PackItem(QListWidgetItem):
 
     def makeCopiedName(self, name=None):
         nameToCheck = name if name is not None else self.name
-        for x in range(mainWindow.packList.count()):
-            item = mainWindow.packList.item(x)
+        for item in mainWindow.packList.getPacks():
             if item.name == nameToCheck:
                 nameToCheck += " (Copy)"
                 return self.makeCopiedName(nameToCheck)
 
         return nameToCheck
-    
+
     def savePack(self):
         # Save the pack.
         self.serialize()
         self.unsavedChanges = False
-        self.setLabel() 
-    
+        self.setLabel()
+
     def addActiveMods(self):
+        changed = False
+
         # Add mods to the pack if they aren't in it.
-        for i in range(mainWindow.modList.count()):
-            mod = mainWindow.modList.item(i)
+        for mod in mainWindow.modList.getMods():
             if mod.loaded and mod.enabled and (mod.directory not in self.mods):
                 self.addMod(mod.directory)
-                mainWindow.packList.updateModViewerPackList() # Repopulate
+                changed = True
 
-                self.unsavedChanges = True
-                self.setLabel()
+        if changed:
+            mainWindow.packList.updateModViewerPackList() # Repopulate
 
     def removeActiveMods(self):
+        changed = False
+
         # Remove mods from the pack if they are in it.
-        for i in range(mainWindow.modList.count()):
-            mod = mainWindow.modList.item(i)
+        for mod in mainWindow.modList.getMods():
             if mod.loaded and mod.enabled and (mod.directory in self.mods):
                 self.removeMod(mod.directory)
-                mainWindow.packList.updateModViewerPackList() # Repopulate
+                changed = True
+
+        if changed:
+            mainWindow.packList.updateModViewerPackList() # Repopulate
 
-                self.unsavedChanges = True
-                self.setLabel()
-            
     def duplicatePack(self):
         # Create new pack.
         newPack = PackItem()
         newPack.unsavedChanges = True
 
         newPack.name = self.makeCopiedName()
-        newPack.title.setText(newPack.name)
-
         newPack.mods = self.mods.copy()
-        newPack.setLabel()
 
-        mainWindow.packList.addItem(newPack)
-        mainWindow.packList.setItemWidget(newPack, newPack.widget)
+        mainWindow.packList.addPack(newPack)
 
         mainWindow.packList.updateModViewerPackList()
 
@@ -1192,15 +1698,101 @@ class PackItem(QListWidgetItem):
         if len(self.mods) == 0:
             return
 
-        for x in range(mainWindow.modList.count()):
-            mod = mainWindow.modList.item(x)
+        for mod in mainWindow.modList.getMods():
             if mod.loaded:
                 # If the mod is enabled and it shouldn't be.
                 if mod.enabled and mod.directory not in self.mods:
-                    mod.toggleMod()
+                    mainWindow.modList.setModEnabled(mod, False)
                 # If the mod is disabled and it shouldn't be.
                 if not mod.enabled and mod.directory in self.mods:
-                    mod.toggleMod()
+                    mainWindow.modList.setModEnabled(mod, True)
+
+
+# The title and buttons of the selected pack. There's only ever one, it's moved over whichever row is expanded.
+class PackControls(QWidget):
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.pack = None
+
+        self.layout = QVBoxLayout()
+        self.layout.setSpacing(2)
+
+        # Create name and count labels.
+        self.title = PaperLineEdit()
+        self.title.setMinimumSize(QSize(self.title.minimumSize().width(), 40))
+        f = self.title.font()
+        f.setBold(True)
+        f.setPointSize(12)
+        self.title.setFont(f)
+        self.title.editingFinished.connect(self.rename)
+
+        self.modCount = QLabel()
+
+        self.layout.addWidget(self.title)
+        self.layout.addWidget(self.modCount)
+
+        # Changed to 3 row grid layout.
+        self.buttonGrid = QGridLayout()
+        self.buttonGrid.setContentsMargins(0, 0, 0, 0)
+
+        # First row
+        self.apply = PaperPushButton(PaperButtonType.Confirm, "Apply")
+        self.buttonGrid.addWidget(self.apply, 0, 0, 1, 2)
+        self.apply.clicked.connect(lambda: self.pack.applyPack())
+
+        self.export = PaperPushButton(PaperButtonType.Primary, "Export")
+        self.buttonGrid.addWidget(self.export, 0, 2, 1, 1)
+        self.export.clicked.connect(lambda: self.pack.exportPack())
+
+        self.duplicate = PaperPushButton(PaperButtonType.Primary, "Copy")
+        self.buttonGrid.addWidget(self.duplicate, 0, 3, 1, 1)
+        self.duplicate.clicked.connect(lambda: self.pack.duplicatePack())
+
+        # Second row
+        self.addActive = PaperPushButton(PaperButtonType.Confirm, "Add Active Mods")
+        self.buttonGrid.addWidget(self.addActive, 1, 0, 1, 2)
+        self.addActive.clicked.connect(lambda: self.pack.addActiveMods())
+
+        self.removeActive = PaperPushButton(PaperButtonType.Danger, "Remove Active Mods")
+        self.buttonGrid.addWidget(self.removeActive, 1, 2, 1, 2)
+        self.removeActive.clicked.connect(lambda: self.pack.removeActiveMods())
+
+        # Third row
+        self.save = PaperPushButton(PaperButtonType.Confirm, "Save")
+        self.buttonGrid.addWidget(self.save, 2, 0, 1, 2)
+        self.save.clicked.connect(lambda: self.pack.savePack())
+
+        self.delete = PaperPushButton(PaperButtonType.Danger, "Delete")
+        self.buttonGrid.addWidget(self.delete, 2, 2, 1, 2)
+        self.delete.clicked.connect(lambda: self.pack.remove(False))
+
+        self.layout.addLayout(self.buttonGrid)
+
+        self.setLayout(self.layout)
+        self.setVisible(False)
+
+    def setPack(self, pack):
+        # Keep a name that was typed but not confirmed yet.
+        if self.pack is not None and self.pack is not pack and self.title.isModified():
+            self.rename()
+
+        self.pack = pack
+        self.setLabel()
+
+    def setLabel(self):
+        if self.pack is None:
+            return
+
+        self.title.setText(self.pack.getTitle())
+        self.modCount.setText(f"<font size=3><i>Mods: {len(self.pack.mods)}</i></font>")
+
+    def rename(self):
+        if self.pack is None:
+            return
+
+        if not self.pack.rename(self.title.displayText()):
+            self.setLabel()
 
 
 class MiniPackItem(QListWidgetItem):
@@ -1222,11 +1814,11 @@ class MiniPackItem(QListWidgetItem):
 
         self.layout.addWidget(self.label, alignment=Qt.AlignmentFlag.AlignLeft)
 
-        self.checkbox = QPushButton()
+        self.checkbox = PaperCheckbox("resources/mini_box_tick")
         self.checkbox.setFixedSize(32, 32)
         self.checkState = False
 
-        self.refreshCheckboxStylesheet()
+        self.refreshCheckbox()
 
         self.checkbox.clicked.connect(self.checkClicked)
 
@@ -1236,37 +1828,8 @@ class MiniPackItem(QListWidgetItem):
         self.setSizeHint(QSize(200, 64))
 
 
-    # Required after changing object name.
-    # Required after changing object name.
-    def refreshCheckboxStylesheet(self):
-        if self.checkState:
-            self.checkbox.setObjectName("modPackEnabled")
-        else:
-            self.checkbox.setObjectName("modPackDisabled")
-
-        self.checkbox.setStyleSheet(
-            """
-            QPushButton#modPackEnabled{
-                background-color: rgba(255, 255, 255, 0);
-                border-image: url(resources/mini_box_tick_on.png);
-            }
-
-            QPushButton#modPackEnabled:hover{
-                background-color: rgba(255, 255, 255, 0);
-                border-image: url(resources/mini_box_tick_on_hover.png);
-            }
-
-            QPushButton#modPackDisabled{
-                background-color: rgba(255, 255, 255, 0);
-                border-image: url(resources/mini_box_tick_off.png);
-            }
-
-            QPushButton#modPackDisabled:hover{
-                background-color: rgba(255, 255, 255, 0);
-                border-image: url(resources/mini_box_tick_off_hover.png);
-            }
-            """
-        )
+    def refreshCheckbox(self):
+        self.checkbox.setCheckState(self.checkState)
 
     def checkClicked(self):
         self.checkState = not self.checkState
@@ -1282,10 +1845,127 @@ class MiniPackItem(QListWidgetItem):
             else:
                 self.pack.removeMod(selectedMod.directory)
 
-        self.refreshCheckboxStylesheet()
+        self.refreshCheckbox()
+
+
+class PackListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.packs = []
+
+        # The selected pack gets a taller row to fit its buttons.
+        self.expandedPack = None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
 
+        return len(self.packs)
 
-class PackList(PaperListWidget):
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        pack = self.packs[index.row()]
+        if role == PACK_ITEM_ROLE:
+            return pack
+        elif role == Qt.ItemDataRole.DisplayRole:
+            return pack.getTitle()
+        elif role == Qt.ItemDataRole.SizeHintRole:
+            if pack is self.expandedPack:
+                return QSize(200, PACK_EXPANDED_ROW_HEIGHT)
+
+            return QSize(200, PACK_ROW_HEIGHT)
+
+        return None
+
+    def getIndex(self, pack):
+        for row, item in enumerate(self.packs):
+            if item is pack:
+                return self.index(row)
+
+        return QModelIndex()
+
+    def setPacks(self, packs):
+        self.beginResetModel()
+        self.packs = list(packs)
+        self.expandedPack = None
+        self.endResetModel()
+
+    def addPack(self, pack):
+        row = len(self.packs)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.packs.append(pack)
+        self.endInsertRows()
+
+    def removePack(self, pack):
+        index = self.getIndex(pack)
+        if not index.isValid():
+            return
+
+        self.beginRemoveRows(QModelIndex(), index.row(), index.row())
+        del self.packs[index.row()]
+        if pack is self.expandedPack:
+            self.expandedPack = None
+        self.endRemoveRows()
+
+    def packChanged(self, pack):
+        index = self.getIndex(pack)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+
+# Paints a pack's name and mod count. The expanded pack is covered by PackControls instead.
+class PackItemDelegate(PaperItemDelegate):
+    def __init__(self, packList):
+        super().__init__(packList.backgroundColor, packList)
+
+        self.textColor = QColor("#2f2322")
+
+    def sizeHint(self, option, index):
+        return index.data(Qt.ItemDataRole.SizeHintRole)
+
+    def paint(self, painter, option, index):
+        pack = index.data(PACK_ITEM_ROLE)
+
+        self.paintBackground(painter, option)
+
+        if pack is index.model().expandedPack:
+            return
+
+        painter.save()
+
+        # Laid out like the title box and count label of PackControls.
+        rect = option.rect.adjusted(11, 11, -11, -11)
+
+        titleFont = QFont(option.font)
+        titleFont.setBold(True)
+        titleFont.setPointSize(12)
+        countFont = QFont(option.font)
+        countFont.setItalic(True)
+
+        titleRect = QRect(rect.x() + 16, rect.y() + 8, rect.width() - 32, 40 - 20)
+
+        painter.setPen(self.textColor)
+        painter.setFont(titleFont)
+        painter.drawText(
+            titleRect,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            QFontMetrics(titleFont).elidedText(pack.getTitle(), Qt.TextElideMode.ElideRight, titleRect.width()),
+        )
+
+        painter.setFont(countFont)
+        painter.drawText(
+            QRect(rect.x(), rect.y() + 40 + 2, rect.width(), QFontMetrics(countFont).height()),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            f"Mods: {len(pack.mods)}",
+        )
+
+        painter.restore()
+
+
+class PackList(PaperListView):
     def __init__(self):
         super().__init__("#e1d0ba")
 
@@ -1305,7 +1985,17 @@ class PackList(PaperListWidget):
 
         self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
 
-        self.currentItemChanged.connect(self.selectionChanged)
+        self.packModel = PackListModel(self)
+        self.setModel(self.packModel)
+        self.setItemDelegate(PackItemDelegate(self))
+
+        # Packs each mod is in, kept up to date by the packs themselves.
+        self.packIndex = PackIndex()
+
+        # Made once and moved to whichever pack is selected.
+        self.controls = PackControls(self.viewport())
+
+        self.selectionModel().currentChanged.connect(self.currentPackChanged)
 
         if not os.path.exists("packs/") or not os.path.isdir("packs/"):
             os.makedirs("packs/")
@@ -1323,23 +2013,84 @@ class PackList(PaperListWidget):
             packPath = os.path.join(packsPath, packXml)
             if os.path.isfile(packPath) and packPath.lower().endswith(".xml"):
                 packItem = PackItem(packPath)
-                if packItem.validate():
+                if packItem.loaded and packItem.validate(items):
                     items.append(packItem)
 
         items.sort(key=self.packSort)
+        self.packModel.setPacks(items)
+
+        self.packIndex = PackIndex()
         for item in items:
-            self.addItem(item)
-            self.setItemWidget(item, item.widget)
+            self.packIndex.addPack(item)
 
     def packSort(self, ele):
         return ele.dateCreated
 
-    def selectionChanged(self, current, previous):
-        if hasattr(previous, "shrink"):
-            previous.shrink()
+    # Every pack, in the order they're shown.
+    def getPacks(self):
+        return list(self.packModel.packs)
+
+    def addPack(self, pack):
+        self.packModel.addPack(pack)
+        self.packIndex.addPack(pack)
+
+    # Removes every pack with the given UUID.
+    def removePacks(self, uuid):
+        for pack in self.getPacks():
+            if pack.uuid == uuid:
+                self.packModel.removePack(pack)
+                self.packIndex.removePack(pack)
+
+        self.placeControls()
+
+    def packChanged(self, pack):
+        self.packModel.packChanged(pack)
+
+        if pack is self.controls.pack:
+            self.controls.setLabel()
 
-        if hasattr(current, "expand"):
-            current.expand()
+    def setPackHidden(self, pack, hidden):
+        index = self.packModel.getIndex(pack)
+        if index.isValid() and self.isRowHidden(index.row()) != hidden:
+            self.setRowHidden(index.row(), hidden)
+            self.placeControls()
+
+    def currentPackChanged(self, current, previous):
+        pack = current.data(PACK_ITEM_ROLE)
+
+        previousPack = self.packModel.expandedPack
+        self.packModel.expandedPack = pack
+        if previousPack is not None:
+            self.packModel.packChanged(previousPack)
+
+        self.controls.setPack(pack)
+
+        # Row heights changed.
+        self.scheduleDelayedItemsLayout()
+
+    # Puts the controls over the expanded pack, or hides them if there isn't one on screen.
+    def placeControls(self):
+        # Qt already lays the list out while it's being set up.
+        if not hasattr(self, "controls"):
+            return
+
+        pack = self.packModel.expandedPack
+        index = self.packModel.getIndex(pack) if pack is not None else QModelIndex()
+
+        if not index.isValid() or self.isRowHidden(index.row()):
+            self.controls.setVisible(False)
+            return
+
+        self.controls.setGeometry(self.visualRect(index))
+        self.controls.setVisible(True)
+
+    def updateGeometries(self):
+        super().updateGeometries()
+        self.placeControls()
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.placeControls()
 
     def updateModViewerPackList(self):
         if mainWindow.modViewer is not None:
@@ -1374,14 +2125,12 @@ class PackListToolbar(QWidget):
 
     def filter(self):
         query = self.filterBox.displayText().lower()
-        for i in range(mainWindow.packList.count()):
-            item = mainWindow.packList.item(i)
-            item.setHidden(query not in item.name.lower())
+        for pack in mainWindow.packList.getPacks():
+            mainWindow.packList.setPackHidden(pack, query not in pack.name.lower())
 
     def addPack(self):
         newPack = PackItem()
-        mainWindow.packList.addItem(newPack)
-        mainWindow.packList.setItemWidget(newPack, newPack.widget)
+        mainWindow.packList.addPack(newPack)
         self.updateModViewerPackList()
 
     def importPack(self):
@@ -1396,7 +2145,7 @@ class PackListToolbar(QWidget):
         newPack = PackItem(filePath)
         if newPack.validate():
             # Update date created time.
-            newPack.dateCreated = date.now().strftime("%d/%m/%Y, %H:%M:%S")
+            newPack.dateCreated = getDateNow()
 
             # Remove file path so that it's generated later.
             # This prevents just saving to where the pack was imported from.
@@ -1404,8 +2153,7 @@ class PackListToolbar(QWidget):
             # Force save reminder.
             newPack.unsavedChanges = True
     
-            mainWindow.packList.addItem(newPack)
-            mainWindow.packList.setItemWidget(newPack, newPack.widget)
+            mainWindow.packList.addPack(newPack)
             self.updateModViewerPackList()
         else:
             newPack.remove(True)
@@ -1415,20 +2163,11 @@ class PackListToolbar(QWidget):
             mainWindow.modViewer.createPackList()
 
 
-class PackListDropdownMenu(QMenu):
+class PackListDropdownMenu(PaperMenu):
     def __init__(self, toolbar):
         super().__init__()
         self.toolbar = toolbar
 
-        self.setStyleSheet("""
-            color: "#2f2322";
-            border-width: 8px 16px 12px 16px;
-            border-image: url(./resources/backgrounds/textbrowser_background_64.png) 8 16 12 16 round;
-            background: rgba(255, 255, 255, 0%);
-        """)
-        self.setWindowFlags(self.windowFlags() | Qt.WindowType.FramelessWindowHint | Qt.WindowType.NoDropShadowWindowHint)
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-
     def showEvent(self, event):
         self.toolbar.refreshPackChoices()
         event.accept()
@@ -1448,12 +2187,13 @@ class ModViewer(QWidget):
             }
         """)
 
-        self.isaacFont = QFont("FontSouls_v3-Body")
-        self.isaacFont.setHintingPreference(QFont.HintingPreference.PreferNoHinting)
-        self.isaacFont.setPointSize(12)
+        self.isaacFont = getIsaacFont(12)
 
         self.layout = QBoxLayout(QBoxLayout.Direction.TopToBottom)
 
+        # Descriptions aren't kept on the mods, they're loaded here when a mod is selected.
+        self.descriptionCache = DescriptionCache()
+
         self.titleLabel = QLabel()
         self.titleLabel.setStyleSheet('color: "#2f2322"')
 
@@ -1490,8 +2230,7 @@ class ModViewer(QWidget):
 
     def createPackList(self):
         self.addPackList.clear()
-        for x in range(mainWindow.packList.count()):
-            item = mainWindow.packList.item(x)
+        for item in mainWindow.packList.getPacks():
             listItem = MiniPackItem(item)
             self.addPackList.addItem(listItem)
             self.addPackList.setItemWidget(listItem, listItem.widget)
@@ -1499,18 +2238,22 @@ class ModViewer(QWidget):
         self.updatePackList()
 
     def updatePackList(self):
+        selectedPacks = set()
+        if selectedMod is not None:
+            selectedPacks.update(mainWindow.packList.packIndex.getPacks(selectedMod.directory))
+
         for x in range(self.addPackList.count()):
             item = self.addPackList.item(x)
-            if selectedMod is not None and selectedMod.directory in item.pack.mods:
+            if item.pack in selectedPacks:
 
                 item.suppressChangeEvent = True
                 item.checkState = True
-                item.refreshCheckboxStylesheet()
+                item.refreshCheckbox()
                 item.suppressChangeEvent = False
             else:
                 item.suppressChangeEvent = True
                 item.checkState = False
-                item.refreshCheckboxStylesheet()
+                item.refreshCheckbox()
                 item.suppressChangeEvent = False
 
     # Add custom rules to the bbcode parser, since Steam has some special tags.
@@ -1568,7 +2311,7 @@ class ModViewer(QWidget):
         self.titleLabel.setOpenExternalLinks(True)
 
         # Parse description.
-        html = self.parseBBCode(current.description)
+        html = self.parseBBCode(self.descriptionCache.get(current.folderPath, current.signature))
 
         # Set description and update things.
         self.descriptionLabel.setText(html)
@@ -1589,7 +2332,7 @@ class AboutWindowIcon(QLabel):
     def __init__(self):
         super().__init__()
 
-        self.icon = QPixmap("./resources/app_icon.ico")
+        self.icon = getPixmap("./resources/app_icon.ico")
         self.secret = QMovie("./resources/oily_spin.gif")
 
         self.secret.start()
@@ -1623,7 +2366,7 @@ class AboutWindow(QWidget):
         self.setMaximumSize(500, 200)
 
 
-        self.mainBackground = QPixmap("./resources/backgrounds/library_background.png")
+        self.mainBackground = getPixmap("./resources/backgrounds/library_background.png")
         self.mainBackground = self.mainBackground.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding)
         self.backgroundPalette = QPalette()
         self.backgroundPalette.setBrush(QPalette.ColorRole.Window, self.mainBackground)
@@ -1665,7 +2408,7 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(1280, 800)
         self.setMaximumSize(1280, 800)
 
-        self.mainBackground = QPixmap("./resources/backgrounds/library_background.png")
+        self.mainBackground = getPixmap("./resources/backgrounds/library_background.png")
         self.mainBackground = self.mainBackground.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding)
         self.backgroundPalette = QPalette()
         self.backgroundPalette.setBrush(QPalette.ColorRole.Window, self.mainBackground)
@@ -1771,7 +2514,7 @@ class MainWindow(QMainWindow):
 
         # Refresh button
         self.modListRefresh = PaperPushButton(PaperButtonType.Primary, None, self.modListMasterWidget)
-        self.modListRefresh.setIcon(QPixmap("resources/refresh.png"))
+        self.modListRefresh.setIcon(getIcon("resources/refresh.png"))
         self.modListRefresh.setIconSize(QSize(21, 21))
         self.modListRefresh.setMinimumSize(40, 40)
         self.modListRefresh.setMaximumSize(40, 40)
@@ -1779,7 +2522,7 @@ class MainWindow(QMainWindow):
 
         # Disable all button
         self.modDisableAll = PaperPushButton(PaperButtonType.Primary, None, self.modListMasterWidget)
-        self.modDisableAll.setIcon(QPixmap("resources/disableall.png"))
+        self.modDisableAll.setIcon(getIcon("resources/disableall.png"))
         self.modDisableAll.setIconSize(QSize(21, 21))
         self.modDisableAll.setMinimumSize(40, 40)
         self.modDisableAll.setMaximumSize(40, 40)
@@ -1802,6 +2545,7 @@ class MainWindow(QMainWindow):
 
         # Add mod list toolbar.
         self.modToolbar = ModListToolbar()
+        self.modList.modsAdded.connect(self.modToolbar.scheduleFilter)
 
         # Add widgets to dock.
         self.modListDockLayout.addWidget(self.modToolbar)
@@ -1825,32 +2569,39 @@ class MainWindow(QMainWindow):
         self.modList.modThread.destroyed.connect(self.modList.modLoaderWorker.stop)
         self.modList.modThread.start(QThread.Priority.HighestPriority)
 
+        # Setup thumbnail decoding thread.
+        self.modList.thumbnailThread.start(QThread.Priority.LowPriority)
+
     def refreshButtonClick(self):
         mainWindow.modList.loadMods()
 
+        # Thumbnails are only downloaded without asking if automatic download is on.
+        if settings.value("AutomaticThumbnailDownload") == "1":
+            mainWindow.modList.queueMissingThumbnails()
+
     def disableAllButtonClick(self):
-        for x in range(mainWindow.modList.count()):
-            item = mainWindow.modList.item(x)
-            if item and item.loaded and item.enabled:
-                item.disableMod()
-                item.refreshCheckboxStylesheet()
+        for mod in mainWindow.modList.getMods():
+            if mod.loaded and mod.enabled:
+                mainWindow.modList.setModEnabled(mod, False)
 
     def setupModViewer(self):
         # Add mod viewer.
         self.modViewer = ModViewer()
 
         self.setCentralWidget(self.modViewer)
-        self.modList.currentItemChanged.connect(self.modViewer.selectionChanged)
-        self.modViewer.selectionChanged(self.modList.item(0))
+        self.modList.modSelected.connect(self.modViewer.selectionChanged)
+        self.modViewer.selectionChanged(self.modList.getCurrentMod())
 
     def locateModsFolder(self):
         iconQueue.clear()
+        revalidateQueue.clear()
         getModsFolderPath(self)
 
     def toggleAutoThumbnailDownload(self):
         if settings.value("AutomaticThumbnailDownload") == "1":
             settings.setValue("AutomaticThumbnailDownload", "0")
             iconQueue.clear()
+            revalidateQueue.clear()
             self.modList.modIconWorker.paused = True
             self.disableAutoDownload.setText("Enable automatic\nthumbnail download")
         else:
@@ -1858,8 +2609,9 @@ class MainWindow(QMainWindow):
             self.modList.modIconWorker.paused = False
             self.disableAutoDownload.setText("Disable automatic\nthumbnail download")
 
-            # Reload mod list.
+            # Reload mod list and grab the thumbnails that were skipped while disabled.
             mainWindow.modList.loadMods()
+            mainWindow.modList.queueMissingThumbnails()
 
     def modFolderLocated(self):
         mainWindow.modList.loadMods()
@@ -1872,8 +2624,7 @@ class MainWindow(QMainWindow):
 
         # Check for unsaved packs
         unsavedPacks = []
-        for x in range(self.packList.count()):
-            item = self.packList.item(x)
+        for item in self.packList.getPacks():
             if item.unsavedChanges:
                 unsavedPacks.append(item.name)
         
@@ -1897,8 +2648,7 @@ class MainWindow(QMainWindow):
             # Handle clicks
             if dialog.clickedButton() == saveButton:
                 # Save all unsaved packs
-                for x in range(self.packList.count()):
-                    item = self.packList.item(x)
+                for item in self.packList.getPacks():
                     if item.unsavedChanges:
                         item.serialize()
             
@@ -1911,15 +2661,23 @@ class MainWindow(QMainWindow):
 
         # Disable workshop icon queue.
         iconQueue.clear()
+        revalidateQueue.clear()
 
         self.modList.iconThread.requestInterruption()
         self.modList.modThread.requestInterruption()
+        self.modList.modLoaderWorker.destroy.emit()
+
+        self.modList.thumbnailThread.requestInterruption()
+        self.modList.thumbnailThread.quit()
 
         event.accept()
 
 if __name__ == "__main__":
+    # Needed for scanning with processes once packaged with pyinstaller.
+    multiprocessing.freeze_support()
+
     app = QApplication([])
-    app.setWindowIcon(QIcon("resources/app_icon.ico"))
+    app.setWindowIcon(getIcon("resources/app_icon.ico"))
 
     settings = QSettings("settings.ini", QSettings.IniFormat)
     applyDefaultSettings(settings)
@@ -1936,4 +2694,6 @@ if __name__ == "__main__":
 
     mainWindow.modList.iconThread.wait()
     mainWindow.modList.modThread.wait()
+    mainWindow.modList.thumbnailThread.wait()
+    mainWindow.modList.modModel.thumbnailAtlas.flush()
     sys.exit(0)
@@ -0,0 +1,83 @@
+import os
+import configparser
+
+from src.ModIndex import ModIndex, MOD_INDEX_PATH
+from src.ModScanner import ModScanner
+from src.ModDiscovery import listModFolders
+
+# Everything Bookworm does to mods and packs that doesn't need a window.
+# Nothing in here may import PySide6, so scripts and the command line stay quick to start.
+
+SETTINGS_PATH = "settings.ini"
+
+
+# Reads a value out of the settings.ini written by QSettings.
+def readSetting(key, settingsPath=SETTINGS_PATH):
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.optionxform = str
+
+    try:
+        parser.read(settingsPath, encoding="utf-8")
+    except configparser.Error:
+        print(f"Could not read settings at path {settingsPath}")
+        return None
+
+    if not parser.has_option("General", key):
+        return None
+
+    value = parser.get("General", key)
+
+    # QSettings quotes values with special characters in them and escapes backslashes.
+    if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+        value = value[1:-1]
+
+    return value.replace("\\\\", "\\")
+
+
+def setModEnabled(folderPath, enabled):
+    path = os.path.join(folderPath, "disable.it")
+
+    if enabled:
+        # Remove disable.it (if it exists)
+        if os.path.exists(path):
+            os.remove(path)
+    else:
+        # Create disable.it at path.
+        with open(path, "w") as fp:
+            pass
+
+
+# Loads every mod in the mods folder, sorted by name with mods that failed to load last.
+def scanMods(modsPath, indexPath=MOD_INDEX_PATH, workerCount=0):
+    loadedMods = []
+
+    scanner = ModScanner(workerCount, False, ModIndex(indexPath))
+    try:
+        scanner.scan(listModFolders(modsPath), loadedMods.append)
+    finally:
+        scanner.shutdown()
+
+    loadedMods.sort(key=lambda loadedData: (not loadedData["Loaded"], loadedData["Name"] or ""))
+    return loadedMods
+
+
+# Enables the mods in the pack and disables the rest.
+# Returns the mods that were toggled. Does nothing for an empty pack, same as the Apply button.
+def applyModPack(pack, loadedMods, dryRun=False):
+    toggled = []
+    if len(pack.mods) == 0:
+        return toggled
+
+    for loadedData in loadedMods:
+        if not loadedData["Loaded"]:
+            continue
+
+        shouldBeEnabled = loadedData["Directory"] in pack.mods
+        if loadedData["Enabled"] != shouldBeEnabled:
+            if not dryRun:
+                setModEnabled(loadedData["FolderPath"], shouldBeEnabled)
+                loadedData["Enabled"] = shouldBeEnabled
+
+            toggled.append(loadedData)
+
+    return toggled
@@ -0,0 +1,65 @@
+import os
+
+
+# What's known about a mod folder from its directory listing alone.
+class ModFolder():
+    def __init__(self, folderPath):
+        self.folderPath = folderPath
+        self.hasMetadata = False
+        self.metadataModified = None
+        self.metadataSize = None
+        self.disabled = False
+
+    # Changes whenever metadata.xml is edited or disable.it comes or goes.
+    # None when there's no metadata.xml, since there's nothing to compare.
+    def getSignature(self):
+        if not self.hasMetadata:
+            return None
+
+        return [self.metadataModified, self.metadataSize, self.disabled]
+
+    def setMetadataStat(self, stat):
+        self.hasMetadata = True
+        self.metadataModified = stat.st_mtime_ns
+        self.metadataSize = stat.st_size
+
+
+# Lists every folder in the mods folder.
+# Whether an entry is a folder comes with the listing itself, so this doesn't stat each one.
+def listModFolders(modsPath):
+    folderPaths = []
+    with os.scandir(modsPath) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                folderPaths.append(entry.path)
+
+    return folderPaths
+
+
+# Finds metadata.xml and disable.it with as few calls to the file system as possible.
+def readModFolder(folderPath):
+    modFolder = ModFolder(folderPath)
+
+    if os.name == "nt":
+        # Windows hands back every file's size and modified time along with the listing,
+        # so one listing answers everything. This matters the most on network drives.
+        try:
+            with os.scandir(folderPath) as entries:
+                for entry in entries:
+                    name = os.path.normcase(entry.name)
+                    if name == "metadata.xml" and entry.is_file():
+                        modFolder.setMetadataStat(entry.stat())
+                    elif name == "disable.it":
+                        modFolder.disabled = True
+        except OSError:
+            print(f"Could not read mod folder at path {folderPath}")
+    else:
+        # Listing a folder takes several calls here, stating the two files directly is cheaper.
+        try:
+            modFolder.setMetadataStat(os.stat(os.path.join(folderPath, "metadata.xml")))
+        except OSError:
+            pass
+
+        modFolder.disabled = os.path.lexists(os.path.join(folderPath, "disable.it"))
+
+    return modFolder
@@ -0,0 +1,102 @@
+import os
+import json
+
+MOD_INDEX_PATH = "cache/modindex.json"
+MOD_INDEX_VERSION = 2
+
+# Fields produced by `loadModData` that are kept in the index.
+# FolderPath is the key, so it isn't stored twice.
+INDEXED_FIELDS = (
+    "Directory",
+    "WorkshopId",
+    "Name",
+    "Version",
+    "Enabled",
+    "Loaded",
+)
+
+
+# Keeps the parsed metadata.xml of every mod on disk between launches.
+# An entry is only valid while its signature (see `ModFolder.getSignature`) matches the folder on disk.
+class ModIndex():
+    def __init__(self, filePath=MOD_INDEX_PATH):
+        self.filePath = filePath
+        self.entries = {}
+        self.seen = set()
+        self.dirty = False
+
+        self.load()
+
+    def load(self):
+        if not os.path.isfile(self.filePath):
+            return
+
+        try:
+            with open(self.filePath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            print(f"Could not read mod index at path {self.filePath}, rebuilding it")
+            return
+
+        if not isinstance(data, dict) or data.get("Version") != MOD_INDEX_VERSION:
+            return
+
+        mods = data.get("Mods")
+        if isinstance(mods, dict):
+            self.entries = mods
+
+    def getEntry(self, folderPath):
+        return self.entries.get(folderPath)
+
+    # Turns an index entry back into the data `loadModData` would return.
+    # Returns None if there's no entry or the folder has changed since it was indexed.
+    def entryToData(folderPath, entry, signature):
+        if signature is None or entry is None or entry.get("Signature") != signature:
+            return None
+
+        loadedData = {"FolderPath": folderPath}
+        for field in INDEXED_FIELDS:
+            loadedData[field] = entry["Data"].get(field)
+
+        return loadedData
+
+    def markSeen(self, folderPath):
+        self.seen.add(folderPath)
+
+    def store(self, folderPath, signature, loadedData):
+        # Folders without a metadata.xml are cheap to check again, don't index them.
+        if signature is None:
+            self.entries.pop(folderPath, None)
+            return
+
+        self.seen.add(folderPath)
+        self.entries[folderPath] = {
+            "Signature": signature,
+            "Data": {field: loadedData[field] for field in INDEXED_FIELDS},
+        }
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+
+        # Forget mods that weren't seen this session and have since been deleted.
+        for folderPath in list(self.entries.keys()):
+            if folderPath not in self.seen and not os.path.isdir(folderPath):
+                del self.entries[folderPath]
+
+        directory = os.path.dirname(self.filePath)
+        if directory != "" and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        # Write to a temporary file first so a crash can't leave a half-written index.
+        tempPath = self.filePath + ".tmp"
+        try:
+            with open(tempPath, "w", encoding="utf-8") as f:
+                json.dump({"Version": MOD_INDEX_VERSION, "Mods": self.entries}, f)
+            os.replace(tempPath, self.filePath)
+        except OSError:
+            print(f"Could not save mod index at path {self.filePath}")
+            return
+
+        self.dirty = False
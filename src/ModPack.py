@@ -0,0 +1,226 @@
+import os
+import uuid
+
+from datetime import datetime as date
+
+import defusedxml.ElementTree as ET
+import xml.etree.ElementTree as OtherET
+
+PACKS_PATH = "packs/"
+PACK_DATE_FORMAT = "%d/%m/%Y, %H:%M:%S"
+
+
+def getDateNow():
+    return date.now().strftime(PACK_DATE_FORMAT)
+
+
+# Raised when a pack file can't be loaded.
+# `userMessage` is set when the problem is worth telling the user about, not just printing.
+class PackLoadError(Exception):
+    def __init__(self, message, userMessage=None):
+        super().__init__(message)
+
+        self.userMessage = userMessage
+
+
+# A modpack, without anything to do with how it's displayed.
+class ModPack():
+    def __init__(self):
+        dateNow = getDateNow()
+        self.name = "New Pack (" + dateNow + ")"
+        self.uuid = str(uuid.uuid4())
+        self.dateCreated = dateNow
+        self.dateModified = dateNow
+        # Mod directories in the order they were added. Only the keys are used,
+        # a dict keeps the order and answers "is this mod in the pack" without going through the list.
+        self.mods = {}
+        self.filePath = None
+
+    def addMod(self, directory):
+        self.mods[directory] = None
+
+    def removeMod(self, directory):
+        self.mods.pop(directory, None)
+
+    def deserialize(self, filePath):
+        self.filePath = filePath
+
+        try:
+            tree = ET.parse(filePath)
+        except:
+            raise PackLoadError(f"Could not parse pack data at path {filePath}")
+
+        root = tree.getroot()
+
+        # Get name of pack.
+        name = root.find("name")
+        if name == None:
+            raise PackLoadError(
+                f"No name found for pack of path {filePath}",
+                f'Pack "{filePath}" could not be loaded (no name found)!',
+            )
+
+        self.name = name.text
+
+        uuidTag = root.find("uuid")
+        if uuidTag == None:
+            raise PackLoadError(
+                f"No UUID found for pack of path {filePath}",
+                f'Pack "{filePath}" could not be loaded (no uuid found)!',
+            )
+
+        self.uuid = uuidTag.text
+
+        # Get date information.
+        dateNow = getDateNow()
+        dateTag = root.find("date")
+        if dateTag == None:
+            self.dateCreated = dateNow
+            self.dateModified = dateNow
+        else:
+            self.dateCreated = dateTag.get("created")
+            self.dateModified = dateTag.get("modified")
+
+        # Get mods in pack.
+        self.mods = {}
+        modTag = root.find("mods")
+        if modTag == None:
+            raise PackLoadError(
+                f"No mods found for pack of path {filePath}",
+                f'Pack "{filePath}" could not be loaded (no empty or filled mod list found)!',
+            )
+
+        mods = modTag.findall("mod")
+        for mod in mods:
+            ModPack.addMod(self, mod.text)
+
+    def serialize(self, forcePath=None):
+        # Serialize as XML.
+        root = OtherET.Element("modpack")
+
+        # Name tag.
+        name = OtherET.SubElement(root, "name")
+        name.text = self.name
+
+        # UUID tag.
+        uuidTag = OtherET.SubElement(root, "uuid")
+        if forcePath:
+            # Exporting, generate a new tag so that it can be imported again in the same list and be fine.
+            uuidTag.text = str(uuid.uuid4())
+        else:
+            uuidTag.text = self.uuid
+
+        # Date tag.
+        self.dateModified = getDateNow()
+        dateTag = OtherET.SubElement(
+            root,
+            "date",
+            attrib={
+                "created": self.dateCreated,
+                "modified": self.dateModified,
+            },
+        )
+
+        # Mod tags.
+        modTag = OtherET.SubElement(root, "mods")
+        for mod in self.mods:
+            tag = OtherET.SubElement(modTag, "mod")
+            tag.text = mod
+
+        # Write.
+        tree = OtherET.ElementTree(root)
+        OtherET.indent(tree, space="\t", level=0)
+
+        # Only set the filepath if it's being exported.
+        if forcePath:
+            tree.write(forcePath, encoding="utf-8")
+        else:
+            # Find file path.
+            if self.filePath is None:
+                # https://stackoverflow.com/a/7406369
+                keepCharacters = (" ", ".", "_")
+                filename = "".join(
+                    c for c in self.name if c.isalnum() or c in keepCharacters
+                ).rstrip()
+
+                self.filePath = PACKS_PATH + filename + ".xml"
+
+            tree.write(self.filePath, encoding="utf-8")
+
+        print(f"Successfully saved pack {self.name}")
+
+
+# Which packs each mod is in, for the packs added to it.
+# Packs tell it about mods they gain or lose, so nothing has to look through every pack.
+class PackIndex():
+    def __init__(self):
+        self.packs = set()
+        self.packsByMod = {}  # Packs holding each mod directory, in the order they were added.
+
+    def addPack(self, pack):
+        self.packs.add(pack)
+        for directory in pack.mods:
+            self.packsByMod.setdefault(directory, {})[pack] = None
+
+    def removePack(self, pack):
+        if pack not in self.packs:
+            return
+
+        self.packs.discard(pack)
+        for directory in pack.mods:
+            self.removeFromMod(pack, directory)
+
+    # Packs that aren't in the index are ignored.
+    def addMod(self, pack, directory):
+        if pack in self.packs:
+            self.packsByMod.setdefault(directory, {})[pack] = None
+
+    def removeMod(self, pack, directory):
+        if pack in self.packs:
+            self.removeFromMod(pack, directory)
+
+    def removeFromMod(self, pack, directory):
+        packs = self.packsByMod.get(directory)
+        if packs is None:
+            return
+
+        packs.pop(pack, None)
+        if len(packs) == 0:
+            del self.packsByMod[directory]
+
+    def getPacks(self, directory):
+        return list(self.packsByMod.get(directory, ()))
+
+    def getPackCount(self, directory):
+        return len(self.packsByMod.get(directory, ()))
+
+
+# Loads every pack in the packs folder, oldest first.
+# Packs that fail to load or share a UUID with an earlier pack are skipped.
+def loadPackFolder(packsPath=PACKS_PATH):
+    packs = []
+    if not os.path.isdir(packsPath):
+        return packs
+
+    uuids = set()
+    for packXml in os.listdir(packsPath):
+        packPath = os.path.join(packsPath, packXml)
+        if not os.path.isfile(packPath) or not packPath.lower().endswith(".xml"):
+            continue
+
+        pack = ModPack()
+        try:
+            pack.deserialize(packPath)
+        except PackLoadError as e:
+            print(e)
+            continue
+
+        if pack.uuid in uuids:
+            print(f"Pack of path {packPath} is already loaded!")
+            continue
+
+        uuids.add(pack.uuid)
+        packs.append(pack)
+
+    packs.sort(key=lambda pack: pack.dateCreated)
+    return packs
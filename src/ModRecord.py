@@ -0,0 +1,58 @@
+import os
+
+from src.BookwormCore import setModEnabled
+
+
+# Everything Bookworm knows about one mod, made from the data the scanner sends back.
+# There's exactly one record per mod folder, and the mod list, its filters and sorting,
+# the packs and the mod viewer all look at that same record.
+# Slots keep it to a few hundred bytes, it's kept for every mod no matter how big the mods folder gets.
+class ModRecord():
+    __slots__ = (
+        "folderPath",
+        "directory",
+        "workshopId",
+        "name",
+        "version",
+        "enabled",
+        "loaded",
+        "signature",
+        "sortName",
+        "sortWorkshopId",
+        "modifiedTime",
+    )
+
+    def __init__(self, loadedData):
+        self.folderPath = loadedData["FolderPath"]
+        self.update(loadedData)
+
+    # Takes in a new scan of the same folder.
+    def update(self, loadedData):
+        self.directory = loadedData["Directory"]
+        self.workshopId = loadedData["WorkshopId"]
+        self.name = loadedData["Name"]
+        self.version = loadedData["Version"]
+        self.enabled = loadedData["Enabled"]
+        self.loaded = loadedData["Loaded"]
+        self.signature = loadedData.get("Signature")
+
+        # Worked out once here so sorting only compares what's already there.
+        self.sortName = (self.name or "").casefold()
+        self.sortWorkshopId = int(self.workshopId) if self.workshopId is not None and self.workshopId.isdigit() else None
+
+        # Only needed when sorting by it, see getModifiedTime.
+        self.modifiedTime = None
+
+    # When the mod folder was last modified. Stat'ed the first time it's asked for, until the next update.
+    def getModifiedTime(self):
+        if self.modifiedTime is None:
+            try:
+                self.modifiedTime = os.stat(self.folderPath).st_mtime
+            except OSError:
+                self.modifiedTime = 0
+
+        return self.modifiedTime
+
+    def setEnabled(self, enabled):
+        setModEnabled(self.folderPath, enabled)
+        self.enabled = enabled
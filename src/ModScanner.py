@@ -0,0 +1,229 @@
+import os
+import concurrent.futures
+
+from collections import OrderedDict
+
+import defusedxml.ElementTree as ET
+
+from src.ModIndex import ModIndex
+from src.ModDiscovery import readModFolder
+
+# Descriptions are only needed for the selected mod, so only a handful are kept in memory.
+MOD_DESCRIPTION_CACHE_SIZE = 16
+
+
+# `disabled` and `hasMetadata` can be passed in when they're already known from the folder listing.
+def loadModData(folderPath, disabled=None, hasMetadata=True):
+    loadedData = {
+        "FolderPath": folderPath,
+        "Directory": None,
+        "WorkshopId": None,
+        "Name": None,
+        "Version": None,
+        "Enabled": None,
+        "Loaded": False
+    }
+
+    # Not a mod.
+    if not hasMetadata:
+        print(f"No metadata.xml found for folder of path {folderPath}")
+        return loadedData
+
+    metadataPath = os.path.join(folderPath, "metadata.xml")
+
+    # Open metadata.xml.
+    try:
+        tree = ET.parse(metadataPath)
+    except:
+        print(f"Could not parse mod at path {folderPath}")
+        return loadedData
+
+    root = tree.getroot()
+
+    # Get folder name (directory tag).
+    # This is what keeps track of what mod this is.
+    directory = root.find("directory")
+    if directory == None:
+        # Not a valid mod.
+        print(f"No directory found for mod of path {folderPath}")
+        return loadedData
+
+    loadedData["Directory"] = directory.text
+
+    # Check if mod is a workshop mod (id tag).
+    workshopId = root.find("id")
+    if workshopId != None:
+        loadedData["WorkshopId"] = workshopId.text
+
+    # Get mod name.
+    name = root.find("name")
+    if name == None:
+        # Not a valid mod.
+        print(f"No name found for mod of path {folderPath}")
+        return loadedData
+
+    loadedData["Name"] = name.text
+
+    # Get mod version.
+    version = root.find("version")
+    if version == None:
+        # Not a valid mod.
+        print(f"No version found for mod of path {folderPath}")
+        return loadedData
+
+    loadedData["Version"] = version.text
+
+    # Check if enabled by looking for disable.it
+    if disabled is None:
+        disableItPath = os.path.join(folderPath, "disable.it")
+        disabled = os.path.exists(disableItPath)
+
+    loadedData["Enabled"] = not disabled
+
+    loadedData["Loaded"] = True
+
+    return loadedData
+
+
+# Descriptions can be huge, so they're read separately when a mod gets selected.
+def loadModDescription(folderPath):
+    try:
+        tree = ET.parse(os.path.join(folderPath, "metadata.xml"))
+    except:
+        print(f"Could not parse mod at path {folderPath}")
+        return "[No description]"
+
+    description = tree.getroot().find("description")
+    if description == None or description.text == None or description.text == "":
+        return "[No description]"
+
+    return description.text
+
+
+# Keeps the most recently viewed descriptions around.
+class DescriptionCache():
+    def __init__(self, maxSize=MOD_DESCRIPTION_CACHE_SIZE):
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+
+    # The signature makes sure an edited metadata.xml isn't served from the cache.
+    def get(self, folderPath, signature):
+        entry = self.entries.get(folderPath)
+        if entry is not None and entry[0] == signature:
+            self.entries.move_to_end(folderPath)
+            return entry[1]
+
+        description = loadModDescription(folderPath)
+        self.entries[folderPath] = (signature, description)
+        self.entries.move_to_end(folderPath)
+
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+
+        return description
+
+
+# Runs inside a worker. Reuses the indexed data if the folder hasn't changed, otherwise parses metadata.xml.
+# Returns no data at all if the folder still matches the signature the caller already has.
+def scanModFolder(folderPath, indexEntry, knownSignature=None):
+    modFolder = readModFolder(folderPath)
+    signature = modFolder.getSignature()
+    if knownSignature is not None and signature == knownSignature:
+        return signature, None, True
+
+    loadedData = ModIndex.entryToData(folderPath, indexEntry, signature)
+    if loadedData is not None:
+        return signature, loadedData, True
+
+    return signature, loadModData(folderPath, modFolder.disabled, modFolder.hasMetadata), False
+
+
+def getDefaultWorkerCount(useProcesses):
+    if useProcesses:
+        return os.cpu_count() or 1
+
+    # Same default as ThreadPoolExecutor, most of the time is spent waiting on the disk.
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+# Parses mod folders on a pool of workers and hands back each result as soon as it's ready.
+class ModScanner():
+    def __init__(self, workerCount=0, useProcesses=False, modIndex=None):
+        self.useProcesses = useProcesses
+        self.workerCount = workerCount if workerCount > 0 else getDefaultWorkerCount(useProcesses)
+        self.modIndex = modIndex if modIndex is not None else ModIndex()
+        self.executor = None
+
+    def getExecutor(self):
+        # Kept alive between scans, starting processes isn't free.
+        if self.executor is None:
+            if self.useProcesses:
+                self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workerCount)
+            else:
+                self.executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workerCount, thread_name_prefix="ModScanner"
+                )
+
+        return self.executor
+
+    # Calls `onLoaded` with the data of every folder in whatever order they finish.
+    # Folders whose signature matches the one in `knownSignatures` are skipped.
+    # Returns False if `isCancelled` returned True before everything was scanned.
+    def scan(self, folderPaths, onLoaded, isCancelled=None, knownSignatures=None):
+        executor = self.getExecutor()
+        if knownSignatures is None:
+            knownSignatures = {}
+
+        pending = {}
+        for folderPath in folderPaths:
+            future = executor.submit(
+                scanModFolder,
+                folderPath,
+                self.modIndex.getEntry(folderPath),
+                knownSignatures.get(folderPath),
+            )
+            pending[future] = folderPath
+
+        finished = True
+        try:
+            while len(pending) > 0:
+                done, _ = concurrent.futures.wait(
+                    pending, timeout=0.1, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+
+                for future in done:
+                    folderPath = pending.pop(future)
+                    try:
+                        signature, loadedData, fromIndex = future.result()
+                    except Exception as e:
+                        print(f"Could not scan mod at path {folderPath} ({e})")
+                        continue
+
+                    if fromIndex:
+                        self.modIndex.markSeen(folderPath)
+                    else:
+                        self.modIndex.store(folderPath, signature, loadedData)
+
+                    # Unchanged since the last scan.
+                    if loadedData is None:
+                        continue
+
+                    loadedData["Signature"] = signature
+                    onLoaded(loadedData)
+
+                if isCancelled is not None and isCancelled():
+                    finished = False
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+
+        # Done scanning, write any changes to disk.
+        self.modIndex.save()
+
+        return finished
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
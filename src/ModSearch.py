@@ -0,0 +1,76 @@
+from collections import defaultdict
+
+# Length of the runs of characters the index is made of.
+NGRAM_LENGTH = 3
+
+# Goes between the texts of one mod so a query can't match across them.
+TEXT_SEPARATOR = "\0"
+
+
+# Finds mods by part of their name or folder name without checking every mod on every keystroke.
+# Texts are case-folded once when the index is built. Queries look up the trigrams (runs of three
+# characters) they're made of to get a few candidates, and only those are checked for the whole query.
+class ModSearchIndex():
+    def __init__(self):
+        self.keys = []  # What search returns for each entry.
+        self.texts = []  # Case-folded text of each entry.
+        self.ngrams = defaultdict(list)  # Entries (in order) that contain each trigram.
+
+        # A query that contains the last one can only match what the last one did.
+        self.lastQuery = None
+        self.lastResult = None
+
+    # `items` are (key, texts) pairs, like a mod's folder path and its name and directory.
+    def build(items):
+        index = ModSearchIndex()
+        for key, texts in items:
+            index.add(key, texts)
+
+        return index
+
+    def add(self, key, texts):
+        entry = len(self.keys)
+        self.keys.append(key)
+
+        texts = [text.casefold() for text in texts if text]
+        self.texts.append(TEXT_SEPARATOR.join(texts))
+
+        ngrams = self.ngrams
+        for ngram in {text[i:i + NGRAM_LENGTH] for text in texts for i in range(len(text) - NGRAM_LENGTH + 1)}:
+            ngrams[ngram].append(entry)
+
+        self.lastQuery = None
+        self.lastResult = None
+
+    # Entries that could contain `query`, the shortest list there is to check.
+    def getCandidates(self, query):
+        candidates = None
+        if self.lastQuery is not None and self.lastQuery in query:
+            candidates = self.lastResult
+
+        if len(query) >= NGRAM_LENGTH:
+            for i in range(len(query) - NGRAM_LENGTH + 1):
+                entries = self.ngrams.get(query[i:i + NGRAM_LENGTH])
+                if entries is None:
+                    return []
+
+                if candidates is None or len(entries) < len(candidates):
+                    candidates = entries
+
+        if candidates is None:
+            return range(len(self.texts))
+
+        return candidates
+
+    # Returns the keys of every entry with a text containing `query`, ignoring case.
+    def search(self, query):
+        query = query.casefold()
+
+        texts = self.texts
+        result = [entry for entry in self.getCandidates(query) if query in texts[entry]]
+
+        self.lastQuery = query
+        self.lastResult = result
+
+        keys = self.keys
+        return {keys[entry] for entry in result}
@@ -0,0 +1,196 @@
+import os
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QRect, QRectF
+from PySide6.QtGui import QPixmap, QIcon, QPainter
+
+
+# Most nine-patches kept around. One is made per image, size and pixel ratio,
+# so this only fills up when windows are resized a lot.
+NINE_PATCH_CACHE_SIZE = 256
+
+
+# Decodes each image once and hands out the same QPixmap/QIcon to everything that asks for it.
+# QPixmap shares its data between copies, so this costs one decoded image per file.
+# Needs a QApplication to exist before the first image is asked for.
+class ResourceCache():
+    def __init__(self):
+        self.pixmaps = {}
+        self.icons = {}
+        self.ninePatches = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    # "./resources/a.png" and "resources/a.png" are the same image.
+    def normalizePath(self, path):
+        return os.path.normpath(path)
+
+    def getPixmap(self, path):
+        key = self.normalizePath(path)
+
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        pixmap = QPixmap(path)
+        if pixmap.isNull():
+            print(f"Could not load image at path {path}")
+
+        self.pixmaps[key] = pixmap
+        return pixmap
+
+    def getIcon(self, path):
+        key = self.normalizePath(path)
+
+        icon = self.icons.get(key)
+        if icon is not None:
+            self.hits += 1
+            return icon
+
+        icon = QIcon(self.getPixmap(path))
+        self.icons[key] = icon
+        return icon
+
+    # The image at `path` stretched to `size` like a stylesheet border-image with "fill".
+    # `border` is the top, right, bottom and left slice widths, in stylesheet order.
+    def getNinePatch(self, path, size, border, devicePixelRatio=1.0):
+        key = (self.normalizePath(path), size.width(), size.height(), border, devicePixelRatio)
+
+        pixmap = self.ninePatches.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self.ninePatches.move_to_end(key)
+            return pixmap
+
+        self.misses += 1
+        pixmap = QPixmap(size * devicePixelRatio)
+        pixmap.setDevicePixelRatio(devicePixelRatio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        drawNinePatch(painter, QRect(0, 0, size.width(), size.height()), self.getPixmap(path), border)
+        painter.end()
+
+        self.ninePatches[key] = pixmap
+        if len(self.ninePatches) > NINE_PATCH_CACHE_SIZE:
+            self.ninePatches.popitem(last=False)
+
+        return pixmap
+
+    # Drops an image that changed on disk, it's loaded again the next time it's asked for.
+    def invalidate(self, path):
+        key = self.normalizePath(path)
+        self.pixmaps.pop(key, None)
+        self.icons.pop(key, None)
+
+        for ninePatchKey in [k for k in self.ninePatches if k[0] == key]:
+            del self.ninePatches[ninePatchKey]
+
+    def getStats(self):
+        return {
+            "Hits": self.hits,
+            "Misses": self.misses,
+            "Images": len(self.pixmaps),
+            "NinePatches": len(self.ninePatches),
+        }
+
+
+# Decoded thumbnails, by path. Only the `maxSize` most recently used are kept,
+# so scrolling through thousands of mods doesn't keep thousands of images around.
+class ThumbnailCache():
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self.pixmaps = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Returns None if the thumbnail isn't decoded.
+    def get(self, path):
+        pixmap = self.pixmaps.get(path)
+        if pixmap is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.pixmaps.move_to_end(path)
+        return pixmap
+
+    def put(self, path, pixmap):
+        self.pixmaps[path] = pixmap
+        self.pixmaps.move_to_end(path)
+
+        while len(self.pixmaps) > self.maxSize:
+            self.pixmaps.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, path):
+        self.pixmaps.pop(path, None)
+
+    def getStats(self):
+        return {
+            "Hits": self.hits,
+            "Misses": self.misses,
+            "Evictions": self.evictions,
+            "Thumbnails": len(self.pixmaps),
+        }
+
+
+# Draws the corners of `source` as they are, stretches the edges along one side and the middle both ways.
+def drawNinePatch(painter, rect, source, border):
+    if source.isNull():
+        return
+
+    top, right, bottom, left = border
+
+    # Don't let the corners overlap on rects smaller than the border.
+    targetLeft = min(left, rect.width() // 2)
+    targetRight = min(right, rect.width() - targetLeft)
+    targetTop = min(top, rect.height() // 2)
+    targetBottom = min(bottom, rect.height() - targetTop)
+
+    sourceWidth = source.width() / source.devicePixelRatio()
+    sourceHeight = source.height() / source.devicePixelRatio()
+
+    sourceColumns = ((0, left), (left, sourceWidth - left - right), (sourceWidth - right, right))
+    sourceRows = ((0, top), (top, sourceHeight - top - bottom), (sourceHeight - bottom, bottom))
+    targetColumns = (
+        (rect.x(), targetLeft),
+        (rect.x() + targetLeft, rect.width() - targetLeft - targetRight),
+        (rect.x() + rect.width() - targetRight, targetRight),
+    )
+    targetRows = (
+        (rect.y(), targetTop),
+        (rect.y() + targetTop, rect.height() - targetTop - targetBottom),
+        (rect.y() + rect.height() - targetBottom, targetBottom),
+    )
+
+    for (sourceY, sourceH), (targetY, targetH) in zip(sourceRows, targetRows):
+        for (sourceX, sourceW), (targetX, targetW) in zip(sourceColumns, targetColumns):
+            if sourceW <= 0 or sourceH <= 0 or targetW <= 0 or targetH <= 0:
+                continue
+
+            painter.drawPixmap(
+                QRectF(targetX, targetY, targetW, targetH),
+                source,
+                QRectF(sourceX, sourceY, sourceW, sourceH),
+            )
+
+
+resourceCache = ResourceCache()
+
+
+def getPixmap(path):
+    return resourceCache.getPixmap(path)
+
+
+def getIcon(path):
+    return resourceCache.getIcon(path)
+
+
+def getNinePatch(path, size, border, devicePixelRatio=1.0):
+    return resourceCache.getNinePatch(path, size, border, devicePixelRatio)
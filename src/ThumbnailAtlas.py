@@ -0,0 +1,263 @@
+import io
+import os
+import sys
+import mmap
+import struct
+import threading
+
+from PIL import Image
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+
+THUMBNAIL_ATLAS_PATH = "cache/thumbnails.atlas"
+
+# Thumbnails are stored at the size the mod list shows them at.
+THUMBNAIL_SIZE = 64
+THUMBNAIL_BYTES = THUMBNAIL_SIZE * THUMBNAIL_SIZE * 4
+
+# Magic, version and thumbnail size, padded to 16 bytes.
+ATLAS_HEADER = struct.Struct("<4sII4x")
+ATLAS_MAGIC = b"BWTA"
+ATLAS_VERSION = 1
+
+# Workshop id of the thumbnail in a slot, 0 if the slot is free.
+# Padded so the pixels after it stay 16 byte aligned.
+SLOT_HEADER = struct.Struct("<Q8x")
+SLOT_SIZE = SLOT_HEADER.size + THUMBNAIL_BYTES
+
+# Free slots added whenever the atlas runs out of them.
+ATLAS_GROWTH = 256
+
+
+# Workshop ids are stored as numbers. Returns None for an id that can't be stored.
+def getSlotId(workshopId):
+    if workshopId is None or not workshopId.isdigit():
+        return None
+
+    slotId = int(workshopId)
+    if slotId == 0 or slotId >= 2 ** 64:
+        return None
+
+    return slotId
+
+
+# Every downloaded thumbnail in one file of fixed size slots of raw RGBA pixels, read through mmap.
+# Loading a thumbnail is a slice of the map, there's no file to open or PNG to decode.
+# Shared between the thread that downloads thumbnails and the one that loads them.
+class ThumbnailAtlas():
+    def __init__(self, filePath=THUMBNAIL_ATLAS_PATH):
+        self.filePath = filePath
+        self.lock = threading.Lock()
+
+        self.file = None
+        self.map = None
+        self.slotCount = 0
+        self.slots = {}  # Slot of every thumbnail by workshop id.
+        self.freeSlots = []
+
+        # Maps replaced when the atlas grew. Images from `getImage` may still point into them.
+        self.retiredMaps = []
+
+        self.open()
+
+    def open(self):
+        directory = os.path.dirname(self.filePath)
+        try:
+            if directory != "" and not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            self.file = open(self.filePath, "r+b" if os.path.isfile(self.filePath) else "w+b")
+            size = os.fstat(self.file.fileno()).st_size
+
+            if not self.readHeader(size):
+                if size > 0:
+                    print(f"Could not read thumbnail atlas at path {self.filePath}, rebuilding it")
+
+                self.file.seek(0)
+                self.file.truncate()
+                self.file.write(ATLAS_HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, THUMBNAIL_SIZE))
+                self.file.flush()
+                size = ATLAS_HEADER.size
+        except OSError:
+            print(f"Could not open thumbnail atlas at path {self.filePath}")
+            self.file = None
+            return
+
+        self.slotCount = (size - ATLAS_HEADER.size) // SLOT_SIZE
+        if self.slotCount == 0:
+            return
+
+        self.map = mmap.mmap(self.file.fileno(), size)
+        for slot in range(self.slotCount):
+            (slotId,) = SLOT_HEADER.unpack_from(self.map, self.getSlotOffset(slot))
+            workshopId = str(slotId)
+
+            # A thumbnail that was being replaced when the app closed can be in two slots, either will do.
+            if slotId == 0 or workshopId in self.slots:
+                self.freeSlots.append(slot)
+            else:
+                self.slots[workshopId] = slot
+
+        # Fill the atlas from the start.
+        self.freeSlots.reverse()
+
+    def readHeader(self, size):
+        if size < ATLAS_HEADER.size or (size - ATLAS_HEADER.size) % SLOT_SIZE != 0:
+            return False
+
+        self.file.seek(0)
+        return ATLAS_HEADER.unpack(self.file.read(ATLAS_HEADER.size)) == (ATLAS_MAGIC, ATLAS_VERSION, THUMBNAIL_SIZE)
+
+    def getSlotOffset(self, slot):
+        return ATLAS_HEADER.size + slot * SLOT_SIZE
+
+    def contains(self, workshopId):
+        return workshopId in self.slots
+
+    # Returns the thumbnail as an image using the atlas's memory, or None if there isn't one.
+    def getImage(self, workshopId):
+        with self.lock:
+            slot = self.slots.get(workshopId)
+            if slot is None:
+                return None
+
+            offset = self.getSlotOffset(slot) + SLOT_HEADER.size
+            pixels = memoryview(self.map)[offset:offset + THUMBNAIL_BYTES]
+
+        return QImage(pixels, THUMBNAIL_SIZE, THUMBNAIL_SIZE, THUMBNAIL_SIZE * 4, QImage.Format.Format_RGBA8888)
+
+    # Stores THUMBNAIL_SIZE x THUMBNAIL_SIZE RGBA pixels as the thumbnail of `workshopId`.
+    # Returns False if they couldn't be stored.
+    def put(self, workshopId, pixels):
+        slotId = getSlotId(workshopId)
+        if slotId is None or len(pixels) != THUMBNAIL_BYTES:
+            print(f"Could not store thumbnail for workshop id {workshopId}")
+            return False
+
+        with self.lock:
+            if self.file is None:
+                return False
+
+            if len(self.freeSlots) == 0 and not self.grow():
+                return False
+
+            # The pixels go in a free slot before the slot is given the id,
+            # so quitting halfway through can't leave a thumbnail with half of its pixels.
+            slot = self.freeSlots.pop()
+            offset = self.getSlotOffset(slot)
+            self.map[offset + SLOT_HEADER.size:offset + SLOT_SIZE] = pixels
+            SLOT_HEADER.pack_into(self.map, offset, slotId)
+
+            previousSlot = self.slots.get(workshopId)
+            self.slots[workshopId] = slot
+            if previousSlot is not None:
+                self.freeSlot(previousSlot)
+
+        return True
+
+    def remove(self, workshopId):
+        with self.lock:
+            slot = self.slots.pop(workshopId, None)
+            if slot is not None:
+                self.freeSlot(slot)
+
+    def freeSlot(self, slot):
+        SLOT_HEADER.pack_into(self.map, self.getSlotOffset(slot), 0)
+        self.freeSlots.append(slot)
+
+    def grow(self):
+        slotCount = self.slotCount + ATLAS_GROWTH
+        size = self.getSlotOffset(slotCount)
+
+        try:
+            # New slots are zeroed, which marks them as free. Windows refuses to resize a file that's mapped,
+            # but making a map larger than the file grows it. Elsewhere a map can't go past the end of its file,
+            # so the file is grown first.
+            if sys.platform != "win32":
+                self.file.truncate(size)
+            newMap = mmap.mmap(self.file.fileno(), size)
+        except (OSError, ValueError):
+            print(f"Could not grow thumbnail atlas at path {self.filePath}")
+            return False
+
+        if self.map is not None:
+            self.retiredMaps.append(self.map)
+        self.closeRetiredMaps()
+
+        self.map = newMap
+        self.freeSlots.extend(reversed(range(self.slotCount, slotCount)))
+        self.slotCount = slotCount
+        return True
+
+    # Closes the maps replaced when the atlas grew that no image points into anymore.
+    def closeRetiredMaps(self):
+        openMaps = []
+        for retiredMap in self.retiredMaps:
+            try:
+                retiredMap.close()
+            except BufferError:
+                openMaps.append(retiredMap)
+
+        self.retiredMaps = openMaps
+
+    # Moves thumbnails saved as thumb-<workshop id>.png files, from before there was an atlas, into it.
+    def migrate(self, directory):
+        try:
+            fileNames = os.listdir(directory)
+        except OSError:
+            return 0
+
+        migrated = 0
+        for fileName in fileNames:
+            if not fileName.startswith("thumb-") or not fileName.endswith(".png"):
+                continue
+
+            workshopId = fileName.removeprefix("thumb-").removesuffix(".png")
+            filePath = os.path.join(directory, fileName)
+
+            image = QImage(filePath)
+            if image.isNull():
+                print(f"Could not migrate thumbnail at path {filePath}")
+            elif self.contains(workshopId) or self.put(workshopId, getImagePixels(image)):
+                migrated += 1
+            else:
+                continue
+
+            try:
+                os.remove(filePath)
+            except OSError:
+                pass
+
+        return migrated
+
+    def flush(self):
+        with self.lock:
+            if self.map is not None:
+                self.map.flush()
+
+
+# The pixels of `image` scaled to a thumbnail, in the format the atlas stores.
+def getImagePixels(image):
+    image = image.convertToFormat(QImage.Format.Format_RGBA8888)
+    if image.width() != THUMBNAIL_SIZE or image.height() != THUMBNAIL_SIZE:
+        image = image.scaled(
+            THUMBNAIL_SIZE,
+            THUMBNAIL_SIZE,
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+
+    return bytes(image.constBits())
+
+
+# Decodes a downloaded image straight into the pixels of a slot.
+# JPEGs are decoded at the smallest fraction of their size that's still at least THUMBNAIL_SIZE,
+# so a 1920x1080 preview only has its 240x135 version decoded before it's resized.
+def decodeImagePixels(data):
+    image = Image.open(io.BytesIO(data))
+    image.draft("RGB", (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    image = image.convert("RGBA")
+    if image.size != (THUMBNAIL_SIZE, THUMBNAIL_SIZE):
+        image = image.resize((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
+
+    return image.tobytes()
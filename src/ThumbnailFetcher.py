@@ -0,0 +1,240 @@
+import time
+import threading
+import concurrent.futures
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.WorkshopDetails import getPublishedFileDetails, PUBLISHED_FILE_DETAILS_URL
+from src.WorkshopPage import WORKSHOP_PAGE_CHUNK_SIZE
+
+# Downloads running at once.
+THUMBNAIL_FETCH_WORKERS = 4
+
+# Requests sent to Steam per second, on average. Bursts of up to THUMBNAIL_REQUEST_BURST are let through.
+THUMBNAIL_REQUESTS_PER_SECOND = 8
+THUMBNAIL_REQUEST_BURST = 8
+
+# Seconds to wait for a connection, and then for the server to send something.
+THUMBNAIL_REQUEST_TIMEOUT = (5, 20)
+
+# Times a request that failed in a way that might not happen again is retried, like a dropped connection
+# or Steam being busy. The wait before the first retry is doubled for every retry after it,
+# unless the server says how long to wait.
+THUMBNAIL_REQUEST_RETRIES = 3
+THUMBNAIL_RETRY_DELAY = 1
+THUMBNAIL_RETRY_MAX_DELAY = 60
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Statuses meaning there's nothing to download, the same as a workshop page without a thumbnail.
+MISSING_STATUS_CODES = {404, 410}
+
+
+# A downloaded thumbnail. `content` is None if the server said the cached one is still current.
+class FetchedThumbnail():
+    __slots__ = ("url", "content", "etag", "lastModified")
+
+    def __init__(self, url, content, etag, lastModified):
+        self.url = url
+        self.content = content
+        self.etag = etag
+        self.lastModified = lastModified
+
+
+# Returns the seconds to wait before retrying the `attempt`th request after it failed with `error`,
+# or None if retrying wouldn't help.
+def getRetryDelay(error, attempt):
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        if response is None or response.status_code not in TRANSIENT_STATUS_CODES:
+            return None
+
+        retryAfter = response.headers.get("Retry-After", "")
+        if retryAfter.isdigit():
+            return min(int(retryAfter), THUMBNAIL_RETRY_MAX_DELAY)
+    elif not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return None
+
+    return min(THUMBNAIL_RETRY_DELAY * 2 ** attempt, THUMBNAIL_RETRY_MAX_DELAY)
+
+
+# Lets through `rate` requests per second on average. Tokens build up while nothing is sent,
+# up to `burst` of them, so a quiet period can be followed by that many requests at once.
+class TokenBucket():
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    # Waits for a token. Returns False without one if `cancelled` is set while waiting.
+    def acquire(self, cancelled=None):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+
+                wait = (1 - self.tokens) / self.rate
+
+            if cancelled is None:
+                time.sleep(wait)
+            elif cancelled.wait(wait):
+                return False
+
+
+# Downloads workshop thumbnails on a pool of threads sharing one HTTP session,
+# so connections to Steam are kept open between downloads instead of made for every request.
+# Thumbnail URLs come from looking up many items at once with GetPublishedFileDetails (see `lookUp`).
+# Items that weren't looked up, or that the lookup didn't find, have their workshop page scraped instead:
+# `parsePage` gets the HTML of a workshop page, in chunks, and returns the URL of its thumbnail or None.
+class ThumbnailFetcher():
+    def __init__(
+        self,
+        itemUrl,
+        parsePage,
+        workerCount=THUMBNAIL_FETCH_WORKERS,
+        requestsPerSecond=THUMBNAIL_REQUESTS_PER_SECOND,
+        timeout=THUMBNAIL_REQUEST_TIMEOUT,
+        detailsUrl=PUBLISHED_FILE_DETAILS_URL,
+        retries=THUMBNAIL_REQUEST_RETRIES,
+    ):
+        self.itemUrl = itemUrl
+        self.parsePage = parsePage
+        self.workerCount = workerCount if workerCount > 0 else THUMBNAIL_FETCH_WORKERS
+        self.timeout = timeout
+        self.detailsUrl = detailsUrl
+        self.retries = retries
+
+        # WorkshopItems from lookups by workshop id, and every id that was looked up, found or not.
+        self.lock = threading.Lock()
+        self.items = {}
+        self.lookedUp = set()
+
+        # No limit if it's 0.
+        self.rateLimiter = None
+        if requestsPerSecond > 0:
+            self.rateLimiter = TokenBucket(requestsPerSecond, min(THUMBNAIL_REQUEST_BURST, requestsPerSecond))
+
+        # Every worker can keep a connection open to each host.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workerCount)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workerCount, thread_name_prefix="ThumbnailFetcher"
+        )
+        self.closed = threading.Event()
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def waitForRateLimit(self):
+        if self.rateLimiter is not None and not self.rateLimiter.acquire(self.closed):
+            raise requests.RequestException("Thumbnail fetcher was shut down")
+
+    # Returns what `send` returns, calling it again if it fails in a way a retry could help with.
+    # Every attempt waits for the rate limit, so retries don't send requests any faster.
+    def retry(self, send):
+        attempt = 0
+        while True:
+            self.waitForRateLimit()
+            try:
+                return send()
+            except requests.RequestException as e:
+                delay = getRetryDelay(e, attempt)
+                if delay is None or attempt >= self.retries:
+                    raise
+
+            attempt += 1
+            if self.closed.wait(delay):
+                raise requests.RequestException("Thumbnail fetcher was shut down")
+
+    # Raises requests.RequestException if the request fails, times out or the fetcher is shut down.
+    # A `stream`ed response has to be closed once it's been read.
+    def get(self, url, headers=None, stream=False):
+        def send():
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+            try:
+                response.raise_for_status()
+            except requests.RequestException:
+                response.close()
+                raise
+
+            return response
+
+        return self.retry(send)
+
+    # Looks up the details of up to PUBLISHED_FILE_DETAILS_BATCH_SIZE workshop items in one request.
+    # If it fails, they're downloaded from their pages like items the lookup didn't find.
+    def lookUp(self, workshopIds):
+        items = {}
+        if self.detailsUrl is not None:
+            try:
+                items = self.retry(
+                    lambda: getPublishedFileDetails(self.session, workshopIds, self.detailsUrl, self.timeout)
+                )
+            except (requests.RequestException, ValueError) as e:
+                print(f"Could not look up {len(workshopIds)} workshop items ({e}), using their pages instead")
+
+        with self.lock:
+            self.items.update(items)
+            self.lookedUp.update(workshopIds)
+
+    def isLookedUp(self, workshopId):
+        with self.lock:
+            return workshopId in self.lookedUp
+
+    # Returns the WorkshopItem from looking up `workshopId`, or None if it wasn't found.
+    def getItem(self, workshopId):
+        with self.lock:
+            return self.items.get(workshopId)
+
+    # Returns the URL of the thumbnail of `workshopId`, or None if it doesn't have one.
+    def getThumbnailUrl(self, workshopId):
+        item = self.getItem(workshopId)
+        if item is not None and item.previewUrl is not None:
+            return item.previewUrl
+
+        # The page is parsed while it's downloaded, the rest of it isn't read once the thumbnail is found.
+        with self.get(self.itemUrl + workshopId, stream=True) as page:
+            return self.parsePage(page.iter_content(WORKSHOP_PAGE_CHUNK_SIZE))
+
+    # Returns the FetchedThumbnail of `workshopId`, or None if it doesn't have one.
+    # `cached` is its ThumbnailIndex entry, if it's already been downloaded. If the thumbnail is still
+    # at the same URL, the server is asked to only send it again if it changed.
+    def fetch(self, workshopId, cached=None):
+        try:
+            return self.download(workshopId, cached)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code in MISSING_STATUS_CODES:
+                return None
+            raise
+
+    # See `fetch`. Raises requests.HTTPError for statuses meaning the thumbnail is gone.
+    def download(self, workshopId, cached):
+        imageUrl = self.getThumbnailUrl(workshopId)
+        if imageUrl is None:
+            return None
+
+        headers = {}
+        if cached is not None and cached.get("Url") == imageUrl:
+            if cached.get("ETag"):
+                headers["If-None-Match"] = cached["ETag"]
+            if cached.get("LastModified"):
+                headers["If-Modified-Since"] = cached["LastModified"]
+
+        response = self.get(imageUrl, headers)
+        content = None if response.status_code == 304 else response.content
+        return FetchedThumbnail(imageUrl, content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+    def shutdown(self):
+        self.closed.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import threading
+
+THUMBNAIL_INDEX_PATH = "cache/thumbnails.json"
+THUMBNAIL_INDEX_VERSION = 1
+
+# Seconds before a thumbnail that couldn't be downloaded is tried again.
+# Doubled with every failure in a row, up to THUMBNAIL_FAILURE_MAX_BACKOFF.
+THUMBNAIL_FAILURE_BACKOFF = 60 * 60
+THUMBNAIL_FAILURE_MAX_BACKOFF = 30 * 24 * 60 * 60
+
+
+# Where every thumbnail in the atlas was downloaded from and when, with the ETag and Last-Modified
+# headers it came with. Thumbnails older than the refresh interval are checked again with a
+# conditional request, which only downloads the image again if it changed.
+# Workshop items that didn't have a thumbnail to download, usually because they were removed or made private,
+# are kept too. They aren't tried again until their backoff runs out, so they don't take up downloads every launch.
+# Shared between the GUI thread and the thumbnail downloads.
+class ThumbnailIndex():
+    def __init__(self, filePath=THUMBNAIL_INDEX_PATH):
+        self.filePath = filePath
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.failures = {}
+        self.dirty = False
+
+        self.load()
+
+    def load(self):
+        if not os.path.isfile(self.filePath):
+            return
+
+        try:
+            with open(self.filePath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            print(f"Could not read thumbnail index at path {self.filePath}, rebuilding it")
+            return
+
+        if not isinstance(data, dict) or data.get("Version") != THUMBNAIL_INDEX_VERSION:
+            return
+
+        thumbnails = data.get("Thumbnails")
+        if isinstance(thumbnails, dict):
+            self.entries = thumbnails
+
+        failures = data.get("Failures")
+        if isinstance(failures, dict):
+            self.failures = failures
+
+    # Returns a copy of the entry of `workshopId`, or None if it doesn't have one.
+    def getEntry(self, workshopId):
+        with self.lock:
+            entry = self.entries.get(workshopId)
+            return dict(entry) if entry is not None else None
+
+    # Whether the thumbnail of `workshopId` was fetched more than `maxAge` seconds ago.
+    def isStale(self, workshopId, maxAge):
+        with self.lock:
+            entry = self.entries.get(workshopId)
+
+            # Thumbnails from before there was an index count as fetched now,
+            # so they aren't all downloaded again at once.
+            if entry is None:
+                self.entries[workshopId] = {"FetchedAt": time.time()}
+                self.dirty = True
+                return False
+
+            return time.time() - entry.get("FetchedAt", 0) > maxAge
+
+    def store(self, workshopId, url, etag, lastModified):
+        with self.lock:
+            self.entries[workshopId] = {
+                "Url": url,
+                "ETag": etag,
+                "LastModified": lastModified,
+                "FetchedAt": time.time(),
+            }
+            self.failures.pop(workshopId, None)
+            self.dirty = True
+
+    # The server said the thumbnail hasn't changed, it's good for another refresh interval.
+    def refresh(self, workshopId):
+        with self.lock:
+            entry = self.entries.get(workshopId)
+            if entry is not None:
+                entry["FetchedAt"] = time.time()
+                self.dirty = True
+
+            if self.failures.pop(workshopId, None) is not None:
+                self.dirty = True
+
+    # Whether `workshopId` failed to download recently enough that it shouldn't be tried again yet.
+    def isFailing(self, workshopId):
+        with self.lock:
+            failure = self.failures.get(workshopId)
+            return failure is not None and time.time() < failure.get("RetryAt", 0)
+
+    # Returns how many times in a row `workshopId` has failed now, and when it can be tried again.
+    def storeFailure(self, workshopId):
+        with self.lock:
+            failure = self.failures.get(workshopId) or {}
+            count = failure.get("Count", 0) + 1
+            now = time.time()
+            retryAt = now + min(THUMBNAIL_FAILURE_BACKOFF * 2 ** min(count - 1, 16), THUMBNAIL_FAILURE_MAX_BACKOFF)
+
+            self.failures[workshopId] = {"Count": count, "FailedAt": now, "RetryAt": retryAt}
+            self.dirty = True
+            return count, retryAt
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+
+            data = json.dumps({"Version": THUMBNAIL_INDEX_VERSION, "Thumbnails": self.entries, "Failures": self.failures})
+            self.dirty = False
+
+        directory = os.path.dirname(self.filePath)
+
+        # Write to a temporary file first so a crash can't leave a half-written index.
+        tempPath = self.filePath + ".tmp"
+        try:
+            if directory != "" and not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            with open(tempPath, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tempPath, self.filePath)
+        except OSError:
+            print(f"Could not save thumbnail index at path {self.filePath}")
+            with self.lock:
+                self.dirty = True
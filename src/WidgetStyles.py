@@ -3,11 +3,60 @@ from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
+from src.ResourceCache import getPixmap, getNinePatch
+
 def lerp(a, b, t):
     return (1 - t) * a + t * b
 
 PAPER_BUTTON_HOVER_HEIGHT = 20
 
+PAPER_TEXT_COLOR = "#2f2322"
+
+# Widths of the backgrounds' borders as (top, right, bottom, left), like the border-width they replaced.
+PAPER_BUTTON_BORDER = (8, 12, 12, 12)
+PAPER_TOOL_BUTTON_BORDER = (4, 8, 4, 8)
+PAPER_LINE_EDIT_BORDER = (8, 16, 12, 16)
+PAPER_LABEL_BORDER = (8, 16, 12, 16)
+PAPER_LIST_ITEM_BORDER = (8, 8, 8, 8)
+PAPER_DOCK_BORDER = (32, 32, 32, 32)
+
+# Space between a button's icon and text.
+PAPER_BUTTON_ICON_SPACING = 4
+
+# The game's font, one QFont per point size shared by every widget that uses it.
+isaacFonts = {}
+
+def getIsaacFont(pointSize):
+    font = isaacFonts.get(pointSize)
+    if font is None:
+        font = QFont("FontSouls_v3-Body")
+        font.setHintingPreference(QFont.HintingPreference.PreferNoHinting)
+        font.setPointSize(pointSize)
+        isaacFonts[pointSize] = font
+
+    return font
+
+# Text colors the stylesheets used to set, children pick them up too.
+def setPaperPalette(widget):
+    palette = widget.palette()
+    textColor = QColor(PAPER_TEXT_COLOR)
+    for role in (QPalette.ColorRole.WindowText, QPalette.ColorRole.Text, QPalette.ColorRole.ButtonText):
+        palette.setColor(role, textColor)
+
+    placeholderColor = QColor(textColor)
+    placeholderColor.setAlpha(128)
+    palette.setColor(QPalette.ColorRole.PlaceholderText, placeholderColor)
+    palette.setColor(QPalette.ColorRole.Base, Qt.GlobalColor.transparent)
+    widget.setPalette(palette)
+
+# Draws the image at `path` as a nine-patch filling `rect`, scaled once and reused after that.
+def paintNinePatch(painter, widget, rect, path, border):
+    pixmap = getNinePatch(path, rect.size(), border, widget.devicePixelRatioF())
+    painter.drawPixmap(rect.topLeft(), pixmap)
+
+def borderMargins(border):
+    return QMargins(border[3], border[0], border[1], border[2])
+
 class PaperButtonType():
     Primary = "./resources/backgrounds/primary_64"
     Danger = "./resources/backgrounds/danger_64"
@@ -23,11 +72,28 @@ class PaperLineEdit(QLineEdit):
     def __init__(self):
         super().__init__()
 
-        self.setStyleSheet("""
-            color: "#2f2322";
-            border-width: 8px 16px 12px 16px;
-            border-image: url(./resources/backgrounds/search_background_64.png) 8 16 12 16 fill;
-        """)
+        # Text sits inside the background's border, the background itself is painted below.
+        self.setFrame(False)
+        self.setTextMargins(PAPER_LINE_EDIT_BORDER[3], PAPER_LINE_EDIT_BORDER[0], PAPER_LINE_EDIT_BORDER[1], PAPER_LINE_EDIT_BORDER[2])
+        setPaperPalette(self)
+
+    # One line of text inside the border, the 2 is QLineEdit's own margin above and below the text.
+    def sizeHint(self):
+        size = super().sizeHint()
+        size.setHeight(self.fontMetrics().height() + 2 + PAPER_LINE_EDIT_BORDER[0] + PAPER_LINE_EDIT_BORDER[2])
+        return size
+
+    def minimumSizeHint(self):
+        size = super().minimumSizeHint()
+        size.setHeight(self.sizeHint().height())
+        return size
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        paintNinePatch(painter, self, self.rect(), "./resources/backgrounds/search_background_64.png", PAPER_LINE_EDIT_BORDER)
+        painter.end()
+
+        super().paintEvent(event)
 
 class PaperTextBrowser(QTextBrowser):
     def __init__(self):
@@ -92,68 +158,73 @@ class PaperScrollbar(QScrollBar):
         QScrollBar.showEvent(self, event)
         self.updateMask()
 
-class PaperListWidget(QListWidget):
-    def __init__(self, backgroundColor):
-        super().__init__()
+# Paints the paper background of list rows. Subclasses paint their contents over paintBackground().
+class PaperItemDelegate(QStyledItemDelegate):
+    def __init__(self, backgroundColor, parent=None):
+        super().__init__(parent)
 
-        self.setAlternatingRowColors(True)
-        self.setMouseTracking(True)
-        self.setStyleSheet(f"""
-            QListWidget {{
-                color: "#2f2322";
-                background-color: transparent;
-                border: none;
-            }}
+        # Shows through the alternate rows' background.
+        self.backgroundColor = QColor(backgroundColor)
 
-            QListWidget::item {{
-                color: "#e1d0ba";
-                background-color: none;
-                border-width: 8px 8px 8px 8px;
-                border-image: url(./resources/backgrounds/listitem_primary_64.png) 8 8 8 8 fill;
-            }}
+    def paintBackground(self, painter, option):
+        selected = option.state & QStyle.StateFlag.State_Selected
+        hovered = option.state & QStyle.StateFlag.State_MouseOver
+        alternate = option.features & QStyleOptionViewItem.ViewItemFeature.Alternate
 
-            QListWidget::item::alternate {{
-                color: "#e1d0ba";
-                background-color: {backgroundColor};
-                border-width: 8px 8px 8px 8px;
-                border-image: url(./resources/backgrounds/listitem_secondary_64.png) 8 8 8 8 fill;
-            }}
+        if selected:
+            path = "./resources/backgrounds/listitem_selected_64.png"
+        elif alternate:
+            path = "./resources/backgrounds/listitem_secondary_64_highlight.png" if hovered else "./resources/backgrounds/listitem_secondary_64.png"
+        else:
+            path = "./resources/backgrounds/listitem_primary_64_highlight.png" if hovered else "./resources/backgrounds/listitem_primary_64.png"
 
-            QListWidget::item:hover {{
-                color: "#e1d0ba";
-                background-color: none;
-                border-width: 8px 8px 8px 8px;
-                border-image: url(./resources/backgrounds/listitem_primary_64_highlight.png) 8 8 8 8 fill;
-            }}
+        if alternate:
+            painter.fillRect(option.rect, self.backgroundColor)
 
-            QListWidget::item::alternate:hover {{
-                color: "#e1d0ba";
-                background-color: "{backgroundColor}";
-                border-width: 8px 8px 8px 8px;
-                border-image: url(./resources/backgrounds/listitem_secondary_64_highlight.png) 8 8 8 8 fill;
-            }}
+        paintNinePatch(painter, option.widget, option.rect, path, PAPER_LIST_ITEM_BORDER)
 
-            QListWidget::item::selected {{
-                color: "#e1d0ba";
-                background-color: none;
-                border-width: 8px 8px 8px 8px;
-                border-image: url(./resources/backgrounds/listitem_selected_64.png) 8 8 8 8 fill;
-            }}
+    def paint(self, painter, option, index):
+        self.paintBackground(painter, option)
 
-            QListWidget::item::selected::alternate {{
-                color: "#e1d0ba";
-                background-color: "{backgroundColor}";
-                border-width: 8px 8px 8px 8px;
-                border-image: url(./resources/backgrounds/listitem_selected_64.png) 8 8 8 8 fill;
-            }}
+        # Anything else the row has (text, icon), without the style's own background.
+        contentsOption = QStyleOptionViewItem(option)
+        self.initStyleOption(contentsOption, index)
+        contentsOption.state &= ~(QStyle.StateFlag.State_Selected | QStyle.StateFlag.State_MouseOver | QStyle.StateFlag.State_HasFocus)
+        contentsOption.features &= ~QStyleOptionViewItem.ViewItemFeature.Alternate
+        contentsOption.palette.setColor(QPalette.ColorRole.Text, QColor("#e1d0ba"))
 
-            QListWidget::item::selected:hover {{
-                color: "#e1d0ba";
-                background-color: "{backgroundColor}";
-                border-width: 8px 8px 8px 8px;
-                border-image: url(./resources/backgrounds/listitem_selected_64.png) 8 8 8 8 fill;
-            }}
-        """)
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, contentsOption, painter, option.widget)
+
+    # Item widgets go inside the row's border.
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect.marginsRemoved(borderMargins(PAPER_LIST_ITEM_BORDER)))
+
+# Lists get no stylesheet, rows are painted by a PaperItemDelegate.
+def setupPaperList(view, backgroundColor):
+    view.setAlternatingRowColors(True)
+    view.setMouseTracking(True)
+    view.setFrameShape(QFrame.Shape.NoFrame)
+    view.viewport().setAutoFillBackground(False)
+    setPaperPalette(view)
+
+    # Needed for the rows under the mouse to get State_MouseOver.
+    view.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+
+    view.setItemDelegate(PaperItemDelegate(backgroundColor, view))
+
+class PaperListWidget(QListWidget):
+    def __init__(self, backgroundColor):
+        super().__init__()
+
+        setupPaperList(self, backgroundColor)
+
+class PaperListView(QListView):
+    def __init__(self, backgroundColor):
+        super().__init__()
+
+        self.backgroundColor = backgroundColor
+        setupPaperList(self, backgroundColor)
 
 class PaperLargeWidget(QWidget):
     def __init__(self):
@@ -161,19 +232,10 @@ class PaperLargeWidget(QWidget):
 
         self.dockTitle = ""
 
-        self.isaacFont = QFont("FontSouls_v3-Body")
-        self.isaacFont.setHintingPreference(QFont.HintingPreference.PreferNoHinting)
-        self.isaacFont.setPointSize(32)
+        self.isaacFont = getIsaacFont(32)
 
-        self.setObjectName("paperDockWidget")
         self.setContentsMargins(4, 32, 4, 4)
-        self.setStyleSheet("""
-            QWidget#paperDockWidget {
-                color: "#2f2322";
-                border-width: 32px 32px 32px 32px;
-                border-image: url(./resources/backgrounds/dock_background_96.png) 32 32 32 32 fill;
-            }
-        """)
+        setPaperPalette(self)
 
         self.headerButtons = []
         self.titlePadding = QPoint(0, 0)
@@ -191,12 +253,11 @@ class PaperLargeWidget(QWidget):
 
     # Draw background.
     def paintEvent(self, event):
-        opt = QStyleOption()
-        opt.initFrom(self)
         painter = QPainter(self)
-        self.style().drawPrimitive(QStyle.PrimitiveElement.PE_Widget, opt, painter, self)
+        paintNinePatch(painter, self, self.rect(), "./resources/backgrounds/dock_background_96.png", PAPER_DOCK_BORDER)
 
         # Draw title
+        painter.setPen(QColor(PAPER_TEXT_COLOR))
         painter.setFont(self.isaacFont)
         metrics = QFontMetrics(self.isaacFont)
 
@@ -205,60 +266,103 @@ class PaperLargeWidget(QWidget):
 
         painter.drawText(titlePoint, self.dockTitle)
 
+# A label on a paper background that lights up under the mouse.
+class PaperLabel(QLabel):
+    def __init__(self, text):
+        super().__init__(text)
+
+        self.setContentsMargins(borderMargins(PAPER_LABEL_BORDER))
+        setPaperPalette(self)
+
+    def paintEvent(self, event):
+        path = "./resources/backgrounds/actionbutton_background_64_highlight.png" if self.underMouse() else "./resources/backgrounds/actionbutton_background_64.png"
+
+        painter = QPainter(self)
+        paintNinePatch(painter, self, self.rect(), path, PAPER_LABEL_BORDER)
+        painter.end()
+
+        super().paintEvent(event)
+
+    def enterEvent(self, event):
+        self.update()
+        return super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        self.update()
+        return super().leaveEvent(event)
+
 class PaperWidgetAction(QWidgetAction):
     def __init__(self, parent, text):
         super().__init__(parent)
 
-        self.label = QLabel(text)
+        self.label = PaperLabel(text)
         self.label.setMouseTracking(True)
 
         f = self.label.font()
         f.setBold(True)
         self.label.setFont(f)
 
-        self.label.setStyleSheet("""
-            QLabel {
-                color: "#2f2322";
-                border-width: 8px 16px 12px 16px;
-                border-image: url(./resources/backgrounds/actionbutton_background_64.png) 8 16 12 16 fill;
-            }
+        self.setText(text)
+
+        self.setDefaultWidget(self.label)
+
+class PaperMenu(QMenu):
+    def __init__(self):
+        super().__init__()
 
-            QLabel:hover {
+        # Only the menu itself, the PaperLabels in it paint their own background.
+        self.setStyleSheet("""
+            QMenu {
                 color: "#2f2322";
                 border-width: 8px 16px 12px 16px;
-                border-image: url(./resources/backgrounds/actionbutton_background_64_highlight.png) 8 16 12 16 fill;
+                border-image: url(./resources/backgrounds/textbrowser_background_64.png) 8 16 12 16 round;
+                background: rgba(255, 255, 255, 0%);
             }
         """)
-
-        self.setText(text)
-
-        self.setDefaultWidget(self.label)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowType.FramelessWindowHint | Qt.WindowType.NoDropShadowWindowHint)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
 
 class PaperToolButton(QToolButton):
     def __init__(self, paperType):
         super().__init__()
 
         self.paperType = paperType
-        self.setStyleSheet(f"""
-            color: "#2f2322";
-            border-width: 4px 8px 4px 8px;
-            border-image: url({self.paperType + ".png"}) 4 8 4 8 fill;
-        """)
+        setPaperPalette(self)
+
+    def sizeHint(self):
+        option = QStyleOptionToolButton()
+        self.initStyleOption(option)
+
+        size = option.iconSize.expandedTo(QSize(0, self.fontMetrics().height()))
+        return size.grownBy(borderMargins(PAPER_TOOL_BUTTON_BORDER)) + QSize(3, 3)
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def paintEvent(self, event):
+        path = self.paperType + ("_highlight.png" if self.underMouse() else ".png")
+
+        painter = QStylePainter(self)
+        paintNinePatch(painter, self, self.rect(), path, PAPER_TOOL_BUTTON_BORDER)
+
+        option = QStyleOptionToolButton()
+        self.initStyleOption(option)
+        option.rect = self.rect().marginsRemoved(borderMargins(PAPER_TOOL_BUTTON_BORDER))
+        painter.drawControl(QStyle.ControlElement.CE_ToolButtonLabel, option)
+
+        # Small arrow in the corner for buttons that open a menu.
+        if option.features & QStyleOptionToolButton.ToolButtonFeature.HasMenu:
+            arrowOption = QStyleOption()
+            arrowOption.initFrom(self)
+            arrowOption.rect = QRect(self.width() - 13, self.height() - 13, 7, 7)
+            painter.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorArrowDown, arrowOption)
 
     def enterEvent(self, event):
-        self.setStyleSheet(f"""
-            color: "#2f2322";
-            border-width: 4px 8px 4px 8px;
-            border-image: url({self.paperType + "_highlight.png"}) 4 8 4 8 fill;
-        """)
+        self.update()
         return super().enterEvent(event)
 
     def leaveEvent(self, event):
-        self.setStyleSheet(f"""
-            color: "#2f2322";
-            border-width: 4px 8px 4px 8px;
-            border-image: url({self.paperType + ".png"}) 4 8 4 8 fill;
-        """)
+        self.update()
         return super().leaveEvent(event)
 
 class PaperPushButton(QPushButton):
@@ -266,29 +370,95 @@ class PaperPushButton(QPushButton):
         super().__init__(text=text, parent=parent)
 
         self.paperType = paperType
-        self.isaacFont = QFont("FontSouls_v3-Body")
-        self.isaacFont.setHintingPreference(QFont.HintingPreference.PreferNoHinting)
-        self.isaacFont.setPointSize(12)
+        self.isaacFont = getIsaacFont(12)
         self.setFont(self.isaacFont)
+        setPaperPalette(self)
 
-        self.setStyleSheet(f"""
-            color: "#2f2322";
-            border-width: 8px 12px 12px 12px;
-            border-image: url({paperType + ".png"}) 8 12 12 12 fill;
-        """)
+    # Icon and text plus the background's border, what the border-image stylesheet used to size buttons to.
+    def sizeHint(self):
+        width = 0
+        height = 0
+
+        if not self.icon().isNull():
+            width += self.iconSize().width() + PAPER_BUTTON_ICON_SPACING
+            height = self.iconSize().height()
+
+        textSize = self.fontMetrics().size(Qt.TextFlag.TextShowMnemonic, self.text() or "XXXX")
+        if self.text() or self.icon().isNull():
+            width += textSize.width()
+        height = max(height, textSize.height())
+
+        return QSize(width, height).grownBy(borderMargins(PAPER_BUTTON_BORDER))
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def paintEvent(self, event):
+        path = self.paperType + ("_highlight.png" if self.underMouse() else ".png")
+
+        painter = QPainter(self)
+        paintNinePatch(painter, self, self.rect(), path, PAPER_BUTTON_BORDER)
+
+        rect = self.rect().marginsRemoved(borderMargins(PAPER_BUTTON_BORDER))
+
+        # Icon then text, centered together.
+        iconWidth = 0
+        if not self.icon().isNull():
+            iconWidth = self.iconSize().width()
+            if self.text():
+                iconWidth += PAPER_BUTTON_ICON_SPACING
+
+        textWidth = self.fontMetrics().size(Qt.TextFlag.TextShowMnemonic, self.text()).width() if self.text() else 0
+        x = rect.x() + (rect.width() - iconWidth - textWidth) // 2
+
+        if not self.icon().isNull():
+            iconRect = QRect(QPoint(x, rect.y() + (rect.height() - self.iconSize().height()) // 2), self.iconSize())
+            self.icon().paint(painter, iconRect)
+
+        if self.text():
+            painter.setPen(self.palette().color(QPalette.ColorRole.ButtonText))
+            painter.setFont(self.font())
+            painter.drawText(
+                QRect(x + iconWidth, rect.y(), textWidth, rect.height()),
+                Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextShowMnemonic,
+                self.text(),
+            )
 
     def enterEvent(self, event):
-        self.setStyleSheet(f"""
-            color: "#2f2322";
-            border-width: 8px 12px 12px 12px;
-            border-image: url({self.paperType + "_highlight.png"}) 8 12 12 12 fill;
-        """)
+        self.update()
         return super().enterEvent(event)
 
     def leaveEvent(self, event):
-        self.setStyleSheet(f"""
-            color: "#2f2322";
-            border-width: 8px 12px 12px 12px;
-            border-image: url({self.paperType + ".png"}) 8 12 12 12 fill;
-        """)
-        return super().leaveEvent(event)
\ No newline at end of file
+        self.update()
+        return super().leaveEvent(event)
+
+# A checkbox drawn from the cached box_tick images instead of a stylesheet.
+# `imagePrefix` is the start of the image paths, like "resources/mini_box_tick".
+class PaperCheckbox(QPushButton):
+    def __init__(self, imagePrefix, parent = None):
+        super().__init__(parent=parent)
+
+        self.imagePrefix = imagePrefix
+        self.checkState = False
+
+    def setCheckState(self, checkState):
+        if checkState == self.checkState:
+            return
+
+        self.checkState = checkState
+        self.update()
+
+    def paintEvent(self, event):
+        state = "on" if self.checkState else "off"
+        hover = "_hover" if self.underMouse() else ""
+
+        painter = QPainter(self)
+        painter.drawPixmap(self.rect(), getPixmap(f"{self.imagePrefix}_{state}{hover}.png"))
+
+    def enterEvent(self, event):
+        self.update()
+        return super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        self.update()
+        return super().leaveEvent(event)
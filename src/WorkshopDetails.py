@@ -0,0 +1,53 @@
+PUBLISHED_FILE_DETAILS_URL = "https://api.steampowered.com/ISteamRemoteStorage/GetPublishedFileDetails/v1/"
+
+# Most workshop items asked about in one request.
+PUBLISHED_FILE_DETAILS_BATCH_SIZE = 100
+
+# The result Steam gives items it found.
+PUBLISHED_FILE_RESULT_OK = 1
+
+
+# What Steam knows about a workshop item. `previewUrl` is the thumbnail, `timeUpdated` a unix timestamp.
+class WorkshopItem():
+    __slots__ = ("workshopId", "title", "previewUrl", "timeUpdated")
+
+    def __init__(self, workshopId, title=None, previewUrl=None, timeUpdated=None):
+        self.workshopId = workshopId
+        self.title = title
+        self.previewUrl = previewUrl
+        self.timeUpdated = timeUpdated
+
+
+# Asks GetPublishedFileDetails about up to PUBLISHED_FILE_DETAILS_BATCH_SIZE workshop items at once.
+# Returns a WorkshopItem for every one of them Steam found, by workshop id.
+# Raises requests.RequestException if the request fails and ValueError if the response isn't understood.
+def getPublishedFileDetails(session, workshopIds, url=PUBLISHED_FILE_DETAILS_URL, timeout=None):
+    data = {"itemcount": len(workshopIds)}
+    for i, workshopId in enumerate(workshopIds):
+        data[f"publishedfileids[{i}]"] = workshopId
+
+    response = session.post(url, data=data, timeout=timeout)
+    response.raise_for_status()
+
+    details = response.json()
+    details = details.get("response") if isinstance(details, dict) else None
+    if not isinstance(details, dict) or not isinstance(details.get("publishedfiledetails", []), list):
+        raise ValueError("Unexpected GetPublishedFileDetails response")
+
+    items = {}
+    for entry in details.get("publishedfiledetails", []):
+        if not isinstance(entry, dict) or entry.get("result") != PUBLISHED_FILE_RESULT_OK:
+            continue
+
+        workshopId = str(entry.get("publishedfileid", ""))
+        if workshopId == "":
+            continue
+
+        items[workshopId] = WorkshopItem(
+            workshopId,
+            entry.get("title"),
+            entry.get("preview_url") or None,
+            entry.get("time_updated"),
+        )
+
+    return items
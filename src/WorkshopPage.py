@@ -0,0 +1,63 @@
+import codecs
+
+from html.parser import HTMLParser
+
+# Bytes of a workshop page parsed at a time. The page stops being read once the thumbnail is found.
+WORKSHOP_PAGE_CHUNK_SIZE = 16 * 1024
+
+
+# Finds the thumbnail of a workshop page while it's read, without building a tree of the whole page.
+# Items with several previews have an image with the id previewImageMain, items with only
+# one have an image with the class workshopItemPreviewImageEnlargeable. A page only has one of them,
+# so the first one found is the thumbnail.
+class WorkshopPageParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+
+        self.imageUrl = None
+        self.found = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.found or tag != "img":
+            return
+
+        attrs = dict(attrs)
+        src = attrs.get("src")
+        if src is None:
+            return
+
+        if attrs.get("id") == "previewImageMain":
+            self.imageUrl = src
+            self.found = True
+        elif "workshopItemPreviewImageEnlargeable" in (attrs.get("class") or "").split():
+            # Letterboxed is true, meaning it'll have black squares to the left and right.
+            # Remove the letterbox by removing that from the end of the url.
+            if src.endswith("true"):
+                src = src.removesuffix("true")
+                src = src + "false"
+
+            self.imageUrl = src
+            self.found = True
+
+
+# Returns the URL of the thumbnail on a workshop page, or None if it doesn't have one.
+# `html` is the page as bytes or a string, or an iterable of byte chunks like a streamed response.
+def parseWorkshopPage(html):
+    if isinstance(html, str):
+        html = html.encode()
+
+    if isinstance(html, (bytes, bytearray)):
+        chunks = (html[i:i + WORKSHOP_PAGE_CHUNK_SIZE] for i in range(0, len(html), WORKSHOP_PAGE_CHUNK_SIZE))
+    else:
+        chunks = html
+
+    parser = WorkshopPageParser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+        if parser.found:
+            return parser.imageUrl
+
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    return parser.imageUrl